@@ -12,26 +12,11 @@ def normalize_name(name):
     """
     return name.lower().replace(" ", "").replace("'", "").replace(".", "").strip()
 
-def main():
-    # 1. Dosya Kontrolü
-    if not os.path.exists(MAIN_DATA_FILE):
-        print(f"❌ '{MAIN_DATA_FILE}' bulunamadı!")
-        return
-    if not os.path.exists(CLASSES_FILE):
-        print(f"❌ '{CLASSES_FILE}' bulunamadı! Lütfen dosyanın orada olduğundan emin ol.")
-        return
-
-    print("📂 Dosyalar yükleniyor...")
-    
-    # 2. Dosyaları Oku
-    with open(MAIN_DATA_FILE, "r", encoding="utf-8") as f:
-        main_data = json.load(f)
-
-    with open(CLASSES_FILE, "r", encoding="utf-8") as f:
-        classes_data = json.load(f)
-
-    # 3. Tersine Arama Tablosu Oluştur (Şampiyon -> Sınıf)
-    # { "Assassin": ["Zed", "Akali"] }  --->  { "zed": "Assassin", "akali": "Assassin" }
+def build_class_map(classes_data):
+    """
+    Tersine Arama Tablosu Oluştur (Şampiyon -> Sınıf)
+    { "Assassin": ["Zed", "Akali"] }  --->  { "zed": "Assassin", "akali": "Assassin" }
+    """
     champ_class_map = {}
     
     for class_name, champ_list in classes_data.items():
@@ -44,10 +29,23 @@ def main():
                 champ_class_map["kayn"] = class_name 
             else:
                 champ_class_map[clean_name] = class_name
+    return champ_class_map
 
+def apply(main_data, classes_file=CLASSES_FILE):
+    """
+    Merge aşaması: sınıfları bellekteki ana veriye işler (class).
+    Dosyaya yazmaz; (sınıf atanan, Unknown kalan) sayılarını döndürür.
+    """
+    if not os.path.exists(classes_file):
+        print(f"❌ '{classes_file}' bulunamadı! Lütfen dosyanın orada olduğundan emin ol.")
+        return 0, 0
+
+    with open(classes_file, "r", encoding="utf-8") as f:
+        classes_data = json.load(f)
+
+    champ_class_map = build_class_map(classes_data)
     print(f"📊 Sınıflandırma haritası oluşturuldu.")
 
-    # 4. Ana Veriyi Güncelle
     updated_count = 0
     unknown_count = 0
 
@@ -65,7 +63,27 @@ def main():
             print(f"⚠️ Sınıfı bulunamadı: {champ['name']}")
             unknown_count += 1
 
-    # 5. Kaydet
+    return updated_count, unknown_count
+
+def main():
+    # 1. Dosya Kontrolü
+    if not os.path.exists(MAIN_DATA_FILE):
+        print(f"❌ '{MAIN_DATA_FILE}' bulunamadı!")
+        return
+    if not os.path.exists(CLASSES_FILE):
+        print(f"❌ '{CLASSES_FILE}' bulunamadı! Lütfen dosyanın orada olduğundan emin ol.")
+        return
+
+    print("📂 Dosyalar yükleniyor...")
+    
+    # 2. Dosyayı Oku
+    with open(MAIN_DATA_FILE, "r", encoding="utf-8") as f:
+        main_data = json.load(f)
+
+    # 3. Ana Veriyi Güncelle
+    updated_count, unknown_count = apply(main_data)
+
+    # 4. Kaydet
     print("-" * 40)
     print(f"💾 Veriler '{MAIN_DATA_FILE}' dosyasına güncelleniyor...")
     
@@ -1,15 +1,145 @@
+import functools
+import heapq
+import importlib
+import itertools
 import json
 import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from core.dataset import DatasetSnapshot
+from core.recommendation_cache import RecommendationCache
+
+# Vektör motorunda terim satırlarının sırası (ağırlık vektörü de bu sırayla kurulur)
+WEIGHT_KEYS = (
+    "W_GENEL_WR", "W_DMG_NEED", "W_SINERJI", "W_COMP_SYNERGY",
+    "W_GEN_GOOD_VS", "W_GEN_BAD_VS", "W_EXPERT_HARD_CTR", "W_EXPERT_COUNTERED",
+    "W_LANE_ADVANTAGE", "W_LANE_DISADVANTAGE", "W_GOLD_ADV", "W_GOLD_DEF",
+    "W_CLASS_ADVANTAGE"
+)
+T_WR, T_DMG, T_SYN, T_COMP, T_GOOD, T_BAD, T_EASY, T_HARD, T_LANE_ADV, T_LANE_DIS, T_GOLD_ADV, T_GOLD_DEF, T_CLASS = range(len(WEIGHT_KEYS))
+
+# Kanonik roller ve bitmask değerleri (role_masks içinde kullanılır)
+ROLE_ORDER = ("top", "jungle", "mid", "ad carry", "support")
+ROLE_BITS = {role: 1 << k for k, role in enumerate(ROLE_ORDER)}
+
+# Client/kullanıcı rol isimleri -> kanonik rol. role_keywords da yüklemede buraya eklenir.
+CLIENT_ROLE_ALIASES = {
+    "adc": "ad carry", "bottom": "ad carry", "bot": "ad carry",
+    "support": "support", "utility": "support", "destek": "support", "sup": "support",
+    "mid": "mid", "middle": "mid", "orta": "mid",
+    "jungle": "jungle", "jungler": "jungle", "orman": "jungle",
+    "top": "top", "üst": "top",
+    "unknown": "mid", "belirsiz": "mid", "none": "mid", "": "mid"
+}
+# Yukarıda 'mid'e düşen ama rol çıkarımında "bilinmiyor" sayılan isimler
+UNKNOWN_ROLES = ("", "unknown", "none", "belirsiz")
+
+# Rol çıkarımı ön olasılıkları: 'role' alanındaki sıraya göre (birincil rol önce) ağırlıklar;
+# listede olmayan roller için küçük bir pay bırakılır (off-role seçimler)
+ROLE_PRIOR_WEIGHTS = (1.0, 0.5, 0.25)
+ROLE_PRIOR_OFF = 0.02
+# LCU'nun bildirdiği role aykırı atamalara log-olasılık cezası (çakışan roller yine de çözülebilsin diye sonlu)
+KNOWN_ROLE_PENALTY = -1000.0
+# 5 seçimin 5 koridora tüm atamaları: LANE_PERMUTATIONS[p, k] = k. seçimin slotu
+LANE_PERMUTATIONS = np.array(list(itertools.permutations(range(len(ROLE_ORDER)))), dtype=np.intp)
+LANE_ONEHOT = (LANE_PERMUTATIONS[:, :, None] == np.arange(len(ROLE_ORDER))).astype(float)
+
+# Puanlama motorları: "vector" tek NumPy geçişi, "legacy" eski döngü (referans)
+SCORING_MODES = ("vector", "legacy")
+
+# Sebep kodları -> anlatı cümleleri. Sebepler puanlama sırasında (kod, parametre) olarak
+# tutulur, metin yalnızca ilk k aday için üretilir.
+REASON_TEXTS = {
+    "WR_HIGH": "genel kazanma oranı çok yüksek (%{wr})",
+    "DMG_AP": "takımın AP hasarına ihtiyacı var ve bunu karşılıyor",
+    "DMG_AD": "takımın AD hasar açığını kapatıyor",
+    "SYNERGY": "{ally} ile harika bir ikili oluyor",
+    "EXPERT_EASY": "{enemy} karşısında uzmanlar tarafından öneriliyor",
+    "EXPERT_HARD": "{enemy} bu şampiyonu zorlayabilir",
+    "LANE_BEHIND": "istatistiksel olarak koridorda geride kalıyor",
+    "ARCHETYPE": "Takımın '{arch}' stratejisine tam uyuyor.",
+    "CLASS_ADV": "Sınıf avantajın var ({my_class} > {enemy_class}).",
+    "BAN_LANE": "{role} koridorunda muhtemel seçimlerine ({picks}) karşı güçlü",
+    "BAN_TEAM": "takımındaki {allies} bu şampiyona karşı zorlanıyor",
+    "BLIND_SAFE": "Kör seçimde güvenli: en kötü eşleşmesi ({enemy}) bile koridoru kaybettirmiyor.",
+    "BLIND_RISK": "kör seçimde riskli, uzmanlara göre {enemy} tarafından counterlanabilir",
+}
+
+# Kör seçim: koridor rakibi bilinmiyorsa aday, rol havuzundaki tüm olası rakiplere karşı
+# beklenen ve en kötü koridor puanının karışımıyla puanlanır (W_BLIND_WORST en kötü durumun payı)
+BLIND_WORST_DEFAULT = 0.5
+
+# Ban analizinde kendi seçimim bilinmiyorsa koridor tehdidi rolümün bu kadar adayına karşı ortalanır
+BAN_LIKELY_PICKS = 5
+
+
+def round_scores(scores):
+    """
+    Puanları 0.1'e yuvarlar (legacy ve vektör yollarının ortak yuvarlaması). Önce 6 basamağa
+    yuvarlanır: iki yol aynı terimleri farklı sırada topladığı için son bitlerde ayrışabilir,
+    bu gürültü .x5 sınırındaki bir puanı iki yolda farklı yöne yuvarlatmasın.
+    """
+    return np.round(np.round(scores, 6), 1)
+
+
+def select_top_k(scores, k):
+    """
+    En yüksek k puanın konumlarını azalan sırada döndürür (argpartition, O(n)).
+    Eşit puanlarda önce gelen aday kazanır; sonuç tam sıralama + [:k] ile aynıdır.
+    """
+    n = scores.size
+    if k >= n: return np.argsort(-scores, kind="stable")
+    if k <= 0: return np.empty(0, dtype=np.intp)
+    threshold = scores[np.argpartition(-scores, k - 1)[:k]].min()
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - above.size]
+    chosen = np.concatenate([above, ties])
+    return chosen[np.argsort(-scores[chosen], kind="stable")]
+
+class SnapshotTable:
+    """Motor özniteliği gibi okunan, aktif snapshot'tan derlenmiş tablo (bkz. LoLDecisionEngine.tables)."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, engine, owner=None):
+        if engine is None: return self
+        return engine.tables[self.name]
+
+def pinned(method):
+    """Metodu baştan sona tek bir snapshot üzerinde çalıştırır (bkz. LoLDecisionEngine.pinned_snapshot)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.pinned_snapshot():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class LoLDecisionEngine:
-    def __init__(self, data_file):
+    # compile_tables çıktıları; snapshot ile birlikte değişir, aynı snapshot'ı paylaşan motorlar ortak kullanır
+    role_aliases = SnapshotTable()
+    role_masks = SnapshotTable()
+    role_candidates = SnapshotTable()
+    role_log_priors = SnapshotTable()
+    positive_relations = SnapshotTable()
+    arch_names = SnapshotTable()
+    arch_matrix = SnapshotTable()
+    class_ids = SnapshotTable()
+    class_matrix = SnapshotTable()
+
+    def __init__(self, data_file, snapshot=None):
         self.data_file = data_file
-        self.data = self.load_data()
-        self.champ_lookup = {c['name'].lower(): c for c in self.data}
+        # Veri seti + N×N ilişki matrisleri + Riot ID kaydı. Verilmezse dosyadan yüklenir;
+        # motor ve tahminci aynı snapshot'ı referansla paylaşabilir.
+        self._snapshot = snapshot or DatasetSnapshot.load(data_file)
+        self._pin = threading.local()
         
         # AYARLARI YÜKLE
         self.config_path = os.path.join(os.path.dirname(data_file), "config.json")
         self.output_dir = os.path.join(os.path.dirname(data_file), "output")
+        self.active_profile = "balanced"
         self.weights = self.load_config()
 
         # Sınıf Üstünlükleri
@@ -41,12 +171,177 @@ class LoLDecisionEngine:
             "Hypercarry": ["jinx", "kog'maw", "vayne", "twitch", "kayle", "master yi", "kassadin"]
         }
 
-    def load_data(self):
-        if not os.path.exists(self.data_file):
-            print(f"❌ HATA: '{self.data_file}' bulunamadı!")
-            return []
-        with open(self.data_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        self.scoring_mode = "vector"
+        self.blind_pick = False # Açıkken koridor rakibi bilinmeyen seçimler kör seçim tablosuyla puanlanır
+        self.top_k = 10 # Arayüzde gösterilen öneri sayısı
+        self.cache = RecommendationCache(maxsize=256)
+        self.tables # derlemeyi yükleme anında yap, ilk öneride değil
+
+    @property
+    def snapshot(self):
+        """Aktif veri snapshot'ı (pinned_snapshot bloğu içindeyse sabitlenen)."""
+        return getattr(self._pin, "snapshot", None) or self._snapshot
+
+    @property
+    def data(self):
+        return self.snapshot.data
+
+    @property
+    def index(self):
+        return self.snapshot.index
+
+    @property
+    def dataset_version(self):
+        """Snapshot sürümü; önbellek anahtarında ve DraftSession'da kullanılır."""
+        return self.snapshot.version
+
+    @property
+    def tables(self):
+        return self.snapshot.derived("engine_tables", self.compile_tables)
+
+    @contextmanager
+    def pinned_snapshot(self):
+        """
+        Blok boyunca bu thread'deki tüm erişimler aynı snapshot'ı görür; araya giren
+        swap_snapshot o anki çağrıyı etkilemez. İç içe kullanılabilir.
+        """
+        if getattr(self._pin, "snapshot", None) is not None:
+            yield self._pin.snapshot
+            return
+        self._pin.snapshot = self._snapshot
+        try:
+            yield self._pin.snapshot
+        finally:
+            self._pin.snapshot = None
+
+    def swap_snapshot(self, snapshot):
+        """Yeni veri setine geçiş: tek referans ataması + önbellek temizliği."""
+        self._snapshot = snapshot
+        self.cache.clear()
+
+    def reload_data(self):
+        """Veri dosyasını yeniden okuyup yeni snapshot'a geçer."""
+        self.swap_snapshot(DatasetSnapshot.load(self.data_file))
+
+    def compile_tables(self, snapshot):
+        """Snapshot'tan motorun tüm derlenmiş tablolarını üretir (snapshot başına bir kez)."""
+        tables = self.compile_role_index(snapshot)
+        tables.update(self.compile_engine_tables(snapshot))
+        return tables
+
+    def compile_role_index(self, snapshot):
+        """
+        Serbest metin 'role' alanlarını yüklemede bir kez çözer:
+        rol -> sıralı aday indeks dizisi ve şampiyon başına rol bitmask'i.
+        """
+        role_aliases = dict(CLIENT_ROLE_ALIASES)
+        for role, keywords in self.role_keywords.items():
+            role_aliases[role] = role
+            for kw in keywords:
+                role_aliases.setdefault(kw, role)
+
+        role_masks = np.zeros(snapshot.index.size, dtype=np.uint8)
+        for i, role_text in enumerate(snapshot.index.roles):
+            for role in ROLE_ORDER:
+                if self.check_role_match(role, role_text):
+                    role_masks[i] |= ROLE_BITS[role]
+        role_candidates = {role: np.flatnonzero(role_masks & ROLE_BITS[role]) for role in ROLE_ORDER}
+
+        # Rol çıkarımı için log ön olasılıklar (N × 5); rolü olmayanlar düzgün dağılır
+        priors = np.full((snapshot.index.size, len(ROLE_ORDER)), ROLE_PRIOR_OFF)
+        for i, role_text in enumerate(snapshot.index.roles):
+            listed = []
+            for part in role_text.split(","):
+                listed += [r for r in ROLE_ORDER if r not in listed and self.check_role_match(r, part.strip())]
+            if not listed: priors[i] = 1.0
+            for rank, role in enumerate(listed):
+                priors[i, ROLE_ORDER.index(role)] = ROLE_PRIOR_WEIGHTS[min(rank, len(ROLE_PRIOR_WEIGHTS) - 1)]
+        role_log_priors = np.log(priors / priors.sum(axis=1, keepdims=True))
+        return {"role_aliases": role_aliases, "role_masks": role_masks, "role_candidates": role_candidates,
+                "role_log_priors": role_log_priors}
+
+    def resolve_role(self, role_name):
+        """Client/TR/EN rol ismini kanonik role çevirir. Tanınmayan roller 'mid' kabul edilir."""
+        return self.role_aliases.get(str(role_name).lower().strip(), "mid")
+
+    def known_slot(self, role_name):
+        """LCU/kullanıcı rol ismi -> koridor slotu (ROLE_ORDER sırası). Boş/"Unknown" için -1."""
+        key = str(role_name or "").lower().strip()
+        if key in UNKNOWN_ROLES or key not in self.role_aliases: return -1
+        return ROLE_ORDER.index(self.role_aliases[key])
+
+    def infer_lanes(self, teams, roles=None):
+        """
+        Seçimleri koridorlara atar: 5 seçimin 120 permütasyonu tek seferde, rol ön
+        olasılıklarının log toplamıyla puanlanır ve en olası atama seçilir.
+        teams: (B, 5) indeks dizisi, seçim sırasıyla (-1 boş). roles: (B, 5) bilinen slotlar (-1 bilinmiyor).
+        Döner: (layout, confidence) — layout (B, 5) ROLE_ORDER sırasıyla indeksler (-1 boş),
+        confidence (B, 5) her slottaki seçimin o slotta olma marjinal olasılığı.
+        """
+        teams = np.asarray(teams, dtype=np.intp)[:, :len(ROLE_ORDER)]
+        B, width = teams.shape
+        if width < len(ROLE_ORDER):
+            teams = np.hstack([teams, np.full((B, len(ROLE_ORDER) - width), -1, dtype=np.intp)])
+        filled = teams >= 0
+        L = np.where(filled[:, :, None], self.role_log_priors[np.where(filled, teams, 0)], 0.0)
+        if roles is not None:
+            roles = np.asarray(roles, dtype=np.intp)[:, :len(ROLE_ORDER)]
+            roles = np.hstack([roles, np.full((B, len(ROLE_ORDER) - roles.shape[1]), -1, dtype=np.intp)])
+            off_role = (roles >= 0)[:, :, None] & (np.arange(len(ROLE_ORDER)) != roles[:, :, None])
+            L = L + np.where(filled[:, :, None] & off_role, KNOWN_ROLE_PENALTY, 0.0)
+
+        scores = L[:, np.arange(len(ROLE_ORDER)), LANE_PERMUTATIONS].sum(axis=2)   # (B, 120)
+        prob = np.exp(scores - scores.max(axis=1, keepdims=True))
+        prob /= prob.sum(axis=1, keepdims=True)
+        marginal = np.einsum("bp,pks->bks", prob, LANE_ONEHOT)                    # (B, seçim, slot)
+
+        perm = LANE_PERMUTATIONS[scores.argmax(axis=1)]                             # (B, 5) seçim -> slot
+        rows, picks = np.nonzero(filled)
+        slots = perm[rows, picks]
+        layout = np.full((B, len(ROLE_ORDER)), -1, dtype=np.intp)
+        confidence = np.zeros((B, len(ROLE_ORDER)))
+        layout[rows, slots] = teams[rows, picks]
+        confidence[rows, slots] = marginal[rows, picks, slots]
+        return layout, confidence
+
+    def lane_layout(self, team, roles=None):
+        """
+        Tek takım listesi (Riot ID/isim, LCU sırası) için infer_lanes. roles: slot başına
+        LCU rol isimleri (varsa kesin kabul edilir). Döner: (layout (5,), confidence (5,))
+        """
+        picks = np.full((1, len(ROLE_ORDER)), -1, dtype=np.intp)
+        slots = np.full((1, len(ROLE_ORDER)), -1, dtype=np.intp)
+        n = 0
+        for k, ref in enumerate(team):
+            i = self.index.lookup(ref)
+            if i is None or n == len(ROLE_ORDER): continue
+            picks[0, n] = i
+            slots[0, n] = self.known_slot(roles[k]) if roles and k < len(roles) else -1
+            n += 1
+        layout, confidence = self.infer_lanes(picks, slots)
+        return layout[0], confidence[0]
+
+    def compile_engine_tables(self, snapshot):
+        """Archetype üyeliği, sınıf etkileşimi ve pozitif ilişki matrislerini vektör motoru için hazırlar."""
+        idx = snapshot.index
+        # Legacy döngü yalnızca pozitif puanları ekliyordu (if x > 0); kırpma bir kez burada yapılır
+        positive_relations = {rel: np.maximum(m, 0.0) for rel, m in idx.relations.items()}
+        arch_names = list(self.archetypes)
+        arch_matrix = np.zeros((len(arch_names), idx.size))
+        for a, arch in enumerate(arch_names):
+            for name in self.archetypes[arch]:
+                j = idx.lookup(name)
+                if j is not None: arch_matrix[a, j] = 1.0
+
+        class_names = sorted(set(idx.classes) | set(self.class_counters))
+        class_pos = {c: k for k, c in enumerate(class_names)}
+        class_ids = np.array([class_pos[c] for c in idx.classes], dtype=np.intp)
+        class_matrix = np.array([[self.get_class_interaction(a, b) for b in class_names] for a in class_names])
+        return {
+            "positive_relations": positive_relations,
+            "arch_names": arch_names, "arch_matrix": arch_matrix,
+            "class_ids": class_ids, "class_matrix": class_matrix,
+        }
 
     def load_config(self):
         """config.json dosyasından ağırlıkları çeker. Yoksa varsayılanı döner."""
@@ -54,7 +349,7 @@ class LoLDecisionEngine:
             "W_GENEL_WR": 80.0, "W_SINERJI": 15.0, "W_LANE_ADVANTAGE": 15.0, "W_LANE_DISADVANTAGE": 20.0,
             "W_GOLD_ADV": 15.0, "W_GOLD_DEF": 16.0, "W_GEN_GOOD_VS": 18.0, "W_GEN_BAD_VS": 20.0,
             "W_EXPERT_HARD_CTR": 100.0, "W_EXPERT_COUNTERED": 250.0, "W_CLASS_ADVANTAGE": 40.0,
-            "W_DMG_NEED": 15.0, "W_COMP_SYNERGY": 25.0
+            "W_DMG_NEED": 15.0, "W_COMP_SYNERGY": 25.0, "W_BLIND_WORST": BLIND_WORST_DEFAULT
         }
         
         # Eğer config.json yoksa ai_config.json'a bak (Fallback)
@@ -67,6 +362,7 @@ class LoLDecisionEngine:
                 with open(path, "r") as f:
                     cfg = json.load(f)
                     active = cfg.get("active_profile", "balanced")
+                    self.active_profile = active
                     return cfg["profiles"].get(active, default_weights)
             except Exception as e:
                 print(f"Config Load Error: {e}")
@@ -82,7 +378,7 @@ class LoLDecisionEngine:
             "W_GENEL_WR": 80.0, "W_SINERJI": 15.0, "W_LANE_ADVANTAGE": 15.0, "W_LANE_DISADVANTAGE": 20.0,
             "W_GOLD_ADV": 15.0, "W_GOLD_DEF": 16.0, "W_GEN_GOOD_VS": 18.0, "W_GEN_BAD_VS": 20.0,
             "W_EXPERT_HARD_CTR": 100.0, "W_EXPERT_COUNTERED": 250.0, "W_CLASS_ADVANTAGE": 40.0,
-            "W_DMG_NEED": 15.0, "W_COMP_SYNERGY": 25.0
+            "W_DMG_NEED": 15.0, "W_COMP_SYNERGY": 25.0, "W_BLIND_WORST": BLIND_WORST_DEFAULT
         }
         
         if os.path.exists(self.config_path):
@@ -91,17 +387,15 @@ class LoLDecisionEngine:
                     cfg = json.load(f)
                     # Sadece hafızada güncelle, dosyaya yazmaya gerek yok (veya istenirse yazılabilir)
                     self.weights = cfg["profiles"].get(profile_name, default_weights)
+                    self.active_profile = profile_name
+                    self.cache.clear()
                     print("✅ Yeni ağırlıklar yüklendi.")
             except Exception as e:
                 print(f"❌ Profil Değiştirme Hatası: {e}")
 
-    def get_list_score(self, list_data, target_name):
-        """Listelerden (Synergy, Counter) puan çeker."""
-        if not list_data or not target_name: return 0.0
-        for item in list_data:
-            if item['champion'].lower() == target_name.lower():
-                return float(item['score'])
-        return 0.0
+    def get_relation_score(self, relation, champ_name, target_name):
+        """İsimle ilişki puanı (Synergy, Counter) çeker. Derlenmiş matristen O(1) okur."""
+        return self.index.relation_score(relation, self.index.lookup(champ_name), self.index.lookup(target_name))
 
     def get_class_interaction(self, my_class, enemy_class):
         """Sınıf avantajını hesaplar (Taş-Kağıt-Makas)."""
@@ -113,17 +407,16 @@ class LoLDecisionEngine:
             return -1.0
         return 0.0
 
+    def resolve_team(self, team):
+        """Takım listesini (Riot ID veya isim) indeks listesine çevirir; boş/bilinmeyen slotlar atlanır."""
+        team_idx = [self.index.lookup(c) for c in team]
+        return [j for j in team_idx if j is not None]
+
     def analyze_team_damage(self, ally_team):
         """Takımın AD ve AP puanlarını toplar, eksiği belirler."""
-        total_ap, total_ad = 0, 0
-        
-        for ally in ally_team:
-            if ally in ["Picking...", "Unknown", "...", "None"]: continue
-            champ = self.champ_lookup.get(ally.lower())
-            if champ:
-                dmg = champ.get('damage_profile', {"ap": 5, "ad": 5})
-                total_ap += dmg['ap']
-                total_ad += dmg['ad']
+        team_idx = self.resolve_team(ally_team)
+        total_ap = self.index.ap[team_idx].sum()
+        total_ad = self.index.ad[team_idx].sum()
         
         needed = "Balanced"
         if total_ad > total_ap + 15: needed = "AP"
@@ -131,17 +424,9 @@ class LoLDecisionEngine:
         return needed
 
     def analyze_composition(self, ally_team):
-        """Takımın kompozisyon tipini (Archetype) belirler."""
-        team_archetypes = {}
-        
-        for ally in ally_team:
-            if ally in ["Picking...", "Unknown", "...", "None"]: continue
-            ally_lower = ally.lower()
-            
-            for arch, champs in self.archetypes.items():
-                if ally_lower in champs:
-                    team_archetypes[arch] = team_archetypes.get(arch, 0) + 1
-        return team_archetypes
+        """Takımın kompozisyon tipini (Archetype) belirler. {archetype: şampiyon sayısı}"""
+        counts = self.arch_matrix[:, self.resolve_team(ally_team)].sum(axis=1)
+        return {arch: int(n) for arch, n in zip(self.arch_names, counts) if n > 0}
 
     def check_role_match(self, target_role, champ_role_text):
         """Şampiyon rolünü TR/EN kelimelerle eşleştirir."""
@@ -153,6 +438,10 @@ class LoLDecisionEngine:
                 return True
         return False
 
+    def render_reasons(self, codes):
+        """(kod, parametre) listesini anlatı cümlelerine çevirir."""
+        return [REASON_TEXTS[code].format(**params) for code, params in codes]
+
     def generate_persuasive_narrative(self, name, positives, negatives, situational):
         """Puan ve sebeplere göre insani, ikna edici bir metin oluşturur."""
         import random
@@ -191,37 +480,93 @@ class LoLDecisionEngine:
             
         return " ".join(text_parts)
 
-    def calculate_score(self, my_role, enemy_laner=None, ally_team=[], enemy_team=[]):
+    @pinned
+    def calculate_score(self, my_role, enemy_laner=None, ally_team=[], enemy_team=[], mode=None, k=None):
+        """
+        Rol için en iyi k (varsayılan self.top_k) şampiyonu döndürür.
+        Şampiyon referansları Riot ID (int, LCU) veya isim olabilir; 0 ve yer tutucular boş slot sayılır.
+        mode: "vector" (varsayılan, NumPy çekirdeği) veya "legacy" (eski döngü, referans).
+        Aynı taslak durumu için sonuç LRU önbellekten döner (bkz. cache_key).
+        """
+        mode = mode or self.scoring_mode
+        k = self.top_k if k is None else k
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Bilinmeyen puanlama modu: {mode}")
+
+        key = self.cache_key(my_role, enemy_laner, ally_team, enemy_team, mode, k)
+        recommendations = self.cache.get(key)
+        if recommendations is None:
+            if mode == "legacy":
+                recommendations = self.calculate_score_legacy(my_role, enemy_laner, ally_team, enemy_team, k)
+            else:
+                recommendations = self.calculate_score_vector(my_role, enemy_laner, ally_team, enemy_team, k)
+            self.cache.put(key, recommendations)
+        # Çağıran listeyi değiştirse de önbellek bozulmasın
+        return [dict(r) for r in recommendations]
+
+    def cache_key(self, my_role, enemy_laner, ally_team, enemy_team, mode, k):
+        """
+        Normalize edilmiş taslak durumu: (rol, koridor rakibi, müttefik multiset'i,
+        rakip multiset'i, aktif profil, veri sürümü). Sıra/yer tutucu farkları aynı anahtarı verir.
+        """
+        return self.draft_key(self.resolve_role(my_role), self.index.lookup(enemy_laner),
+                              self.resolve_team(ally_team), self.resolve_team(enemy_team), mode, k)
+
+    def draft_key(self, role, laner_idx, ally_idx, enemy_idx, mode, k):
+        """cache_key'in çözülmüş (indeks) hali; DraftSession sıralamaları da bu anahtarla önbelleğe yazılır."""
+        return (
+            role,
+            laner_idx,
+            tuple(sorted(int(i) for i in ally_idx)),
+            tuple(sorted(int(i) for i in enemy_idx)),
+            self.active_profile,
+            self.dataset_version,
+            mode,
+            k,
+            self.blind_pick,
+        )
+
+    def build_recommendation(self, i, score, positives, negatives, situational):
+        """Tek bir öneri kaydı kurar; anlatı metni burada (yalnızca seçilenler için) üretilir."""
+        idx = self.index
+        narrative = self.generate_persuasive_narrative(
+            idx.names[i], self.render_reasons(positives), self.render_reasons(negatives), self.render_reasons(situational))
+        return {
+            "id": idx.registry.riot_id(i),
+            "name": idx.names[i],
+            "class": idx.classes[i],
+            "score": score,
+            "wr": float(idx.win_rate[i]),
+            "reasons": narrative # Artık liste değil, tam metin
+        }
+
+    def calculate_score_legacy(self, my_role, enemy_laner=None, ally_team=[], enemy_team=[], k=10):
         recommendations = []
         W = self.weights # Kısa kullanım için
 
         # ROL EŞLEŞTİRME
-        client_role_map = {
-            "adc": "ad carry", "bottom": "ad carry", "bot": "ad carry",
-            "support": "support", "utility": "support", "destek": "support",
-            "mid": "mid", "middle": "mid", "orta": "mid",
-            "jungle": "jungle", "orman": "jungle",
-            "top": "top", "üst": "top",
-            "unknown": "mid", "belirsiz": "mid", "none": "mid", "": "mid"
-        }
-        target_role = client_role_map.get(str(my_role).lower(), "mid")
+        target_role = self.resolve_role(my_role)
 
         needed_dmg = self.analyze_team_damage(ally_team)
         team_archs = self.analyze_composition(ally_team)
         
-        if enemy_laner and enemy_laner not in ["Picking...", "Unknown"]:
-            c = self.champ_lookup.get(enemy_laner.lower())
-            if c: enemy_class = c.get('class', 'Unknown')
-
+        idx = self.index
+        rel = idx.relations
 
-        for champ in self.data:
-            if not self.check_role_match(target_role, champ['role']): 
-                continue
+        # Referansları (ID/isim) döngüden önce bir kez indekse çevir
+        laner_idx = idx.lookup(enemy_laner)
+        enemy_class = idx.classes[laner_idx] if laner_idx is not None else "Unknown"
+        laner_name = idx.names[laner_idx] if laner_idx is not None else None
+        ally_refs = self.resolve_team(ally_team)
+        enemy_refs = [j for j in self.resolve_team(enemy_team) if j != laner_idx]
+        blind = self.blind_term(target_role) if laner_idx is None else None
 
-            name = champ['name']
-            name_lower = name.lower()
-            my_class = champ.get('class', 'Unknown')
-            dmg_profile = champ.get('damage_profile', {"ap": 5, "ad": 5})
+        for pos, i in enumerate(self.role_candidates[target_role]):
+            i = int(i)
+            # Kayıt alanları donmuş indeks dizilerinden okunur (ham JSON snapshot'tan sonra değişmiş olabilir)
+            name = idx.names[i]
+            my_class = idx.classes[i]
+            dmg_profile = {"ap": float(idx.ap[i]), "ad": float(idx.ad[i])}
             
             total_score = 0.0
             
@@ -231,72 +576,69 @@ class LoLDecisionEngine:
             situational = []
 
             # A. GENEL WIN RATE
-            wr = champ.get('general_win_rate', 0)
+            wr = float(idx.win_rate[i])
             if wr > 0:
                 score = (wr - 50.0) * W["W_GENEL_WR"]
                 total_score += score
-                if wr > 52.0: positives.append(f"genel kazanma oranı çok yüksek (%{wr})")
+                if wr > 52.0: positives.append(("WR_HIGH", {"wr": wr}))
             
             # B. HASAR İHTİYACI
             if needed_dmg == "AP":
                 bonus = dmg_profile['ap'] * W["W_DMG_NEED"]
                 total_score += bonus
-                if dmg_profile['ap'] >= 7: positives.append("takımın AP hasarına ihtiyacı var ve bunu karşılıyor")
+                if dmg_profile['ap'] >= 7: positives.append(("DMG_AP", {}))
             elif needed_dmg == "AD":
                 bonus = dmg_profile['ad'] * W["W_DMG_NEED"]
                 total_score += bonus
-                if dmg_profile['ad'] >= 7: positives.append("takımın AD hasar açığını kapatıyor")
+                if dmg_profile['ad'] >= 7: positives.append(("DMG_AD", {}))
 
             # C. TAKIM SİNERJİSİ & ARCHETYPE
             # 1. Birebir Sinerji
-            for ally in ally_team:
-                if ally in ["Picking...", "Unknown"]: continue
-                syn = self.get_list_score(champ.get('synergies', []), ally)
+            for j in ally_refs:
+                syn = float(rel['synergies'][i, j])
                 if syn > 0:
                     total_score += syn * W["W_SINERJI"]
                     if syn > 3.0: # Sadece güçlüleri söyle
-                        positives.append(f"{ally} ile harika bir ikili oluyor")
+                        positives.append(("SYNERGY", {"ally": idx.names[j]}))
 
             # 2. Archetype Bonusu (YENİ)
-            for arch, count in team_archs.items():
-                if count >= 1 and name_lower in self.archetypes[arch]:
+            for a, arch in enumerate(self.arch_names):
+                count = team_archs.get(arch, 0)
+                if count >= 1 and self.arch_matrix[a, i]:
                     # Eğer takımda zaten 1 Poke varsa, ve ben de Poke alıyorsam, Poke Kompu kuruyoruz.
                     total_score += W["W_COMP_SYNERGY"] * count
-                    situational.append(f"Takımın '{arch}' stratejisine tam uyuyor.")
+                    situational.append(("ARCHETYPE", {"arch": arch}))
 
             # D. GENEL RAKİP ANALİZİ
-            for enemy in enemy_team:
-                if enemy in ["Picking...", "Unknown"] or enemy == enemy_laner: continue
-                good = self.get_list_score(champ.get('general_good_against', []), enemy)
-                bad = self.get_list_score(champ.get('general_bad_against', []), enemy)
+            for j in enemy_refs:
+                good = float(rel['general_good_against'][i, j])
+                bad = float(rel['general_bad_against'][i, j])
                 if good > 0: total_score += good * W["W_GEN_GOOD_VS"]
                 if bad > 0: total_score -= bad * W["W_GEN_BAD_VS"]
 
             # E. KORİDOR RAKİBİ
-            if enemy_laner and enemy_laner not in ["Picking...", "Unknown"]:
-                expert = champ.get('expert_insight', {})
+            if laner_idx is not None:
                 expert_advantage = False
                 expert_disadvantage = False
 
-                # 1. Uzman Görüşü
-                easy_matchups = [c.lower() for c in expert.get('easy_matchups', [])]
-                if enemy_laner.lower() in easy_matchups:
-                    total_score += W["W_EXPERT_HARD_CTR"]
-                    positives.append(f"{enemy_laner} karşısında uzmanlar tarafından öneriliyor")
+                # 1. Uzman Görüşü (5.0'dan uzaklığa göre kademeli)
+                expert_delta = float(idx.expert_delta[i, laner_idx])
+                if idx.expert_easy[i, laner_idx]:
+                    total_score += max(expert_delta, 0.0) * W["W_EXPERT_HARD_CTR"]
+                    positives.append(("EXPERT_EASY", {"enemy": laner_name}))
                     expert_advantage = True
                 
-                hard_counters = [c.lower() for c in expert.get('hard_counters', [])]
-                if enemy_laner.lower() in hard_counters:
-                    total_score -= W["W_EXPERT_COUNTERED"]
-                    negatives.append(f"{enemy_laner} bu şampiyonu zorlayabilir")
+                if idx.expert_hard[i, laner_idx]:
+                    total_score += min(expert_delta, 0.0) * W["W_EXPERT_COUNTERED"]
+                    negatives.append(("EXPERT_HARD", {"enemy": laner_name}))
                     expert_disadvantage = True
                 
 
 
                 # 2. İstatistiksel Veri
                 if not expert_disadvantage:
-                    lane_adv = self.get_list_score(champ.get('lane_counters', []), enemy_laner)
-                    lane_dis = self.get_list_score(champ.get('lane_countered_by', []), enemy_laner)
+                    lane_adv = idx.relation_score('lane_counters', i, laner_idx)
+                    lane_dis = idx.relation_score('lane_countered_by', i, laner_idx)
                     
                     if expert_advantage and lane_dis > 0: lane_dis = 0
 
@@ -304,11 +646,11 @@ class LoLDecisionEngine:
                     if lane_dis > 0: 
                         score = lane_dis * W["W_LANE_DISADVANTAGE"]
                         total_score -= score
-                        negatives.append("istatistiksel olarak koridorda geride kalıyor")
+                        negatives.append(("LANE_BEHIND", {}))
 
                     # Gold Farkları (Sadece skor, anlatıma girme)
-                    g_adv = self.get_list_score(champ.get('lane_gold_advantage', []), enemy_laner)
-                    g_def = self.get_list_score(champ.get('lane_gold_deficit', []), enemy_laner)
+                    g_adv = idx.relation_score('lane_gold_advantage', i, laner_idx)
+                    g_def = idx.relation_score('lane_gold_deficit', i, laner_idx)
                     if g_adv > 0: total_score += (g_adv / 100.0) * W["W_GOLD_ADV"]
                     if g_def > 0: total_score -= (g_def / 100.0) * W["W_GOLD_DEF"]
 
@@ -317,20 +659,485 @@ class LoLDecisionEngine:
                     class_int = self.get_class_interaction(my_class, enemy_class)
                     if class_int > 0:
                         total_score += W["W_CLASS_ADVANTAGE"]
-                        situational.append(f"Sınıf avantajın var ({my_class} > {enemy_class}).")
+                        situational.append(("CLASS_ADV", {"my_class": my_class, "enemy_class": enemy_class}))
                     elif class_int < 0:
                         total_score -= W["W_CLASS_ADVANTAGE"]
 
-            # Anlatıyı Oluştur
-            narrative = self.generate_persuasive_narrative(name, positives, negatives, situational)
+            # F. KÖR SEÇİM (koridor rakibi bilinmiyor)
+            if blind is not None:
+                total_score += blind["score"][pos]
+                worst = int(blind["worst_opp"][pos])
+                if blind["worst"][pos] >= 0:
+                    situational.append(("BLIND_SAFE", {"enemy": idx.names[worst]}))
+                elif idx.expert_hard[i, worst]:
+                    negatives.append(("BLIND_RISK", {"enemy": idx.names[worst]}))
+
+            # Sebepler kod olarak kalır, metin sadece ilk k için üretilir
+            recommendations.append((float(round_scores(total_score)), i, positives, negatives, situational))
 
-            recommendations.append({
-                "name": name,
-                "class": my_class,
-                "score": round(total_score, 1),
-                "wr": wr,
-                "reasons": narrative # Artık liste değil, tam metin
+        # Kısmi seçim (heap); eşit puanlarda sıralama kararlı kalır
+        best = heapq.nlargest(k, recommendations, key=lambda x: x[0])
+        return [self.build_recommendation(i, score, pos, neg, sit) for score, i, pos, neg, sit in best]
+
+    def weight_vector(self):
+        """Aktif profil ağırlıklarını WEIGHT_KEYS sırasıyla vektöre çevirir."""
+        return np.array([self.weights[k] for k in WEIGHT_KEYS])
+
+    def build_context(self, my_role, enemy_laner, ally_team, enemy_team):
+        """Bir draft durumunu çekirdeğin kullandığı indeks dizilerine çevirir (çağrı başına bir kez)."""
+        target_role = self.resolve_role(my_role)
+        ally = np.array(self.resolve_team(ally_team), dtype=np.intp)
+        laner_idx = self.index.lookup(enemy_laner)
+        enemy = np.array([j for j in self.resolve_team(enemy_team) if j != laner_idx], dtype=np.intp)
+        return self.index_context(target_role, ally, enemy, laner_idx)
+
+    def blind_term(self, role):
+        """Kör seçim tablosu (bkz. compile_blind_table); kör seçim kapalıysa None."""
+        if not self.blind_pick: return None
+        return self.snapshot.derived(f"blind/{self.active_profile}/{role}", lambda s: self.compile_blind_table(role))
+
+    def compile_blind_table(self, role):
+        """
+        Rol adaylarının aynı roldeki her olası rakibe karşı koridor puanı (fill_lane_terms
+        terimleri + aktif ağırlıklar: uzman, lane_countered_by, gold farkı, sınıf) tek
+        aday × rakip matrisinde hesaplanır; satır bazında ortalama ve minimum alınır.
+        Rakip havuzu veri sürümü içinde değişmediği için (sürüm, profil, rol) başına bir kez kurulur.
+        """
+        c = self.role_candidates[role]
+        if c.size < 2:
+            zeros = np.zeros(c.size)
+            return {"score": zeros, "mean": zeros, "worst": zeros, "worst_opp": c}
+        T = np.zeros((len(WEIGHT_KEYS), c.size, c.size))
+        self.fill_lane_terms(T, c[:, None], c[None, :])
+        lane = np.tensordot(self.weight_vector(), T, axes=1)
+        np.fill_diagonal(lane, np.nan)  # ayna eşleşme sayılmaz
+        mean = np.nanmean(lane, axis=1)
+        worst_col = np.nanargmin(lane, axis=1)
+        worst = lane[np.arange(c.size), worst_col]
+        w = self.weights.get("W_BLIND_WORST", BLIND_WORST_DEFAULT)
+        return {"score": (1.0 - w) * mean + w * worst, "mean": mean, "worst": worst, "worst_opp": c[worst_col]}
+
+    def index_context(self, role, ally_idx, enemy_idx, laner_idx=None):
+        """
+        Çözümlenmiş indekslerden bağlam kurar (kanonik rol, müttefik ve koridor rakibi
+        hariç rakip indeks dizileri). Draft planlayıcı gibi referans çözümlemeden
+        binlerce durumu puanlayan çağıranlar doğrudan bunu kullanır.
+        """
+        return {
+            "cands": self.role_candidates[role],
+            "ally_idx": ally_idx,
+            "enemy_idx": enemy_idx,
+            "laner_idx": laner_idx,
+            "needed_dmg": self.needed_damage(ally_idx),
+            "arch_counts": self.arch_matrix[:, ally_idx].sum(axis=1),
+            "blind": self.blind_term(role) if laner_idx is None else None,
+        }
+
+    def needed_damage(self, ally_idx):
+        """İndeks dizisiyle analyze_team_damage: "AP", "AD" veya "Balanced"."""
+        total_ap, total_ad = self.index.ap[ally_idx].sum(), self.index.ad[ally_idx].sum()
+        if total_ad > total_ap + 15: return "AP"
+        if total_ap > total_ad + 15: return "AD"
+        return "Balanced"
+
+    def score_terms(self, ctx):
+        """
+        Tüm adaylar için ağırlıksız terim matrisini (len(WEIGHT_KEYS) × aday) hesaplar.
+        Her satır legacy döngüdeki bir if-bloğunun dizi karşılığıdır.
+        """
+        rel = self.positive_relations
+        c = ctx["cands"]
+        T = np.zeros((len(WEIGHT_KEYS), c.size))
+
+        wr = self.index.win_rate[c]
+        T[T_WR] = np.where(wr > 0, wr - 50.0, 0.0)
+
+        ally = ctx["ally_idx"]
+        if ally.size:
+            T[T_SYN] = rel['synergies'][np.ix_(c, ally)].sum(axis=1, dtype=np.float64)
+        self.fill_team_terms(T, c, ctx["needed_dmg"], ctx["arch_counts"])
+
+        enemy = ctx["enemy_idx"]
+        if enemy.size:
+            T[T_GOOD] = rel['general_good_against'][np.ix_(c, enemy)].sum(axis=1, dtype=np.float64)
+            T[T_BAD] = -rel['general_bad_against'][np.ix_(c, enemy)].sum(axis=1, dtype=np.float64)
+
+        self.fill_lane_terms(T, c, ctx["laner_idx"])
+        return T
+
+    def fill_team_terms(self, T, c, needed_dmg, arch_counts):
+        """Takım geneline bağlı satırlar: hasar ihtiyacı ve archetype uyumu."""
+        T[T_DMG] = 0.0
+        if needed_dmg == "AP": T[T_DMG] = self.index.ap[c]
+        elif needed_dmg == "AD": T[T_DMG] = self.index.ad[c]
+        T[T_COMP] = arch_counts @ self.arch_matrix[:, c]
+
+    def fill_lane_terms(self, T, c, l):
+        """Koridor rakibine bağlı satırlar (uzman, istatistik, gold, sınıf). Rakip yoksa sıfırlanır."""
+        idx = self.index
+        rel = self.positive_relations
+        T[T_EASY:T_CLASS + 1] = 0.0
+        if l is not None:
+            easy = idx.expert_easy[c, l]
+            hard = idx.expert_hard[c, l]
+            delta = idx.expert_delta[c, l]
+            # Uzman "zorlanır" diyorsa istatistik yok sayılır, "kolay" diyorsa dezavantaj yok sayılır
+            stat = (~hard).astype(float)
+            T[T_EASY] = easy * np.maximum(delta, 0.0)
+            T[T_HARD] = hard * np.minimum(delta, 0.0)
+            T[T_LANE_ADV] = stat * rel['lane_counters'][c, l]
+            T[T_LANE_DIS] = -1.0 * (~hard & ~easy) * rel['lane_countered_by'][c, l]
+            T[T_GOLD_ADV] = stat * rel['lane_gold_advantage'][c, l] / 100.0
+            T[T_GOLD_DEF] = -stat * rel['lane_gold_deficit'][c, l] / 100.0
+            T[T_CLASS] = (~easy & ~hard) * self.class_matrix[self.class_ids[c], self.class_ids[l]]
+
+    def explain_candidate(self, i, col, T, ctx):
+        """Vektör sonuçlarından legacy ile aynı sırada sebep kodlarını çıkarır."""
+        idx = self.index
+        positives, negatives, situational = [], [], []
+
+        wr = float(idx.win_rate[i])
+        if wr > 52.0: positives.append(("WR_HIGH", {"wr": wr}))
+        if ctx["needed_dmg"] == "AP" and idx.ap[i] >= 7: positives.append(("DMG_AP", {}))
+        elif ctx["needed_dmg"] == "AD" and idx.ad[i] >= 7: positives.append(("DMG_AD", {}))
+
+        for j in ctx["ally_idx"]:
+            if idx.relations['synergies'][i, j] > 3.0:
+                positives.append(("SYNERGY", {"ally": idx.names[j]}))
+
+        for a, arch in enumerate(self.arch_names):
+            if ctx["arch_counts"][a] >= 1 and self.arch_matrix[a, i]:
+                situational.append(("ARCHETYPE", {"arch": arch}))
+
+        l = ctx["laner_idx"]
+        if l is not None and idx.expert_easy[i, l]: positives.append(("EXPERT_EASY", {"enemy": idx.names[l]}))
+        if l is not None and idx.expert_hard[i, l]: negatives.append(("EXPERT_HARD", {"enemy": idx.names[l]}))
+        if T[T_LANE_DIS, col] < 0: negatives.append(("LANE_BEHIND", {}))
+        if T[T_CLASS, col] > 0:
+            situational.append(("CLASS_ADV", {"my_class": idx.classes[i], "enemy_class": idx.classes[l]}))
+
+        blind = ctx.get("blind")
+        if blind is not None:
+            worst = int(blind["worst_opp"][col])
+            if blind["worst"][col] >= 0: situational.append(("BLIND_SAFE", {"enemy": idx.names[worst]}))
+            elif idx.expert_hard[i, worst]: negatives.append(("BLIND_RISK", {"enemy": idx.names[worst]}))
+        return positives, negatives, situational
+
+    def calculate_score_vector(self, my_role, enemy_laner=None, ally_team=[], enemy_team=[], k=10):
+        """
+        Tüm rol adaylarını tek NumPy geçişinde puanlar (legacy ile aynı formül).
+        Müttefik ve koridor dışı rakip yoksa sonuç önceden kurulmuş tablolardan gelir.
+        """
+        ctx = self.build_context(my_role, enemy_laner, ally_team, enemy_team)
+        cands = ctx["cands"]
+        if not cands.size: return []
+        if not ctx["ally_idx"].size and not ctx["enemy_idx"].size:
+            served = self.table_recommendations(self.resolve_role(my_role), ctx["laner_idx"], k)
+            if served is not None: return served
+
+        return self.rank_terms(self.score_terms(ctx), ctx, k)
+
+    @pinned
+    def recommend_team(self, ally_team=[], enemy_team=[], ally_roles=None, enemy_roles=None, k=None):
+        """
+        Takımımın boş tüm slotları için ilk k öneri (5'li koçluk). Her rol calculate_score ile
+        aynı sonucu verir; koridor rakibi o rolde rol çıkarımıyla (lane_layout) yerleşen rakiptir.
+        Draft başına ortak işler bir kez yapılır: hasar ihtiyacı, archetype sayıları, müttefik
+        sinerji toplamları ve rakip sütunlarının (good/bad) toplanması; roller yalnızca kendi
+        aday satırlarını ve koridor terimlerini hesaplar. Sonuçlar calculate_score önbelleğine de yazılır.
+        Döner: {rol: öneri listesi} (ROLE_ORDER sırasıyla, yalnızca boş slotlar)
+        """
+        k = self.top_k if k is None else k
+        idx = self.index
+        rel = self.positive_relations
+        ally_layout = self.lane_layout(ally_team, ally_roles)[0]
+        enemy_layout = self.lane_layout(enemy_team, enemy_roles)[0]
+        ally = np.array(self.resolve_team(ally_team), dtype=np.intp)
+        enemy = np.array(self.resolve_team(enemy_team), dtype=np.intp)
+
+        shared = None
+        result = {}
+        for slot, role in enumerate(ROLE_ORDER):
+            if ally_layout[slot] >= 0: continue
+            laner = int(enemy_layout[slot]) if enemy_layout[slot] >= 0 else None
+            laner_ref = idx.names[laner] if laner is not None else None
+            key = self.cache_key(role, laner_ref, ally_team, enemy_team, "vector", k)
+            recommendations = self.cache.get(key) if self.scoring_mode == "vector" else None
+            if recommendations is None:
+                if self.scoring_mode != "vector":
+                    recommendations = self.calculate_score(role, laner_ref, ally_team, enemy_team, k=k)
+                    result[role] = recommendations
+                    continue
+                if shared is None:
+                    shared = {
+                        "needed_dmg": self.needed_damage(ally),
+                        "arch_counts": self.arch_matrix[:, ally].sum(axis=1),
+                        "synergy": rel['synergies'][:, ally].sum(axis=1, dtype=np.float64) if ally.size else None,
+                        "good": rel['general_good_against'][:, enemy],
+                        "bad": rel['general_bad_against'][:, enemy],
+                    }
+                recommendations = self.team_slot_recommendations(role, ally, enemy, laner, shared, k)
+                self.cache.put(key, recommendations)
+            result[role] = [dict(r) for r in recommendations]
+        return result
+
+    def team_slot_recommendations(self, role, ally, enemy, laner, shared, k):
+        """recommend_team için tek rol: score_terms ile aynı satırlar, ortak toplamlardan doldurulur."""
+        keep = enemy != laner
+        ctx = {
+            "cands": self.role_candidates[role],
+            "ally_idx": ally,
+            "enemy_idx": enemy[keep],
+            "laner_idx": laner,
+            "needed_dmg": shared["needed_dmg"],
+            "arch_counts": shared["arch_counts"],
+            "blind": self.blind_term(role) if laner is None else None,
+        }
+        c = ctx["cands"]
+        if not c.size: return []
+        if not ally.size and not keep.any():
+            served = self.table_recommendations(role, laner, k)
+            if served is not None: return served
+
+        T = np.zeros((len(WEIGHT_KEYS), c.size))
+        wr = self.index.win_rate[c]
+        T[T_WR] = np.where(wr > 0, wr - 50.0, 0.0)
+        if ally.size: T[T_SYN] = shared["synergy"][c]
+        self.fill_team_terms(T, c, ctx["needed_dmg"], ctx["arch_counts"])
+        if keep.any():
+            T[T_GOOD] = shared["good"][np.ix_(c, keep)].sum(axis=1, dtype=np.float64)
+            T[T_BAD] = -shared["bad"][np.ix_(c, keep)].sum(axis=1, dtype=np.float64)
+        self.fill_lane_terms(T, c, laner)
+        return self.rank_terms(T, ctx, k)
+
+    @pinned
+    def what_if_matrix(self, my_role, enemy_laner=None, ally_team=[], enemy_team=[], banned=[], enemy_roles=None, k=5, m=5):
+        """
+        İlk k adayım için rakibin açık slotlarına gelebilecek en güçlü m cevap ve her cevabın
+        adayımın puanını ne kadar değiştirdiği (k × m). k×m ayrı calculate_score yerine tek
+        toplu geçiş: cevap etkileri aday × tüm-uygun-şampiyon ızgarasında hesaplanır.
+        Açık slotlar lane_layout(enemy_team, enemy_roles) ile bulunur; cevaplar bu slotlardan
+        en az birini oynayabilen şampiyonlardır.
+          - Koridor rakibi henüz yoksa, benim koridorum açıksa ve cevap benim rolümü oynayabiliyorsa koridor rakibi olur:
+            fark = koridor terimleri (fill_lane_terms) - varsa kör seçim terimi
+          - Diğer cevaplar genel rakip olarak good/bad terimlerini değiştirir
+        "En güçlü" cevaplar adaylarımın puanını ortalamada en çok düşürenlerdir (eşitlikte yüksek WR).
+        Döner: {"candidates", "base", "responses", "delta" (k × m liste)}
+        """
+        role = self.resolve_role(my_role)
+        ctx = self.build_context(my_role, enemy_laner, ally_team, enemy_team)
+        result = {"candidates": [], "base": [], "responses": [], "delta": []}
+        if not ctx["cands"].size: return result
+
+        scores = self.weighted_scores(self.score_terms(ctx), ctx)
+        top = select_top_k(scores, k)
+        cands = ctx["cands"][top]
+        result["candidates"] = [self.index.names[i] for i in cands]
+        result["base"] = [float(s) for s in scores[top]]
+
+        enemies = self.resolve_team(enemy_team)
+        if len(enemies) >= 5: return result
+        taken = np.concatenate([ctx["ally_idx"], np.array(enemies + self.resolve_team(banned), dtype=np.intp), cands])
+        responses = np.setdiff1d(np.arange(self.index.size), taken)
+        layout, _ = self.lane_layout(enemy_team, enemy_roles)
+        open_bits = sum(ROLE_BITS[r] for s, r in enumerate(ROLE_ORDER) if layout[s] < 0)
+        responses = responses[(self.role_masks[responses] & open_bits) != 0]
+        if not responses.size: return result
+
+        w = self.weight_vector()
+        rel = self.positive_relations
+        delta = (w[T_GOOD] * rel['general_good_against'][np.ix_(cands, responses)]
+                 - w[T_BAD] * rel['general_bad_against'][np.ix_(cands, responses)])
+        if ctx["laner_idx"] is None and open_bits & ROLE_BITS[role]:
+            T = np.zeros((len(WEIGHT_KEYS), cands.size, responses.size))
+            self.fill_lane_terms(T, cands[:, None], responses[None, :])
+            lane = np.tensordot(w, T, axes=1)
+            if ctx["blind"] is not None: lane -= ctx["blind"]["score"][top][:, None]
+            delta = np.where(self.role_masks[responses] & ROLE_BITS[role], lane, delta)
+
+        # Eşit etkide (ör. yalnızca genel terimler sıfırsa) genel kazanma oranı yüksek olan önce gelir
+        strongest = np.lexsort((-self.index.win_rate[responses], np.round(delta.mean(axis=0), 1)))[:m]
+        result["responses"] = [self.index.names[j] for j in responses[strongest]]
+        result["delta"] = np.round(delta[:, strongest], 1).tolist()
+        return result
+
+    @property
+    def recommendation_tables(self):
+        """Snapshot için çevrimdışı kurulmuş öneri tabloları (core.recommendation_tables); yoksa/bayatsa {}."""
+        return self.snapshot.derived("recommendation_tables", self.open_recommendation_tables)
+
+    @staticmethod
+    def artifact_module(name):
+        # Tablo/indeks modülleri bu modülü içe aktarır; döngüyü önlemek için ilk kullanımda yüklenir
+        return importlib.import_module(f"core.{name}")
+
+    def load_artifact(self, snapshot, loader):
+        """
+        Snapshot için derlenmiş yapıyı loader(veri_dosyası, özetler) ile açar. Yapı snapshot'ın
+        kendi kaynak özetleriyle eşleşmeli; diskteki veri snapshot'tan sonra değiştiyse None.
+        """
+        hashes = snapshot.current_sources()
+        if hashes is None: return None
+        return loader(snapshot.path, hashes)
+
+    def open_recommendation_tables(self, snapshot):
+        return self.load_artifact(snapshot, self.artifact_module("recommendation_tables").load_tables) or {}
+
+    def table_recommendations(self, role, laner_idx, k):
+        """
+        "Rolüm + koridor rakibi, başka seçim yok" sorgusunu tablodan cevaplar. Tablo yoksa,
+        aktif ağırlıklar tablodaki profille aynı değilse, k büyükse veya kör seçim
+        açıkken rakip bilinmiyorsa None (canlı puanlama). Sebepler yalnızca seçilen k aday için çıkarılır.
+        """
+        tables = self.recommendation_tables
+        if not tables or k > tables["k"] or (laner_idx is None and self.blind_pick): return None
+        if tables["profiles"].get(self.active_profile) != self.weights: return None
+        p = list(tables["profiles"]).index(self.active_profile)
+        col = self.index.size if laner_idx is None else laner_idx
+        picks = tables["idx"][p, ROLE_ORDER.index(role), col, :k]
+        picks = picks[picks >= 0].astype(np.intp)
+        scores = tables["score"][p, ROLE_ORDER.index(role), col, :picks.size]
+
+        empty = np.empty(0, dtype=np.intp)
+        ctx = self.index_context(role, empty, empty, laner_idx)
+        ctx["cands"] = picks
+        T = self.score_terms(ctx)
+        recommendations = []
+        for n, i in enumerate(picks):
+            positives, negatives, situational = self.explain_candidate(int(i), n, T, ctx)
+            recommendations.append(self.build_recommendation(int(i), float(scores[n]), positives, negatives, situational))
+        return recommendations
+
+    @property
+    def similarity_index(self):
+        """Şampiyon benzerlik indeksi (core.similarity_index); diskte yoksa/bayatsa bellekte kurulur."""
+        return self.snapshot.derived("similarity_index", self.open_similarity_index)
+
+    def open_similarity_index(self, snapshot):
+        similarity = self.artifact_module("similarity_index")
+        index = self.load_artifact(snapshot, similarity.load_index)
+        if index is not None and index["idx"].shape[0] == snapshot.index.size: return index
+        return similarity.build_index(self)
+
+    @pinned
+    def similar_champions(self, champ, k=5, unavailable=[], role=None):
+        """
+        Yasaklanan/alınan bir öneri için en yakın k yedek. Önceden kurulmuş komşu listesi
+        sırayla taranır (O(k)); unavailable'dakiler ve role verilirse o rolü oynayamayanlar atlanır.
+        Döner: [{"id", "name", "class", "similarity"}] (benzerliğe göre azalan)
+        """
+        i = self.index.lookup(champ)
+        if i is None: return []
+        index = self.similarity_index
+        skip = set(self.resolve_team(unavailable))
+        role_bit = ROLE_BITS[self.resolve_role(role)] if role is not None else 0
+        alternatives = []
+        for j, sim in zip(index["idx"][i], index["sim"][i]):
+            j = int(j)
+            if j in skip or (role_bit and not self.role_masks[j] & role_bit): continue
+            alternatives.append({
+                "id": self.index.registry.riot_id(j),
+                "name": self.index.names[j],
+                "class": self.index.classes[j],
+                "similarity": float(sim),
             })
+            if len(alternatives) == k: break
+        return alternatives
+
+    def candidate_scores(self, ctx):
+        """Bağlamdaki tüm adayların puanları (öneri kaydı/anlatı üretmeden, rank_terms ile aynı yuvarlama)."""
+        return self.weighted_scores(self.score_terms(ctx), ctx)
+
+    def weighted_scores(self, T, ctx):
+        """Terim matrisi × aktif ağırlıklar (+ kör seçim terimi), 0.1'e yuvarlanmış."""
+        scores = self.weight_vector() @ T
+        if ctx.get("blind") is not None: scores = scores + ctx["blind"]["score"]
+        return round_scores(scores)
+
+    def rank_terms(self, T, ctx, k):
+        """Terim matrisini aktif ağırlıklarla puanlar, ilk k adayı seçer ve öneri kayıtlarını kurar."""
+        cands = ctx["cands"]
+        scores = self.weighted_scores(T, ctx)
+
+        recommendations = []
+        for col in select_top_k(scores, k):
+            i = int(cands[col])
+            positives, negatives, situational = self.explain_candidate(i, col, T, ctx)
+            recommendations.append(self.build_recommendation(i, float(scores[col]), positives, negatives, situational))
+        return recommendations
+
+    def likely_picks(self, role, my_pick, ally_idx, enemy_idx, unavailable):
+        """Ban analizi için muhtemel seçimlerim: hover/kilit varsa o, yoksa rolümün ilk BAN_LIKELY_PICKS adayı."""
+        pick = self.index.lookup(my_pick)
+        if pick is not None: return np.array([pick], dtype=np.intp)
+        ctx = self.index_context(role, ally_idx, enemy_idx)
+        if not ctx["cands"].size: return ctx["cands"]
+        scores = np.where(np.isin(ctx["cands"], unavailable), -np.inf, self.candidate_scores(ctx))
+        return ctx["cands"][select_top_k(scores, BAN_LIKELY_PICKS)]
 
-        recommendations.sort(key=lambda x: x['score'], reverse=True)
-        return recommendations[:10]
+    @pinned
+    def rank_bans(self, my_role, ally_team=[], enemy_team=[], banned=[], my_pick=None, k=None):
+        """
+        Tüm şampiyonları rolüme ve takımımın kilitli seçimlerine karşı oluşturdukları
+        tehdide göre tek NumPy geçişinde sıralar. Seçilmiş/yasaklı şampiyonlar atlanır.
+          - Genel güç     : (wr - 50) * W_GENEL_WR
+          - Koridor tehdidi: muhtemel seçimlerimin o şampiyona karşı koridor puanının eksi
+                            ortalaması (fill_lane_terms terimleri, aktif profil ağırlıkları);
+                            yalnızca benim rolümü oynayabilenler için
+          - Takım zaafı   : müttefiklerin o şampiyona karşı general_bad_against puanları
+                            eksi general_good_against puanları
+        """
+        k = self.top_k if k is None else k
+        idx = self.index
+        W = self.weights
+        role = self.resolve_role(my_role)
+        ally = np.array(self.resolve_team(ally_team), dtype=np.intp)
+        enemy = np.array(self.resolve_team(enemy_team), dtype=np.intp)
+        unavailable = np.concatenate([ally, enemy, np.array(self.resolve_team(banned + [my_pick]), dtype=np.intp)])
+        likely = self.likely_picks(role, my_pick, ally, enemy, unavailable)
+        everyone = np.arange(idx.size)
+
+        wr = idx.win_rate.astype(np.float64)
+        wr_term = np.where(wr > 0, wr - 50.0, 0.0) * W["W_GENEL_WR"]
+
+        # Her (muhtemel seçimim, şampiyon) çifti için koridor terimleri: likely × N matris, tek çağrı
+        lane_term = np.zeros(idx.size)
+        if likely.size:
+            T = np.zeros((len(WEIGHT_KEYS), likely.size, idx.size))
+            self.fill_lane_terms(T, likely[:, None], everyone[None, :])
+            lane_term = -np.tensordot(self.weight_vector(), T, axes=1).mean(axis=0)
+            lane_term = np.where(self.role_masks & ROLE_BITS[role], lane_term, 0.0)
+
+        # general_bad_against veride negatif işaretli tutulur (pozitif kırpma onu sıfırlar); büyüklüğü kullanılır
+        exposure = np.abs(idx.relations['general_bad_against'][ally])
+        team_term = np.zeros(idx.size)
+        if ally.size:
+            team_term = (exposure.sum(axis=0, dtype=np.float64) * W["W_GEN_BAD_VS"]
+                         - self.positive_relations['general_good_against'][ally].sum(axis=0, dtype=np.float64) * W["W_GEN_GOOD_VS"])
+
+        scores = np.round(wr_term + lane_term + team_term, 1)
+        scores[unavailable] = -np.inf
+
+        bans = []
+        for j in select_top_k(scores, k):
+            if scores[j] == -np.inf: break
+            j = int(j)
+            reasons = []
+            if wr[j] > 52.0: reasons.append(("WR_HIGH", {"wr": float(wr[j])}))
+            if lane_term[j] > 0:
+                reasons.append(("BAN_LANE", {"role": role, "picks": ", ".join(idx.names[p] for p in likely[:3])}))
+            if team_term[j] > 0:
+                weak = [idx.names[a] for n, a in enumerate(ally) if exposure[n, j] > 0]
+                if weak: reasons.append(("BAN_TEAM", {"allies": ", ".join(weak)}))
+            text = f"🚫 **Yasakla:** {idx.names[j]}"
+            if reasons: text += " — " + "; ".join(self.render_reasons(reasons)) + "."
+            bans.append({
+                "id": idx.registry.riot_id(j),
+                "name": idx.names[j],
+                "class": idx.classes[j],
+                "score": float(scores[j]),
+                "wr": float(wr[j]),
+                "threat": {"wr": float(wr_term[j]), "lane": float(lane_term[j]), "team": float(team_term[j])},
+                "reasons": text,
+            })
+        return bans
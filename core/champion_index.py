@@ -0,0 +1,140 @@
+import numpy as np
+
+from core.champion_registry import ChampionRegistry
+
+# Derlenen ilişki listeleri (veri setindeki anahtar isimleriyle birebir aynı)
+RELATIONS = (
+    "synergies",
+    "lane_counters",
+    "lane_countered_by",
+    "lane_gold_advantage",
+    "lane_gold_deficit",
+    "general_good_against",
+    "general_bad_against",
+)
+
+# İlişki matrisleri dışında diske yazılan dizi alanları
+ARRAY_FIELDS = ("expert_easy", "expert_hard", "expert_delta", "win_rate", "ap", "ad")
+
+# Uzman puanları 0.1 (en zor) - 10.0 (en kolay) aralığında, 5.0 nötr
+EXPERT_NEUTRAL = 5.0
+
+
+class ChampionIndex:
+    """
+    Şampiyon veri setinin derlenmiş (compiled) hali.
+
+    Her ilişki listesi (synergies, lane_counters ...) yükleme anında bir kez
+    N×N float32 matrise çevrilir: matrix[i, j] = i. şampiyonun listesinde
+    j. şampiyonun puanı. Listede olmayan çiftler 0.0'dır, böylece eski
+    get_list_score davranışıyla (bulunamazsa 0.0) birebir aynı sonuç verir.
+
+    Tekrar eden kayıt kuralı: Bir listede aynı şampiyon birden fazla kez
+    geçiyorsa (örn. Aatrox sinerjilerinde iki "Malphite" satırı) İLK kayıt
+    geçerlidir. Eski doğrusal tarama da ilk eşleşmede dönüyordu; site
+    tabloları puana göre sıralı geldiği için bu genelde en güçlü satırdır.
+
+    expert_delta[i, j]: uzman eşleşme puanının 5.0'dan uzaklığı, [-1, 1] aralığına
+    ölçeklenmiş (10.0 -> +1, 0.1 -> -1). Veride matchup_scores yoksa (eski merge)
+    easy/hard listelerinden +1 / -1 olarak türetilir.
+    """
+
+    def __init__(self, data, id_map=None):
+        names = [c['name'] for c in data]
+        slugs = [c.get('slug') for c in data]
+        self.registry = ChampionRegistry(names, slugs, id_map)
+        self.names = self.registry.names
+        self.size = self.registry.size
+        self.slugs = slugs
+        self.roles = [c.get('role', '') for c in data]
+
+        n = self.size
+        self.relations = {rel: np.zeros((n, n), dtype=np.float32) for rel in RELATIONS}
+        self.expert_easy = np.zeros((n, n), dtype=bool)
+        self.expert_hard = np.zeros((n, n), dtype=bool)
+        self.expert_delta = np.zeros((n, n), dtype=np.float32)
+
+        self.win_rate = np.zeros(n)
+        self.ap = np.full(n, 5.0)
+        self.ad = np.full(n, 5.0)
+        self.classes = []
+
+        for i, champ in enumerate(data):
+            self.win_rate[i] = champ.get('general_win_rate', 0)
+            dmg = champ.get('damage_profile', {"ap": 5, "ad": 5})
+            self.ap[i] = dmg['ap']
+            self.ad[i] = dmg['ad']
+            self.classes.append(champ.get('class', 'Unknown'))
+
+            for rel in RELATIONS:
+                self._fill_row(self.relations[rel][i], champ.get(rel, []))
+
+            expert = champ.get('expert_insight', {})
+            for name in expert.get('easy_matchups', []):
+                j = self.lookup(name)
+                if j is not None: self.expert_easy[i, j] = True
+            for name in expert.get('hard_counters', []):
+                j = self.lookup(name)
+                if j is not None: self.expert_hard[i, j] = True
+            self._fill_expert_row(i, expert.get('matchup_scores'))
+
+    def _fill_expert_row(self, i, scores):
+        row = self.expert_delta[i]
+        if not scores:
+            row[:] = self.expert_easy[i].astype(np.float32) - self.expert_hard[i]
+            return
+        for name, score in scores.items():
+            j = self.lookup(name)
+            if j is None or row[j]: continue
+            span = 10.0 - EXPERT_NEUTRAL if score > EXPERT_NEUTRAL else EXPERT_NEUTRAL - 0.1
+            row[j] = max(-1.0, min(1.0, (score - EXPERT_NEUTRAL) / span))
+
+    @classmethod
+    def from_arrays(cls, meta, arrays, id_map=None):
+        """
+        Derlenmiş önbellekten (bkz. core.compiled_dataset) indeks kurar; JSON okunmaz.
+        meta: names/slugs/roles/classes listeleri, arrays: to_arrays() çıktısı (mmap olabilir).
+        """
+        self = cls.__new__(cls)
+        self.registry = ChampionRegistry(meta['names'], meta['slugs'], id_map)
+        self.names = self.registry.names
+        self.size = self.registry.size
+        self.slugs = list(meta['slugs'])
+        self.roles = list(meta['roles'])
+        self.classes = list(meta['classes'])
+        self.relations = {rel: arrays[rel] for rel in RELATIONS}
+        for name in ARRAY_FIELDS:
+            setattr(self, name, arrays[name])
+        return self
+
+    def to_arrays(self):
+        """Diske yazılacak dizi blokları (isim -> ndarray)."""
+        arrays = {name: getattr(self, name) for name in ARRAY_FIELDS}
+        arrays.update(self.relations)
+        return arrays
+
+    def to_meta(self):
+        """Dizi olmayan alanlar (derlenmiş önbelleğin başlığına yazılır)."""
+        return {"names": self.names, "slugs": self.slugs, "roles": self.roles, "classes": self.classes}
+
+    def _fill_row(self, row, items):
+        seen = set()
+        for item in items:
+            j = self.lookup(item['champion'])
+            if j is None or j in seen: continue
+            seen.add(j)
+            row[j] = float(item['score'])
+
+    def lookup(self, ref):
+        """Riot ID veya ismi şampiyon indeksine çevirir. Bulunamazsa None döner."""
+        return self.registry.resolve(ref)
+
+    def relation_score(self, relation, champ_idx, target_idx):
+        """O(1) ilişki puanı. İndekslerden biri None ise 0.0 döner."""
+        if champ_idx is None or target_idx is None: return 0.0
+        return float(self.relations[relation][champ_idx, target_idx])
+
+    def freeze(self):
+        """Tüm dizileri salt-okunur yapar (paylaşılan snapshot'larda yanlışlıkla yazmayı engeller)."""
+        for arr in list(self.to_arrays().values()) + [self.registry.riot_ids]:
+            arr.flags.writeable = False
@@ -0,0 +1,93 @@
+import json
+import os
+import re
+
+import numpy as np
+
+# Sitelerde/uzman notlarında geçen kısa isimler -> veri setindeki kanonik isim
+NAME_ALIASES = {
+    "nunu": "Nunu & Willump",
+    "willump": "Nunu & Willump",
+    "mundo": "Dr. Mundo",
+    "yi": "Master Yi",
+    "monkeyking": "Wukong",
+    "renata": "Renata Glasc",
+    "bluekayn": "Kayn",
+    "redkayn": "Kayn",
+}
+
+
+def normalize_key(name):
+    """
+    İsim karşılaştırmaları için tek anahtar üretir.
+    Örn: "Kai'Sa" -> "kaisa", "Nunu & Willump" -> "nunuwillump", "Dr. Mundo" -> "drmundo"
+    """
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+def load_id_map(data_dir):
+    """data/champion_id_map.json dosyasını okur ({"266": "Aatrox"}). Yoksa boş döner."""
+    path = os.path.join(data_dir, "champion_id_map.json")
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ ID Map okunamadı ({path}): {e}")
+        return {}
+
+
+class ChampionRegistry:
+    """
+    Kanonik şampiyon kaydı: Riot sayısal ID <-> veri seti indeksi <-> görünen isim.
+
+    Motorlar içeride yalnızca indeks kullanır. Dışarıdan gelen her şampiyon
+    referansı (LCU'dan int ID ya da kullanıcıdan/JSON'dan isim) tek noktada,
+    resolve() ile indekse çevrilir; "Nunu & Willump" / "nunu" gibi farklar
+    burada çözülür.
+    """
+
+    def __init__(self, names, slugs=(), id_map=None):
+        self.names = list(names)
+        self.size = len(self.names)
+        self.idx_by_key = {}
+        for i, name in enumerate(self.names):
+            # Aynı isim iki kez geçerse ilk kayıt esas alınır
+            self.idx_by_key.setdefault(normalize_key(name), i)
+        for i, slug in enumerate(slugs):
+            if slug:
+                self.idx_by_key.setdefault(normalize_key(slug), i)
+        for alias, name in NAME_ALIASES.items():
+            i = self.idx_by_key.get(normalize_key(name))
+            if i is not None: self.idx_by_key.setdefault(alias, i)
+
+        self.idx_by_riot_id = {}
+        self.riot_ids = np.full(self.size, -1, dtype=np.int32)
+        for riot_id, name in (id_map or {}).items():
+            i = self.idx_by_key.get(normalize_key(name))
+            if i is None: continue
+            self.idx_by_riot_id[int(riot_id)] = i
+            self.riot_ids[i] = int(riot_id)
+
+    def resolve(self, ref):
+        """
+        Riot ID (int) veya isim (str) -> veri seti indeksi.
+        0 ("Picking..."), yer tutucular ve bilinmeyenler için None döner.
+        """
+        if ref is None or isinstance(ref, bool): return None
+        if isinstance(ref, (int, np.integer)):
+            return self.idx_by_riot_id.get(int(ref))
+        return self.idx_by_key.get(normalize_key(ref))
+
+    def riot_id(self, idx):
+        """İndeksin Riot ID'si (haritada yoksa None)."""
+        rid = int(self.riot_ids[idx])
+        return rid if rid >= 0 else None
+
+    def display_name(self, ref):
+        """Arayüz için isim. Çözülemeyen referanslar olduğu gibi metne çevrilir."""
+        i = self.resolve(ref)
+        if i is None:
+            return "Picking..." if ref == 0 else str(ref)
+        return self.names[i]
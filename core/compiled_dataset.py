@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from core.champion_index import ChampionIndex
+
+# Başlık biçimi değişirse artırılır; eski önbellekler otomatik yeniden derlenir
+COMPILED_FORMAT = 3
+COMPILED_DIR = "compiled"
+# Derlenmiş veri seti yapısının adı (başlık: dataset.json, diziler: dataset.<nesil>/)
+DATASET_ARTIFACT = "dataset"
+
+# Derlenmiş veri bu dosyalardan türetilir; herhangi birinin içeriği değişirse önbellek bayattır.
+# (Sınıf ve hasar dosyaları merge ile ana veriye gömülür, config ağırlıkları motor tarafından okunur.)
+SOURCE_FILES = (
+    "tum_sampiyonlar_verisi_full.json",
+    "champion_classes.json",
+    "champion_damage_scores.json",
+    "config.json",
+)
+
+
+def compiled_dir(data_file):
+    return os.path.join(os.path.dirname(data_file), COMPILED_DIR)
+
+
+def file_sha1(path):
+    """Dosya içeriğinin SHA-1 özeti. Dosya yoksa None."""
+    if not os.path.exists(path): return None
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_hashes(data_file):
+    """Kaynak dosyaların içerik özetleri ({dosya adı: sha1}). Ana veri dosyası da dahildir."""
+    data_dir = os.path.dirname(data_file)
+    hashes = {name: file_sha1(os.path.join(data_dir, name)) for name in SOURCE_FILES}
+    hashes[os.path.basename(data_file)] = file_sha1(data_file)
+    return hashes
+
+
+def read_artifact(data_file, name, fmt, hashes):
+    """
+    Derlenmiş bir yapıyı (veri seti, öneri tabloları, benzerlik indeksi) açar.
+    Başlık yoksa, biçim eskiyse veya kaynak özetleri tutmuyorsa None döner.
+    Dizi blokları başlığın gösterdiği nesil klasöründen numpy.load(mmap_mode='r') ile
+    açılır; sayfalar erişildikçe okunur. Döner: (başlık, {ad: dizi}) veya None
+    """
+    folder = compiled_dir(data_file)
+    header_path = os.path.join(folder, f"{name}.json")
+    if not os.path.exists(header_path): return None
+    with open(header_path, 'r', encoding='utf-8') as f:
+        header = json.load(f)
+    if header.get("format") != fmt or header.get("sources") != hashes:
+        return None
+    generation = os.path.join(folder, header["generation"])
+    arrays = {key: np.load(os.path.join(generation, f"{key}.npy"), mmap_mode='r') for key in header["arrays"]}
+    return header, arrays
+
+
+def write_artifact(data_file, name, fmt, hashes, arrays, extra=None):
+    """
+    Dizileri her yazımda yeni bir nesil klasörüne (compiled/<ad>.<nesil>/) yazar, başlığı
+    (compiled/<ad>.json) en son os.replace ile koyar. Mevcut dosyaların üzerine hiç yazılmaz:
+    onları mmap ile açmış snapshot'lar eski içeriği görmeye devam eder, yarım kalan bir yazım
+    da asla geçerli sayılmaz. Eski nesiller sonra silinir; Windows'ta hâlâ eşlenmiş olanlar
+    silinemezse bir sonraki yazımda tekrar denenir. OSError çağırana bırakılır.
+    """
+    folder = compiled_dir(data_file)
+    generation = f"{name}.{time.time_ns():x}{os.getpid():x}"
+    os.makedirs(os.path.join(folder, generation))
+    for key, arr in arrays.items():
+        np.save(os.path.join(folder, generation, f"{key}.npy"), np.ascontiguousarray(arr))
+
+    header = dict(extra or {}, format=fmt, sources=hashes, arrays=sorted(arrays), generation=generation)
+    header_path = os.path.join(folder, f"{name}.json")
+    tmp_path = header_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(header, f, ensure_ascii=False)
+    os.replace(tmp_path, header_path)
+
+    for entry in os.listdir(folder):
+        if entry.startswith(f"{name}.") and entry != generation and os.path.isdir(os.path.join(folder, entry)):
+            shutil.rmtree(os.path.join(folder, entry), ignore_errors=True)
+
+
+def load_compiled(data_file, hashes, id_map=None):
+    """
+    Derlenmiş önbellekten indeks kurar (bkz. read_artifact). Geçerli önbellek yoksa None
+    döner (çağıran JSON'dan derleyip write_compiled ile yeniler).
+    """
+    try:
+        artifact = read_artifact(data_file, DATASET_ARTIFACT, COMPILED_FORMAT, hashes)
+        if artifact is None: return None
+        header, arrays = artifact
+        return ChampionIndex.from_arrays(header["meta"], arrays, id_map)
+    except Exception as e:
+        print(f"⚠️ Derlenmiş veri okunamadı, JSON'dan yeniden derlenecek: {e}")
+        return None
+
+
+def write_compiled(index, data_file, hashes):
+    """İndeksi derlenmiş önbelleğe yazar (bkz. write_artifact)."""
+    try:
+        write_artifact(data_file, DATASET_ARTIFACT, COMPILED_FORMAT, hashes, index.to_arrays(), {"meta": index.to_meta()})
+    except OSError as e:
+        # Salt-okunur kurulumlarda (ör. paketlenmiş exe) önbelleksiz devam edilir
+        print(f"⚠️ Derlenmiş veri yazılamadı ({compiled_dir(data_file)}): {e}")
+
+
+def bench(data_file):
+    """Soğuk yükleme süresi ve tepe bellek: JSON'dan derleme vs derlenmiş önbellek."""
+    from core.dataset import DatasetSnapshot
+
+    def measure(label, **kwargs):
+        tracemalloc.start()
+        t = time.perf_counter()
+        snapshot = DatasetSnapshot.load(data_file, **kwargs)
+        elapsed = (time.perf_counter() - t) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"   {label:<22} {elapsed:8.1f} ms   tepe bellek {peak / 1e6:6.2f} MB   ({snapshot.index.size} şampiyon)")
+
+    print(f"📊 Yükleme ölçümü: {data_file}")
+    measure("JSON (önbelleksiz)", use_compiled=False)
+    DatasetSnapshot.load(data_file)  # önbellek bayatsa burada yenilenir
+    measure("Derlenmiş (mmap)")
+    print("   Not: mmap sayfaları tracemalloc'a dahil değildir; diziler erişildikçe diskten okunur.")
+
+
+if __name__ == "__main__":
+    # Kullanım: python -m core.compiled_dataset [veri_dosyası]
+    bench(sys.argv[1] if len(sys.argv) > 1 else os.path.join("data", "tum_sampiyonlar_verisi_full.json"))
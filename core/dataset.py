@@ -0,0 +1,108 @@
+import hashlib
+import itertools
+import json
+import os
+import threading
+
+from core.champion_index import ChampionIndex
+from core.champion_registry import load_id_map
+from core.compiled_dataset import load_compiled, source_hashes, write_compiled
+
+# Süreç boyunca artan snapshot sürümü (motor önbellek anahtarlarında kullanılır)
+_versions = itertools.count(1)
+
+
+class DatasetSnapshot:
+    """
+    Şampiyon veri setinin değişmez (immutable) bir anlık görüntüsü.
+
+    JSON bir kez okunur ve ChampionIndex bir kez derlenir; LoLDecisionEngine ve
+    LoLMatchPredictor aynı nesneyi referansla paylaşır. Merge sonrası yeni bir
+    snapshot yüklenir ve motorlara tek bir referans ataması ile verilir
+    (swap_snapshot); o anda çalışan çağrılar eski snapshot'ı kullanmaya devam eder.
+
+    Veri kayıtları salt-okunur kabul edilir: liste tuple'a çevrilir, indeks
+    dizileri yazmaya kapatılır. Motorların türettiği tablolar da derived() ile
+    snapshot'a bağlanır, böylece bir kez hesaplanır ve snapshot ile birlikte değişir.
+
+    Derlenmiş önbellekten (core.compiled_dataset) açılan snapshot'larda ham
+    kayıtlar (data) yalnızca ilk erişimde JSON'dan okunur; öneri, tahmin ve legacy
+    puanlama yolları indeks dizileriyle çalıştığı için normalde hiç okunmaz. Dosya
+    snapshot kurulduktan sonra değiştiyse (ör. merge) kayıtlar indeksle uyuşmayacağı
+    için okunmaz, hata verilir.
+    """
+
+    def __init__(self, data, id_map=None, path=None, index=None, source_hash=None, sources=None):
+        self._data = tuple(data) if data is not None else None
+        self.path = path
+        self.source_hash = source_hash  # önbellekten açıldıysa: indeksin derlendiği JSON'un sha1'i
+        self.sources = sources  # snapshot'ın kurulduğu kaynak dosyaların özetleri (bkz. source_hashes)
+        self.version = next(_versions)
+        self.index = index if index is not None else ChampionIndex(self._data, id_map)
+        self.index.freeze()
+        self._derived = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, data_file, use_compiled=True):
+        """
+        Veri dosyasını ve aynı klasördeki champion_id_map.json'ı okuyup snapshot kurar.
+        use_compiled: kaynak özetleri tutan derlenmiş önbellek varsa JSON yerine onu açar,
+        yoksa/bayatsa JSON'dan derleyip önbelleği yeniler.
+        """
+        if not os.path.exists(data_file):
+            print(f"❌ HATA: '{data_file}' bulunamadı!")
+            return cls([], path=data_file)
+        id_map = load_id_map(os.path.dirname(data_file))
+        hashes = source_hashes(data_file)
+
+        if use_compiled:
+            index = load_compiled(data_file, hashes, id_map)
+            if index is not None:
+                return cls(None, path=data_file, index=index, source_hash=hashes[os.path.basename(data_file)], sources=hashes)
+
+        # Özet okunan baytlardan alınır; özetleme ile okuma arasında dosya değişse de snapshot'la uyuşur
+        with open(data_file, 'rb') as f:
+            raw = f.read()
+        hashes[os.path.basename(data_file)] = hashlib.sha1(raw).hexdigest()
+        snapshot = cls(json.loads(raw.decode('utf-8')), id_map, path=data_file, sources=hashes)
+        if use_compiled:
+            write_compiled(snapshot.index, data_file, hashes)
+        return snapshot
+
+    @property
+    def data(self):
+        """Ham şampiyon kayıtları (legacy mod ve araçlar için)."""
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    # Okunan baytların özeti kontrol edilir (okuma ile kontrol arasında dosya değişemez)
+                    with open(self.path, 'rb') as f:
+                        raw = f.read()
+                    if self.source_hash and hashlib.sha1(raw).hexdigest() != self.source_hash:
+                        raise RuntimeError(f"'{self.path}' snapshot kurulduktan sonra değişmiş; kayıtlar indeksle uyuşmaz.")
+                    self._data = tuple(json.loads(raw.decode('utf-8')))
+        return self._data
+
+    def current_sources(self):
+        """
+        Snapshot'ın kaynak özetleri; diskteki kaynaklar o zamandan beri değiştiyse (ör. merge)
+        veya özet yoksa None. Derlenmiş yapılar (tablolar, indeksler) bu özetlerle anahtarlanır:
+        None dönen bir snapshot için ne açılır ne yazılır, satır/sütunlar indeksle uyuşmayabilir.
+        """
+        if not self.sources or not self.path or source_hashes(self.path) != self.sources: return None
+        return self.sources
+
+    def derived(self, name, build):
+        """
+        Snapshot'a bağlı türetilmiş tabloyu döndürür; ilk çağrıda build(self) ile
+        hesaplanır. Aynı snapshot'ı paylaşan motorlar sonucu da paylaşır.
+        """
+        value = self._derived.get(name)
+        if value is None:
+            with self._lock:
+                value = self._derived.get(name)
+                if value is None:
+                    value = build(self)
+                    self._derived[name] = value
+        return value
@@ -0,0 +1,105 @@
+import time
+
+import numpy as np
+
+from core.ai_recommendation_final import ROLE_ORDER
+
+# Kazanma oranı ağırlığı: p ∝ exp((wr - 50) / WR_TEMPERATURE). %52'lik şampiyon %48'likten ~7 kat sık çekilir.
+WR_TEMPERATURE = 2.0
+SAMPLE_CHUNK = 1024
+WEIGHTINGS = ("win_rate", "top_k")
+
+
+class DraftForecaster:
+    """
+    Kısmi draft için Monte Carlo kazanma olasılığı dağılımı.
+
+    Kilitlenmiş şampiyonlar rollerine yerleştirilir, boş slotlar o rolün aday
+    kümesinden örneklenir (genel kazanma oranına ya da motorun kendi top-k
+    önerilerine göre ağırlıklı). Tüm örnekler LoLMatchPredictor.predict_batch ile
+    tek vektör geçişinde puanlanır; süre bütçesi dolunca örnekleme durur.
+    """
+
+    def __init__(self, predictor, budget_ms=40, max_samples=4096, weighting="win_rate", top_k=10):
+        self.predictor = predictor
+        self.budget_ms = budget_ms
+        self.max_samples = max_samples
+        self.weighting = weighting
+        self.top_k = top_k
+
+    def place_team(self, team, roles=None):
+        """
+        Kilitli şampiyonları rol sırasına (Top, Jungle, Mid, ADC, Sup) yerleştirir, boşlar -1.
+        LCU rolü bilinenler kendi slotunda kalır, diğerleri rol çıkarımıyla (infer_lanes) atanır.
+        """
+        return self.predictor.lane_layout(team, roles)[0].copy()
+
+    def slot_distribution(self, role, own, other, taken, weighting, banned=()):
+        """Bir boş slot için (adaylar, olasılıklar). Alınmış ve yasaklı (banned, indeks) adaylar çekilmez; uygun aday yoksa None."""
+        p = self.predictor
+        if weighting == "top_k":
+            # Takımın kendi bakış açısından motorun önerileri (önbellekten gelir).
+            # calculate_score tamsayıları Riot ID sayar; indeksler isme çevrilerek verilir.
+            names = p.index.names
+            picks = p.calculate_score(role, None, [names[i] for i in own if i >= 0], [names[i] for i in other if i >= 0], k=self.top_k)
+            cands = np.array([p.index.lookup(r['name']) for r in picks], dtype=np.intp)
+            weights = np.ones(cands.size)
+        else:
+            cands = p.role_candidates[role]
+            weights = np.exp((p.index.win_rate[cands] - 50.0) / WR_TEMPERATURE)
+        weights = np.where(np.isin(cands, list(taken)) | np.isin(cands, list(banned)), 0.0, weights)
+        if not cands.size or weights.sum() <= 0: return None
+        return cands, weights / weights.sum()
+
+    def forecast(self, ally_team, enemy_team, ally_roles=None, enemy_roles=None, banned=[],
+                 weighting=None, budget_ms=None, max_samples=None, seed=None):
+        """
+        Mavi (ally) takım için kazanma yüzdesi dağılımı. banned: yasaklanan şampiyonlar
+        (Riot ID veya isim); boş slotlara örneklenmezler.
+        Döner: dict(mean, std, p10, p50, p90, samples, open_slots, elapsed_ms)
+        """
+        weighting = weighting or self.weighting
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"Bilinmeyen ağırlıklandırma: {weighting}")
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        max_samples = max_samples or self.max_samples
+        start = time.perf_counter()
+        rng = np.random.default_rng(seed)
+
+        p = self.predictor
+        with p.pinned_snapshot():
+            blue = self.place_team(ally_team, ally_roles)
+            red = self.place_team(enemy_team, enemy_roles)
+            taken = {int(i) for i in np.concatenate([blue, red]) if i >= 0}
+            bans = set(p.resolve_team(banned))
+
+            slots = []
+            for team_no, (own, other) in enumerate(((blue, red), (red, blue))):
+                for s, role in enumerate(ROLE_ORDER):
+                    if own[s] >= 0: continue
+                    dist = self.slot_distribution(role, own, other, taken, weighting, bans)
+                    if dist: slots.append((team_no, s) + dist)
+
+            chunk = SAMPLE_CHUNK if slots else 1
+            results = []
+            total = 0
+            while total < max_samples:
+                teams = (np.tile(blue, (chunk, 1)), np.tile(red, (chunk, 1)))
+                for team_no, s, cands, probs in slots:
+                    teams[team_no][:, s] = rng.choice(cands, size=chunk, p=probs)
+                # Aynı şampiyonun iki slota düştüğü örnekler atılır
+                picked = np.sort(np.concatenate(teams, axis=1), axis=1)
+                valid = ~((picked[:, 1:] == picked[:, :-1]) & (picked[:, 1:] >= 0)).any(axis=1)
+                results.append(p.predict_batch(teams[0][valid], teams[1][valid]))
+                total += int(valid.sum())
+                if not slots or time.perf_counter() - start > budget: break
+
+        wins = np.concatenate(results)[:max_samples]
+        if not wins.size: wins = np.array([50.0])
+        p10, p50, p90 = np.percentile(wins, [10, 50, 90])
+        return {
+            "mean": float(wins.mean()), "std": float(wins.std()),
+            "p10": float(p10), "p50": float(p50), "p90": float(p90),
+            "samples": int(wins.size), "open_slots": len(slots),
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+        }
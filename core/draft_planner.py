@@ -0,0 +1,213 @@
+import time
+
+import numpy as np
+
+from core.ai_recommendation_final import ROLE_ORDER
+from core.draft_forecast import DraftForecaster
+from core.recommendation_cache import RecommendationCache
+
+# Standart snake seçim sırası: 0 = ilk seçen takım (mavi taraf), 1 = ikinci takım
+SNAKE_ORDER = (0, 1, 1, 0, 0, 1, 1, 0, 0, 1)
+ALLY, ENEMY = 0, 1
+
+
+class _Timeout(Exception):
+    """Süre bütçesi doldu; iteratif derinleştirme son tamamlanan derinliği kullanır."""
+
+
+class DraftPlanner:
+    """
+    Kalan seçimler üzerinde beam'li minimax arama.
+
+    Kök hamleler benim rolüm için motorun en iyi beam_width adayıdır. Sonraki
+    her seçimde sıradaki takım (snake sırası) kendi açık rollerinden motorun en
+    yüksek puan verdiği beam_width hamleyi dener; müttefik beklenen kazanma
+    olasılığını büyütür, rakip küçültür (en iyi cevap). Yapraklar, açık slotlar
+    kazanma oranına göre doldurulan kısa rollout'larla LoLMatchPredictor.predict_batch
+    üzerinden toplu değerlendirilir.
+
+    Derinlik 0'dan başlayarak artırılır (iteratif derinleştirme); süre bütçesi
+    dolduğunda son tamamlanan derinliğin sonucu döner. Değerlendirilen kısmi
+    draftlar transpozisyon tablosunda tutulur, böylece farklı sıralarla ulaşılan
+    aynı durumlar ve sonraki LCU güncellemeleri yeniden hesaplanmaz.
+    """
+
+    def __init__(self, engine, predictor, depth=3, beam_width=4, rollouts=24, budget_ms=1500, cache_size=50000):
+        self.engine = engine
+        self.predictor = predictor
+        self.forecaster = DraftForecaster(predictor)
+        self.depth = depth
+        self.beam_width = beam_width
+        self.rollouts = rollouts
+        self.budget_ms = budget_ms
+        self.table = RecommendationCache(maxsize=cache_size)
+        self.nodes = 0
+        self.bans = ()
+
+    def pick_sequence(self, ally_count, enemy_count, first_pick):
+        """Kilitli seçimler düşüldükten sonra kalan seçim sırası (ALLY/ENEMY listesi)."""
+        ally_side = 0 if first_pick else 1
+        left = {ALLY: ally_count, ENEMY: enemy_count}
+        sequence = []
+        for side in SNAKE_ORDER:
+            who = ALLY if side == ally_side else ENEMY
+            if left[who]: left[who] -= 1
+            else: sequence.append(who)
+        return sequence
+
+    def plan(self, my_role, ally_team=[], enemy_team=[], ally_roles=None, enemy_roles=None, banned=[],
+             first_pick=True, depth=None, beam_width=None, budget_ms=None, seed=0):
+        """
+        Benim slotum için beklenen kazanma olasılığını en iyi cevaplara karşı en yüksek yapan seçim.
+        Kendi slotumdaki (hover/kilitli) şampiyon yok sayılır; seçilecek olan odur.
+        banned: yasaklanan şampiyonlar (Riot ID veya isim); ne hamle ne de rollout olarak seçilirler.
+        Döner: dict(pick, id, win, depth, line, alternatives, nodes, elapsed_ms) veya aday yoksa None.
+        """
+        depth = self.depth if depth is None else depth
+        self.width = beam_width or self.beam_width
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        start = time.perf_counter()
+        self.nodes = 0
+
+        e = self.engine
+        with e.pinned_snapshot(), self.predictor.pinned_snapshot():
+            role = e.resolve_role(my_role)
+            my_slot = ROLE_ORDER.index(role)
+            blue = self.forecaster.place_team(ally_team, ally_roles)
+            red = self.forecaster.place_team(enemy_team, enemy_roles)
+            blue[my_slot] = -1
+            blue, red = tuple(int(i) for i in blue), tuple(int(i) for i in red)
+            self.bans = tuple(sorted(set(e.resolve_team(banned))))
+
+            sequence = self.pick_sequence(sum(i >= 0 for i in blue), sum(i >= 0 for i in red), first_pick)
+            if ALLY in sequence: sequence.remove(ALLY)  # kök hamle: benim seçimim
+            depth = min(depth, len(sequence))
+            # Değerler profil ve veri sürümüne bağlı (hamle sıralaması motor puanlarından gelir)
+            self.salt = (e.dataset_version, e.active_profile, e.blind_pick, self.width, self.rollouts, first_pick, self.bans)
+            self.rng_seed = seed
+
+            roots = [(ALLY, slot, c) for slot, c in self.top_moves(blue, red, ALLY, [my_slot])]
+            if not roots: return None
+            children = [self.apply(blue, red, m) for m in roots]
+
+            best = None
+            for d in range(depth + 1):
+                deadline = None if d == 0 else start + budget
+                try:
+                    if d == 0:
+                        results = [(v, []) for v in self.evaluate(children)]
+                    else:
+                        results = [self.search(b, r, sequence, d, deadline) for b, r in children]
+                except _Timeout:
+                    break
+                best = (d, results)
+
+        d, results = best
+        order = sorted(range(len(roots)), key=lambda n: -results[n][0])
+        names = e.index.names
+        top = order[0]
+        return {
+            "pick": names[roots[top][2]],
+            "id": e.index.registry.riot_id(roots[top][2]),
+            "win": float(results[top][0]),
+            "depth": d,
+            "line": [{"side": "ally" if s == ALLY else "enemy", "role": ROLE_ORDER[slot], "name": names[c]}
+                     for s, slot, c in [roots[top]] + results[top][1]],
+            "alternatives": [{"name": names[roots[n][2]], "win": float(results[n][0])} for n in order],
+            "nodes": self.nodes,
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+        }
+
+    # --- Arama ---
+
+    def search(self, blue, red, sequence, d, deadline):
+        """(değer, ana hat) — müttefik için max, rakip için min; d kalan seçim sayısı."""
+        key = ("node", blue, red, d) + self.salt
+        hit = self.table.get(key)
+        if hit is not None: return hit
+        if deadline and time.perf_counter() > deadline: raise _Timeout()
+        self.nodes += 1
+
+        side = sequence[0]
+        own = blue if side == ALLY else red
+        moves = [(side, slot, c) for slot, c in self.top_moves(blue, red, side, [s for s in range(len(ROLE_ORDER)) if own[s] < 0])]
+        if not moves:
+            result = (self.evaluate([(blue, red)])[0], [])
+        else:
+            children = [self.apply(blue, red, m) for m in moves]
+            if d == 1:
+                results = [(v, []) for v in self.evaluate(children)]
+            else:
+                results = [self.search(b, r, sequence[1:], d - 1, deadline) for b, r in children]
+            pick = max if side == ALLY else min
+            n = pick(range(len(moves)), key=lambda n: results[n][0])
+            result = (results[n][0], [moves[n]] + results[n][1])
+
+        self.table.put(key, result)
+        return result
+
+    def top_moves(self, blue, red, side, slots):
+        """
+        Sıradaki takımın açık slotları için motorun en yüksek puanlı beam_width hamlesi.
+        Rakip hamleleri rakibin bakış açısından (takımlar yer değiştirerek) puanlanır.
+        """
+        e = self.engine
+        own, other = (blue, red) if side == ALLY else (red, blue)
+        taken = [i for i in blue + red if i >= 0] + list(self.bans)
+        ally_idx = np.array([i for i in own if i >= 0], dtype=np.intp)
+
+        moves = []
+        for slot in slots:
+            laner = other[slot] if other[slot] >= 0 else None
+            enemy_idx = np.array([i for i in other if i >= 0 and i != laner], dtype=np.intp)
+            ctx = e.index_context(ROLE_ORDER[slot], ally_idx, enemy_idx, laner)
+            if not ctx["cands"].size: continue
+            scores = np.where(np.isin(ctx["cands"], taken), -np.inf, e.candidate_scores(ctx))
+            for col in np.argsort(-scores, kind="stable")[:self.width]:
+                if scores[col] > -np.inf: moves.append((float(scores[col]), slot, int(ctx["cands"][col])))
+
+        moves.sort(key=lambda m: -m[0])
+        return [(slot, c) for _, slot, c in moves[:self.width]]
+
+    def apply(self, blue, red, move):
+        side, slot, c = move
+        own = list(blue if side == ALLY else red)
+        own[slot] = c
+        return (tuple(own), red) if side == ALLY else (blue, tuple(own))
+
+    def evaluate(self, states):
+        """
+        Kısmi draftların beklenen kazanma olasılığı (mavi = müttefik). Önbellekte olmayanlar
+        tek predict_batch çağrısında, durum başına `rollouts` tamamlama ile değerlendirilir.
+        Aynı tohum tüm kardeş durumlarda aynı rastgele sayıları kullanır (ortak rastgele sayılar).
+        """
+        values = [self.table.get(("leaf", b, r) + self.salt) for b, r in states]
+        missing = [n for n, v in enumerate(values) if v is None]
+        if missing:
+            f = self.forecaster
+            R = self.rollouts
+            blue = np.repeat(np.array([states[n][0] for n in missing], dtype=np.intp), R, axis=0)
+            red = np.repeat(np.array([states[n][1] for n in missing], dtype=np.intp), R, axis=0)
+            rng = np.random.default_rng(self.rng_seed)
+            for team in (blue, red):
+                for s, role in enumerate(ROLE_ORDER):
+                    # Yasaklılar hiç çekilmez; aynı şampiyonun iki slota düşmesi aşağıda elenir
+                    dist = f.slot_distribution(role, (), (), (), "win_rate", self.bans)
+                    if not dist: continue
+                    draw = rng.choice(dist[0], size=team.shape[0], p=dist[1])
+                    team[:, s] = np.where(team[:, s] < 0, draw, team[:, s])
+
+            picked = np.sort(np.concatenate((blue, red), axis=1), axis=1)
+            valid = ~((picked[:, 1:] == picked[:, :-1]) & (picked[:, 1:] >= 0)).any(axis=1)
+            rows = np.repeat(np.arange(len(missing)), R)[valid]
+            wins = self.predictor.predict_batch(blue[valid], red[valid])
+            total = np.bincount(rows, weights=wins, minlength=len(missing))
+            count = np.bincount(rows, minlength=len(missing))
+            for k, n in enumerate(missing):
+                if count[k]: values[n] = float(total[k] / count[k])
+                else:
+                    # Liste içindeki tam sayılar Riot ID sayılır; slotlar indeks olduğu için ndarray verilir
+                    single = np.array([states[n]], dtype=np.intp)
+                    values[n] = float(self.predictor.predict_batch(single[:, 0], single[:, 1])[0])
+                self.table.put(("leaf",) + states[n] + self.salt, values[n])
+        return values
@@ -0,0 +1,166 @@
+from collections import Counter
+
+import numpy as np
+
+from core.ai_recommendation_final import (
+    WEIGHT_KEYS, T_WR, T_SYN, T_GOOD, T_BAD
+)
+
+
+class DraftSession:
+    """
+    Bir draft boyunca yaşayan artımlı puanlama oturumu.
+
+    Champ select güncellemeleri genelde tek bir slotu değiştirir. Oturum,
+    her aday için ağırlıksız terim matrisini (LoLDecisionEngine.score_terms
+    ile aynı satırlar) bellekte tutar ve yalnızca değişen terimi günceller:
+
+      - Müttefik eklendi/çıktı  -> sinerji satırına tek sütun eklenir/çıkarılır,
+                                   hasar/archetype satırları takım özetinden yenilenir
+      - Rakip eklendi/çıktı     -> genel good/bad satırlarına tek sütun
+      - Koridor rakibi değişti  -> koridor satırları yeniden hesaplanır,
+                                   eski/yeni rakip genel satırlara geri eklenir/çıkarılır
+
+    Ağırlıklar rank() anında uygulanır; profil değişimi oturumu bozmaz. Sıralanmış
+    sonuç motorun LRU önbelleğine (draft_key) yazılır: LCU'nun aynı taslağı tekrar
+    gönderdiği tiklerde öneriler ve anlatı metinleri yeniden üretilmez.
+    Motor yeni snapshot'a geçerse (dataset_version) oturum kendini yeniden kurar;
+    update/rank tek bir snapshot üzerinde çalışır (pinned_snapshot).
+    """
+
+    def __init__(self, engine, my_role):
+        self.engine = engine
+        self.role = engine.resolve_role(my_role)
+        self.rebuild()
+
+    def rebuild(self):
+        """Boş draft için terim matrisini sıfırdan kurar."""
+        e = self.engine
+        self.version = e.dataset_version
+        self.names = e.index.names
+        self.cands = e.role_candidates[self.role]
+
+        self.allies = []           # sıra korunur (sebep metinleri bu sırayla üretilir)
+        self.enemies = Counter()   # koridor rakibi dahil tüm rakipler
+        self.laner = None
+
+        self.T = np.zeros((len(WEIGHT_KEYS), self.cands.size))
+        wr = e.index.win_rate[self.cands]
+        self.T[T_WR] = np.where(wr > 0, wr - 50.0, 0.0)
+        self.arch_counts = np.zeros(len(e.arch_names))
+        self.needed_dmg = "Balanced"
+        e.fill_team_terms(self.T, self.cands, self.needed_dmg, self.arch_counts)
+
+    def _sync_version(self):
+        """Veri yenilendiyse mevcut draft'ı yeni indekslere taşıyarak oturumu yeniden kurar."""
+        if self.version == self.engine.dataset_version: return
+        old_names = self.names
+        allies = [old_names[i] for i in self.allies]
+        enemies = [old_names[i] for i in self.enemies.elements()]
+        laner = old_names[self.laner] if self.laner is not None else None
+        self.rebuild()
+        self.update(allies, enemies, laner)
+
+    def _column(self, relation, j):
+        return self.engine.positive_relations[relation][self.cands, j]
+
+    # --- Tek slot değişiklikleri (indeks ile) ---
+
+    def add_ally(self, j):
+        self.allies.append(j)
+        self.T[T_SYN] += self._column('synergies', j)
+        self.arch_counts += self.engine.arch_matrix[:, j]
+        self._refresh_team_terms()
+
+    def remove_ally(self, j):
+        if j not in self.allies: return
+        self.allies.remove(j)
+        if self.allies:
+            self.T[T_SYN] -= self._column('synergies', j)
+        else:
+            self.T[T_SYN] = 0.0  # birikmiş yuvarlama hatasını sıfırla
+        self.arch_counts -= self.engine.arch_matrix[:, j]
+        self._refresh_team_terms()
+
+    def add_enemy(self, j):
+        self.enemies[j] += 1
+        if j != self.laner: self._shift_general(j, 1)
+
+    def remove_enemy(self, j):
+        if not self.enemies[j]: return
+        self.enemies[j] -= 1
+        if not self.enemies[j]: del self.enemies[j]
+        if j != self.laner: self._shift_general(j, -1)
+
+    def set_enemy_laner(self, j):
+        """Koridor rakibini değiştirir. Rakip, genel good/bad terimlerinden çıkarılır."""
+        if j == self.laner: return
+        old = self.laner
+        self.laner = j
+        if old is not None and self.enemies[old]: self._shift_general(old, self.enemies[old])
+        if j is not None and self.enemies[j]: self._shift_general(j, -self.enemies[j])
+        self.engine.fill_lane_terms(self.T, self.cands, j)
+
+    def _shift_general(self, j, count):
+        self.T[T_GOOD] += count * self._column('general_good_against', j)
+        self.T[T_BAD] -= count * self._column('general_bad_against', j)
+        if not any(e != self.laner for e in self.enemies):
+            self.T[T_GOOD] = 0.0
+            self.T[T_BAD] = 0.0
+
+    def _refresh_team_terms(self):
+        # Hasar ihtiyacı ve archetype sayıları takım geneline bağlı; küçük özetlerden yenilenir
+        ally = np.array(self.allies, dtype=np.intp)
+        self.needed_dmg = self.engine.needed_damage(ally)
+        self.engine.fill_team_terms(self.T, self.cands, self.needed_dmg, self.arch_counts)
+
+    # --- LCU güncellemesi ---
+
+    def update(self, ally_team=[], enemy_team=[], enemy_laner=None):
+        """
+        Tam takım listelerini (Riot ID veya isim) alır, önceki durumla farkını
+        çıkarır ve yalnızca değişen slotları uygular. Slot değişimi = çıkar + ekle.
+        """
+        e = self.engine
+        with e.pinned_snapshot():
+            self._sync_version()
+            ally = e.resolve_team(ally_team)
+            enemy = e.resolve_team(enemy_team)
+
+            for j in (Counter(self.allies) - Counter(ally)).elements(): self.remove_ally(j)
+            for j in (Counter(ally) - Counter(self.allies)).elements(): self.add_ally(j)
+            self.allies = list(ally)  # sebep sırası için LCU sırasını koru
+
+            new_enemies = Counter(enemy)
+            for j in (self.enemies - new_enemies).elements(): self.remove_enemy(j)
+            for j in (new_enemies - self.enemies).elements(): self.add_enemy(j)
+
+            self.set_enemy_laner(e.index.lookup(enemy_laner))
+        return self
+
+    def context(self):
+        """explain_candidate / rank_terms için build_context ile aynı biçimde durum."""
+        return {
+            "cands": self.cands,
+            "ally_idx": np.array(self.allies, dtype=np.intp),
+            "enemy_idx": np.array([j for j in self.enemies.elements() if j != self.laner], dtype=np.intp),
+            "laner_idx": self.laner,
+            "needed_dmg": self.needed_dmg,
+            "arch_counts": self.arch_counts,
+            "blind": self.engine.blind_term(self.role) if self.laner is None else None,
+        }
+
+    def rank(self, k=None):
+        """Güncel terimleri aktif profille puanlar ve ilk k öneriyi döndürür (aynı taslak için önbellekten)."""
+        e = self.engine
+        with e.pinned_snapshot():
+            self._sync_version()
+            if not self.cands.size: return []
+            k = k or e.top_k
+            key = e.draft_key(self.role, self.laner, self.allies, self.enemies.elements(), "session", k)
+            recommendations = e.cache.get(key)
+            if recommendations is None:
+                recommendations = e.rank_terms(self.T, self.context(), k)
+                e.cache.put(key, recommendations)
+            # Çağıran listeyi değiştirse de önbellek bozulmasın
+            return [dict(r) for r in recommendations]
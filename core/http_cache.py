@@ -0,0 +1,249 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+from core.data_manager import get_resource_path
+
+# Ham yanıtların tutulduğu klasör: blobs/ içerik özetiyle (aynı gövde bir kez saklanır),
+# entries/ URL özetiyle (gövde özeti, çekilme zamanı, ETag/Last-Modified, son kullanım)
+CACHE_DIR = os.path.join("data", "http_cache")
+# Bu süreden yeni kayıtlar sunucuya sorulmadan kullanılır; eskiler koşullu GET ile doğrulanır
+DEFAULT_TTL = 12 * 3600
+# Sıkıştırılmış gövdelerin toplam üst sınırı; aşılınca en uzun süredir kullanılmayanlar silinir
+MAX_BYTES = 512 * 1024 * 1024
+# "1" ise hiçbir istek ağa gitmez: tüm hat yalnızca önbellekten çalışır (çevrimdışı tekrar)
+OFFLINE_ENV = "LOL_HTTP_OFFLINE"
+# Çevrimdışı modda önbellekte olmayan sayfalar için dönen kod (get_soup'lar 404'ü "sayfa yok" sayar)
+OFFLINE_MISS_STATUS = 404
+
+
+def offline_mode():
+    return os.environ.get(OFFLINE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class CachedResponse:
+    """Önbellekten dönen yanıt; scraper'ların kullandığı alanlar (status_code, content, text, headers)."""
+
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.from_cache = True
+
+    @property
+    def text(self):
+        content_type = self.headers.get("Content-Type", "")
+        charset = content_type.split("charset=")[-1].split(";")[0].strip() if "charset=" in content_type else "utf-8"
+        return self.content.decode(charset or "utf-8", errors="replace")
+
+
+class HttpCache:
+    """
+    Kalıcı HTTP yanıt önbelleği (scraper'lar arasında ortak, bkz. shared_cache).
+
+      - TTL içindeki kayıt        -> ağa gidilmez (isabet)
+      - TTL'i geçmiş kayıt        -> If-None-Match / If-Modified-Since ile koşullu GET;
+                                     304 isabet sayılır, kaydın zamanı yenilenir
+      - 200                       -> gövde sıkıştırılıp içerik özetiyle saklanır
+      - Diğer kodlar (429, 403..) -> önbelleğe yazılmaz, çağırana aynen döner
+    Yanıt gövdeleri zlib ile sıkıştırılır; toplam boyut max_bytes'ı aşınca LRU ile silinir.
+    """
+
+    def __init__(self, folder=None, ttl=DEFAULT_TTL, max_bytes=MAX_BYTES, offline=None):
+        self.folder = folder or get_resource_path(CACHE_DIR)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline_mode() if offline is None else offline
+        self.entries = None  # URL özeti -> kayıt; ilk kullanımda diskten yüklenir
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.revalidated = 0
+
+    # --- Disk düzeni ---
+
+    def url_key(self, url):
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.folder, "entries", f"{key}.json")
+
+    def blob_path(self, digest):
+        return os.path.join(self.folder, "blobs", digest[:2], digest)
+
+    def load(self):
+        if self.entries is not None: return
+        self.entries = {}
+        folder = os.path.join(self.folder, "entries")
+        if not os.path.isdir(folder): return
+        for name in os.listdir(folder):
+            if not name.endswith(".json"): continue
+            try:
+                with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                if os.path.exists(self.blob_path(entry["blob"])):
+                    self.entries[name[:-5]] = entry
+            except Exception:
+                pass  # yarım yazılmış kayıt: yok sayılır, sayfa yeniden çekilir
+
+    def write_json(self, path, value):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    # --- Sorgu ---
+
+    def response(self, key, entry):
+        """
+        Kaydı CachedResponse'a çevirir ve son kullanım zamanını bellekte günceller.
+        Kayıt dosyası yalnızca kayıt değişince (200 / doğrulanmış 304) yazılır; böylece isabetler
+        async tarayıcının olay döngüsünü disk yazımıyla bekletmez.
+        """
+        with open(self.blob_path(entry["blob"]), "rb") as f:
+            content = zlib.decompress(f.read())
+        entry["last_used"] = time.time()
+        headers = {"Content-Type": entry["content_type"]} if entry.get("content_type") else {}
+        return CachedResponse(200, content, headers)
+
+    def fresh_response(self, url):
+        """
+        Ağa gitmeden cevaplanabiliyorsa yanıtı döndürür (TTL içinde ya da çevrimdışı mod), yoksa None.
+        Çevrimdışı modda önbellekte olmayan sayfa OFFLINE_MISS_STATUS ile döner.
+        """
+        with self.lock:
+            self.load()
+            key = self.url_key(url)
+            entry = self.entries.get(key)
+            if entry and (self.offline or time.time() - entry["fetched_at"] < self.ttl):
+                try:
+                    hit = self.response(key, entry)
+                    self.hits += 1
+                    return hit
+                except (OSError, zlib.error):
+                    del self.entries[key]
+            if self.offline:
+                self.misses += 1
+                print(f"   📴 Çevrimdışı: önbellekte yok: {url}")
+                return CachedResponse(OFFLINE_MISS_STATUS)
+            return None
+
+    def request_headers(self, url, headers=None):
+        """Eski kayıt varsa koşullu GET başlıkları (If-None-Match / If-Modified-Since) eklenir."""
+        headers = dict(headers or {})
+        with self.lock:
+            self.load()
+            entry = self.entries.get(self.url_key(url))
+        if entry:
+            if entry.get("etag"): headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"): headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def finish(self, url, response):
+        """Ağ yanıtını işler: 304 -> önbellekteki gövde, 200 -> saklanır, diğerleri olduğu gibi."""
+        with self.lock:
+            key = self.url_key(url)
+            entry = self.entries.get(key)
+            if response.status_code == 304 and entry:
+                entry["fetched_at"] = time.time()
+                entry["etag"] = response.headers.get("ETag") or entry.get("etag")
+                entry["last_modified"] = response.headers.get("Last-Modified") or entry.get("last_modified")
+                try:
+                    hit = self.response(key, entry)
+                    self.revalidated += 1
+                except (OSError, zlib.error):
+                    del self.entries[key]
+                    return response
+                try:
+                    self.write_json(self.entry_path(key), entry)
+                except OSError:
+                    pass  # yazılamazsa kayıt bir sonraki çalıştırmada yeniden doğrulanır
+                return hit
+            if response.status_code == 200:
+                self.misses += 1
+                try:
+                    self.store(key, url, response)
+                except OSError as e:
+                    print(f"⚠️ HTTP önbelleğine yazılamadı: {e}")
+            return response
+
+    def get(self, session, url, **kwargs):
+        """session.get'in önbellekli hali (curl_cffi / requests / cloudscraper oturumları)."""
+        hit = self.fresh_response(url)
+        if hit is not None: return hit
+        kwargs["headers"] = self.request_headers(url, kwargs.get("headers"))
+        return self.finish(url, session.get(url, **kwargs))
+
+    async def get_async(self, session, url, **kwargs):
+        """get'in curl_cffi AsyncSession karşılığı."""
+        hit = self.fresh_response(url)
+        if hit is not None: return hit
+        kwargs["headers"] = self.request_headers(url, kwargs.get("headers"))
+        return self.finish(url, await session.get(url, **kwargs))
+
+    # --- Yazma ve LRU ---
+
+    def store(self, key, url, response):
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        blob = self.blob_path(digest)
+        if not os.path.exists(blob):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            tmp_path = blob + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(zlib.compress(content, 6))
+            os.replace(tmp_path, blob)
+        now = time.time()
+        entry = {
+            "url": url,
+            "blob": digest,
+            "size": os.path.getsize(blob),
+            "fetched_at": now,
+            "last_used": now,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type"),
+        }
+        self.write_json(self.entry_path(key), entry)
+        self.entries[key] = entry
+        self.evict()
+
+    def total_bytes(self):
+        blobs = {e["blob"]: e["size"] for e in self.entries.values()}
+        return sum(blobs.values())
+
+    def evict(self):
+        """Toplam boyut max_bytes'ı aşarsa en uzun süredir kullanılmayan kayıtları siler."""
+        total = self.total_bytes()
+        if total <= self.max_bytes: return
+        refs = {}
+        for e in self.entries.values():
+            refs[e["blob"]] = refs.get(e["blob"], 0) + 1
+        for key, entry in sorted(self.entries.items(), key=lambda kv: kv[1]["last_used"]):
+            if total <= self.max_bytes: break
+            del self.entries[key]
+            try: os.remove(self.entry_path(key))
+            except OSError: pass
+            refs[entry["blob"]] -= 1
+            if not refs[entry["blob"]]:
+                total -= entry["size"]
+                try: os.remove(self.blob_path(entry["blob"]))
+                except OSError: pass
+
+    def stats(self):
+        with self.lock:
+            self.load()
+            return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses,
+                    "entries": len(self.entries), "bytes": self.total_bytes(), "offline": self.offline}
+
+
+_shared = None
+
+def shared_cache():
+    """Scraper'ların ortak kullandığı tek önbellek örneği (aynı süreçte aynı bellek içi kayıtlar)."""
+    global _shared
+    if _shared is None:
+        _shared = HttpCache()
+    return _shared
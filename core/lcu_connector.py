@@ -103,7 +103,14 @@ class LCUWorker(QThread):
         
         my_team = []
         enemy_team = []
+        # Motorlar şampiyonları Riot ID ile tanır; isimler sadece arayüz içindir
+        my_team_ids = []
+        enemy_team_ids = []
+        # Slot başına rol (LCU atadıysa); kazanma tahmini kilitli şampiyonları bu rollere yerleştirir
+        my_team_roles = []
+        enemy_team_roles = []
         my_role = "Unknown"
+        my_pick = 0
         
         # Yerel oyuncunun hücre ID'sini al (kendi rolümüzü bulmak için)
         local_cell_id = data.get('localPlayerCellId', -1)
@@ -113,28 +120,70 @@ class LCUWorker(QThread):
             champ_id = member.get('championId', 0)
             name = self.get_champ_name(champ_id)
             my_team.append(name)
+            my_team_ids.append(champ_id)
+            my_team_roles.append(self.normalize_role(member.get('assignedPosition', '')))
             
             # Eğer bu oyuncu bensem, rolümü kaydet
             if member.get('cellId') == local_cell_id:
                 raw_role = member.get('assignedPosition', '')
                 my_role = self.normalize_role(raw_role)
+                # Ban aşamasında seçim henüz kilitli değildir; niyet (hover) kullanılır
+                my_pick = champ_id or member.get('championPickIntent', 0)
 
         # --- Kırmızı Takım (Rakip) ---
         for member in data.get('theirTeam', []):
             champ_id = member.get('championId', 0)
             name = self.get_champ_name(champ_id)
             enemy_team.append(name)
+            enemy_team_ids.append(champ_id)
+            enemy_team_roles.append(self.normalize_role(member.get('assignedPosition', '')))
+
+        # --- Yasaklar ---
+        bans, ban_phase, my_ban_turn = self.parse_bans(data, local_cell_id)
 
         # Arayüze gönderilecek paket
         info = {
             "my_team": my_team,
             "enemy_team": enemy_team,
+            "my_team_ids": my_team_ids,
+            "enemy_team_ids": enemy_team_ids,
+            "my_team_roles": my_team_roles,
+            "enemy_team_roles": enemy_team_roles,
+            # Mavi taraf (team 1) snake sırasında ilk seçer
+            "first_pick": (data.get('myTeam') or [{}])[0].get('team', 1) == 1,
             "my_role": my_role,
+            "my_pick": my_pick,
+            "bans": bans,
+            "ban_phase": ban_phase,
+            "my_ban_turn": my_ban_turn,
             "phase": data.get('timer', {}).get('phase', 'Unknown')
         }
         
         self.champ_select_update.emit(info)
 
+    def parse_bans(self, data, local_cell_id):
+        """
+        Oturumdaki yasakları ve ban aşamasını çözer.
+        Döner: (yasaklı Riot ID listesi, ban aşaması sürüyor mu, sıra bende mi)
+        """
+        bans = []
+        ban_phase = False
+        my_ban_turn = False
+        for group in data.get('actions', []):
+            for action in group:
+                if action.get('type') != 'ban': continue
+                if action.get('completed') and action.get('championId'):
+                    bans.append(action['championId'])
+                if action.get('isInProgress'):
+                    ban_phase = True
+                    if action.get('actorCellId') == local_cell_id: my_ban_turn = True
+
+        # Bazı kuyruklarda yasaklar yalnızca 'bans' alanında gelir
+        ban_info = data.get('bans', {})
+        for champ_id in ban_info.get('myTeamBans', []) + ban_info.get('theirTeamBans', []):
+            if champ_id and champ_id not in bans: bans.append(champ_id)
+        return bans, ban_phase, my_ban_turn
+
     def run(self):
         """Thread başladığında çalışacak ana döngü."""
         try:
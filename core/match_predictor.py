@@ -1,163 +1,165 @@
 import json
 import os
+
+import numpy as np
 # Ana dizinden değil, modül olarak çağrıldığında çalışması için 'core.' ekliyoruz
-from core.ai_recommendation_final import LoLDecisionEngine
+from core.ai_recommendation_final import LoLDecisionEngine, pinned
 
 class LoLMatchPredictor(LoLDecisionEngine):
-    def __init__(self, data_file):
-        # Üst sınıfın (LoLDecisionEngine) özelliklerini miras al
-        super().__init__(data_file)
+    def __init__(self, data_file, snapshot=None):
+        # Üst sınıfın (LoLDecisionEngine) özelliklerini miras al.
+        # snapshot verilirse motorla aynı veri seti paylaşılır (tekrar yüklenmez)
+        super().__init__(data_file, snapshot)
+
+    def team_indices(self, teams, width=5):
+        """
+        Takım listelerini (Riot ID / isim) (B, width) indeks dizisine çevirir.
+        Çözülemeyen slotlar atlanır, boş kalan yerler -1 ile doldurulur (sırası korunur).
+        Daha uzun takım varsa genişlik ona göre büyür.
+        """
+        resolved_teams = [self.resolve_team(team) for team in teams]
+        width = max([width] + [len(t) for t in resolved_teams])
+        out = np.full((len(teams), width), -1, dtype=np.intp)
+        for b, resolved in enumerate(resolved_teams):
+            out[b, :len(resolved)] = resolved
+        return out
+
+    def team_power_terms(self, teams):
+        """
+        (B, 5) indeks dizisi için takım gücü bileşenleri (-1 boş slot).
+        Döner: dict(power, count, avg_wr, ad_ratio, ap_ratio, penalty, synergy_bonus), hepsi (B,)
+        """
+        idx = self.index
+        mask = teams >= 0
+        safe = np.where(mask, teams, 0)
+        count = mask.sum(axis=1)
+
+        # 1. TEMEL GÜÇ VE HASAR PROFİLİ (Hasar profili yoksa indekste varsayılan 5/5)
+        ap_score = (idx.ap[safe] * mask).sum(axis=1)
+        ad_score = (idx.ad[safe] * mask).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_wr = (idx.win_rate[safe] * mask).sum(axis=1) / count
+            # 2. HASAR DENGESİ CEZASI: takım %80'den fazla tek tip hasar vuruyorsa
+            total_dmg = ap_score + ad_score
+            ad_ratio = np.where(total_dmg > 0, ad_score / total_dmg, 0.0)
+            ap_ratio = np.where(total_dmg > 0, ap_score / total_dmg, 0.0)
+        penalty = np.where((ad_ratio > 0.80) | (ap_ratio > 0.80), 300.0, 0.0)
+
+        # 3. SİNERJİ BONUSU: (B, 5, 5) alt matris, yalnızca i < j çiftleri
+        pair_mask = mask[:, :, None] & mask[:, None, :] & np.triu(np.ones((teams.shape[1],) * 2, dtype=bool), k=1)
+        synergy = (idx.relations['synergies'][safe[:, :, None], safe[:, None, :]] * pair_mask).sum(axis=(1, 2), dtype=np.float64)
+        synergy_bonus = np.where(synergy > 0, synergy * 5, 0.0)
+
+        # Baz puan: Ortalama WR * 100 (Örn: %52 -> 5200 puan); boş takım 5000
+        power = np.where(count > 0, avg_wr * 100 - penalty + synergy_bonus, 5000.0)
+        return {"power": power, "count": count, "avg_wr": avg_wr, "ad_ratio": ad_ratio, "ap_ratio": ap_ratio,
+                "penalty": penalty, "synergy_bonus": synergy_bonus}
+
+    def team_power_batch(self, teams):
+        """(B, 5) indeks dizisindeki her takımın gücü (B,)."""
+        return self.team_power_terms(teams)["power"]
 
     def calculate_team_power(self, team_list):
         """
         Bir takımın kendi içindeki gücünü hesaplar.
         Kriterler: Ortalama WR + Hasar Dengesi + Sinerji
         """
-        power_score = 0.0
-        details = []
-        
-        total_wr = 0
-        ap_score = 0
-        ad_score = 0
-        valid_champs = 0
-        
-        # 1. TEMEL GÜÇ VE HASAR PROFİLİ
-        for name in team_list:
-            if name == "Picking..." or name == "...": continue
-            
-            champ = self.champ_lookup.get(name.lower())
-            if not champ: continue
-            
-            valid_champs += 1
-            wr = champ.get('general_win_rate', 50.0)
-            total_wr += wr
-            
-            # Hasar Profilini Topla (Yoksa varsayılan 5/5)
-            dmg = champ.get('damage_profile', {"ap": 5, "ad": 5})
-            ap_score += dmg['ap']
-            ad_score += dmg['ad']
-
-        if valid_champs == 0: return 5000.0, ["Veri Yok"]
-
-        avg_wr = total_wr / valid_champs
-        # Baz puan: Ortalama WR * 100 (Örn: %52 -> 5200 puan)
-        power_score += avg_wr * 100 
-        details.append(f"Ortalama WR: %{avg_wr:.1f}")
-
-        # 2. HASAR DENGESİ CEZASI (COMPOSITION PENALTY)
-        # Eğer takım %80'den fazla tek tip hasar vuruyorsa ceza kes.
-        total_dmg = ap_score + ad_score
-        if total_dmg > 0:
-            ad_ratio = ad_score / total_dmg
-            ap_ratio = ap_score / total_dmg
-            
-            penalty = 300 # Ceza Puanı
-            
-            if ad_ratio > 0.80:
-                power_score -= penalty
-                details.append(f"⚠️ Full AD Cezası (-{penalty})")
-            elif ap_ratio > 0.80:
-                power_score -= penalty
-                details.append(f"⚠️ Full AP Cezası (-{penalty})")
-            else:
-                details.append("✅ Hasar Dengesi İyi")
-
-        # 3. SİNERJİ BONUSU
-        synergy_score = 0
-        for i in range(len(team_list)):
-            for j in range(i + 1, len(team_list)):
-                c1_name = team_list[i]
-                c2_name = team_list[j]
-                
-                if c1_name == "Picking..." or c2_name == "Picking...": continue
-                
-                c1 = self.champ_lookup.get(c1_name.lower())
-                if c1:
-                    s = self.get_list_score(c1.get('synergies', []), c2_name)
-                    synergy_score += s
-        
-        # Sinerji puanını ekle (Ağırlık: 5)
-        if synergy_score > 0:
-            bonus = synergy_score * 5
-            power_score += bonus
-            if bonus > 50: details.append(f"Yüksek Sinerji (+{bonus:.0f})")
+        teams = self.team_indices([team_list])
+        terms = {k: v[0] for k, v in self.team_power_terms(teams).items()}
+        if not terms["count"]: return 5000.0, ["Veri Yok"]
+
+        details = [f"Ortalama WR: %{terms['avg_wr']:.1f}"]
+        if terms["ad_ratio"] > 0.80:
+            details.append(f"⚠️ Full AD Cezası (-{terms['penalty']:.0f})")
+        elif terms["ap_ratio"] > 0.80:
+            details.append(f"⚠️ Full AP Cezası (-{terms['penalty']:.0f})")
+        elif terms["ad_ratio"] + terms["ap_ratio"] > 0:
+            details.append("✅ Hasar Dengesi İyi")
+        if terms["synergy_bonus"] > 50: details.append(f"Yüksek Sinerji (+{terms['synergy_bonus']:.0f})")
+
+        return float(terms["power"]), details
+
+    def lane_expert_bonus(self, blue, red):
+        """Koridor eşleşmelerinde uzman bonusu (aynı şekilli indeks dizileri). Kolay eşleşme önceliklidir."""
+        idx = self.index
+        delta = idx.expert_delta[blue, red].astype(np.float64)
+        # Puanın 5.0'dan uzaklığıyla ölçeklenir: 10.0 -> +20, 0.1 -> -20
+        return np.where(idx.expert_easy[blue, red], 20.0 * np.maximum(delta, 0.0),
+                        np.where(idx.expert_hard[blue, red], 20.0 * np.minimum(delta, 0.0), 0.0))
+
+    def matchup_advantage_batch(self, blue, red):
+        """
+        Mavi takımın Kırmızı takıma karşı avantajı, (B, 5) indeks dizileri için (B,).
+        Koridor: aynı sıradaki dolu slotlar (Top, Jungle, Mid, ADC, Sup), ağırlık 20.
+        Genel: herkes herkese karşı good - bad, ağırlık 5.
+        """
+        rel = self.index.relations
+        b_mask, r_mask = blue >= 0, red >= 0
+        b, r = np.where(b_mask, blue, 0), np.where(r_mask, red, 0)
+
+        # 1. KORİDOR EŞLEŞMESİ (İstatistik + Uzman)
+        lane_mask = b_mask & r_mask
+        net_lane = rel['lane_counters'][b, r].astype(np.float64) - rel['lane_countered_by'][b, r]
+        lane = ((net_lane + self.lane_expert_bonus(b, r)) * 20 * lane_mask).sum(axis=1)
 
-        return power_score, details
+        # 2. GENEL KARŞITLIK (B, 5, 5)
+        pair_mask = b_mask[:, :, None] & r_mask[:, None, :]
+        bi, ri = b[:, :, None], r[:, None, :]
+        general = ((rel['general_good_against'][bi, ri].astype(np.float64) - rel['general_bad_against'][bi, ri]) * pair_mask).sum(axis=(1, 2))
+        return lane + general * 5
 
     def calculate_matchup_advantage(self, team_blue, team_red):
         """
         Mavi takımın Kırmızı takıma karşı koridor ve genel avantajını hesaplar.
+        Takımlar liste (koridor sırasıyla) ya da lane_layout çıktısı gibi (5,) indeks dizisi olabilir.
         """
-        advantage_score = 0.0
-        matchup_details = []
+        blue = team_blue[None, :] if isinstance(team_blue, np.ndarray) else self.team_indices([team_blue])
+        red = team_red[None, :] if isinstance(team_red, np.ndarray) else self.team_indices([team_red])
+        advantage_score = float(self.matchup_advantage_batch(blue, red)[0])
 
-        # 1. KORİDOR EŞLEŞMESİ (LANE MATCHUP)
-        # Varsayım: Listeler Role Göre Sıralı (Top, Jungle, Mid, ADC, Sup)
-        # 5v5 tamamlansa bile bazen eksik veri olabilir, min() ile güvenli döngü
-        limit = min(len(team_blue), len(team_red))
-        
-        roles = ["Top", "Jungle", "Mid", "ADC", "Sup"]
-        
-        for i in range(limit):
-            blue_champ = team_blue[i]
-            red_champ = team_red[i]
-            
-            if blue_champ == "Picking..." or red_champ == "Picking...": continue
-            
-            c_data = self.champ_lookup.get(blue_champ.lower())
-            if not c_data: continue
-
-            # A. İstatistiksel Skor
-            lane_adv = self.get_list_score(c_data.get('lane_counters', []), red_champ)
-            lane_dis = self.get_list_score(c_data.get('lane_countered_by', []), red_champ)
-            
-            net_lane = lane_adv - lane_dis
-            
-            # B. Uzman Görüşü (Expert Insight) - OYUN DEĞİŞTİRİCİ
-            expert = c_data.get('expert_insight', {})
-            expert_bonus = 0
-            
-            # Ben onu eziyor muyum?
-            if red_champ.lower() in [x.lower() for x in expert.get('easy_matchups', [])]:
-                expert_bonus = 20.0 # İstatistiksel olarak 10 puana denk devasa bonus
-                matchup_details.append(f"🔥 {blue_champ} > {red_champ} (Hard Counter)")
-            
-            # O beni eziyor mu?
-            elif red_champ.lower() in [x.lower() for x in expert.get('hard_counters', [])]:
-                expert_bonus = -20.0
-                matchup_details.append(f"💀 {blue_champ} < {red_champ} (Ezilir)")
-
-            # Toplam Koridor Puanı (İstatistik + Uzman)
-            # Koridor ağırlığı: 20
-            total_lane_point = (net_lane + expert_bonus) * 20
-            advantage_score += total_lane_point
-
-        # 2. GENEL KARŞITLIK (Herkes Herkese Karşı)
-        general_score = 0
-        for b_name in team_blue:
-            if b_name == "Picking...": continue
-            b_data = self.champ_lookup.get(b_name.lower())
-            if not b_data: continue
-            
-            for r_name in team_red:
-                if r_name == "Picking...": continue
-                
-                good = self.get_list_score(b_data.get('general_good_against', []), r_name)
-                bad = self.get_list_score(b_data.get('general_bad_against', []), r_name)
-                general_score += (good - bad)
-        
-        # Genel puan ağırlığı: 5
-        advantage_score += general_score * 5
-        
+        # Kritik eşleşme açıklamaları (yalnızca uzman görüşü olan koridorlar)
+        matchup_details = []
+        names = self.index.names
+        for b_idx, r_idx in zip(blue[0], red[0]):
+            if b_idx < 0 or r_idx < 0: continue
+            if self.index.expert_easy[b_idx, r_idx]:
+                matchup_details.append(f"🔥 {names[b_idx]} > {names[r_idx]} (Hard Counter)")
+            elif self.index.expert_hard[b_idx, r_idx]:
+                matchup_details.append(f"💀 {names[b_idx]} < {names[r_idx]} (Ezilir)")
         return advantage_score, matchup_details
 
-    def predict_match(self, team_blue, team_red):
+    @pinned
+    def predict_batch(self, blue_teams, red_teams):
+        """
+        Binlerce 5v5 draft'ı tek geçişte değerlendirir.
+        blue_teams / red_teams: (B, 5) indeks dizileri (-1 boş slot) veya takım listeleri.
+        Döner: mavi takımın kazanma yüzdeleri (B,). Takımlardan biri boşsa 50.
+        """
+        blue = blue_teams if isinstance(blue_teams, np.ndarray) else self.team_indices(blue_teams)
+        red = red_teams if isinstance(red_teams, np.ndarray) else self.team_indices(red_teams)
+
+        blue_power = self.team_power_batch(blue)
+        red_power = self.team_power_batch(red)
+        advantage = self.matchup_advantage_batch(blue, red)
+
+        final_blue = blue_power + advantage / 2
+        final_red = red_power - advantage / 2
+        total = final_blue + final_red
+        with np.errstate(invalid="ignore", divide="ignore"):
+            blue_win_rate = np.where(total == 0, 50.0, final_blue / total * 100)
+        empty = ~(blue >= 0).any(axis=1) | ~(red >= 0).any(axis=1)
+        return np.where(empty, 50.0, blue_win_rate)
+
+    @pinned
+    def predict_match(self, team_blue, team_red, blue_roles=None, red_roles=None):
         """
         İki takımı karşılaştırır, terminale analiz yazar ve yüzdeleri DÖNDÜRÜR.
+        Takımlar herhangi bir sırada gelebilir (LCU hücre sırası); koridor eşleşmeleri için
+        seçimler rol çıkarımıyla (lane_layout) dizilir. blue_roles/red_roles verilirse o roller kesindir.
         """
-        # Sadece gerçek isimleri filtrele
-        real_blue = [c for c in team_blue if c not in ["Picking...", "..."]]
-        real_red = [c for c in team_red if c not in ["Picking...", "..."]]
+        # Sadece çözülebilen şampiyonları (ID veya isim) tut
+        real_blue = [c for c in team_blue if self.index.lookup(c) is not None]
+        real_red = [c for c in team_red if self.index.lookup(c) is not None]
         
         if not real_blue or not real_red:
             return 50, 50
@@ -165,12 +167,18 @@ class LoLMatchPredictor(LoLDecisionEngine):
         print(f"\n🔮 MAÇ TAHMİNİ: {len(real_blue)}v{len(real_red)}")
         print("-" * 40)
 
+        # Koridor sırası (sinerji çiftleri de bu sırayla sayılır, sonuç LCU sırasından bağımsız olur)
+        blue_lanes = self.lane_layout(team_blue, blue_roles)[0]
+        red_lanes = self.lane_layout(team_red, red_roles)[0]
+        real_blue = [self.index.names[i] for i in blue_lanes if i >= 0]
+        real_red = [self.index.names[i] for i in red_lanes if i >= 0]
+
         # 1. Takım Güçleri
         blue_power, blue_details = self.calculate_team_power(real_blue)
         red_power, red_details = self.calculate_team_power(real_red)
 
         # 2. Karşılaşma Avantajı (Pozitifse Mavi, Negatifse Kırmızı önde)
-        matchup_advantage, matchup_details = self.calculate_matchup_advantage(real_blue, real_red)
+        matchup_advantage, matchup_details = self.calculate_matchup_advantage(blue_lanes, red_lanes)
 
         # 3. Skorları Birleştir
         # Avantajı ikiye bölüp birine ekleyip diğerinden çıkarıyoruz ki fark açılsın
@@ -0,0 +1,46 @@
+import threading
+from collections import OrderedDict
+
+
+class RecommendationCache:
+    """
+    calculate_score ve DraftSession.rank sonuçları için sınırlı boyutlu LRU önbellek.
+
+    Champ select sırasında LCU aynı oturumu defalarca gönderir (sayaç, hover);
+    taslak değişmediyse sonuç da değişmez. Anahtar, normalize edilmiş taslak
+    durumudur ve motor tarafından üretilir (bkz. LoLDecisionEngine.cache_key).
+    Arayüz ve planlayıcı thread'i aynı motoru kullandığı için erişimler kilitlidir.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Kayıt varsa döndürür ve en yeni olarak işaretler, yoksa None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Tüm kayıtları siler (profil değişimi / veri yenileme). Sayaçlar korunur."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
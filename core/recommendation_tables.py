@@ -0,0 +1,124 @@
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from core.ai_recommendation_final import ROLE_ORDER, T_WR, WEIGHT_KEYS, round_scores, select_top_k
+from core.compiled_dataset import compiled_dir, read_artifact, write_artifact
+
+# Tablo biçimi veya puanlama formülü değişirse artırılır; eski tablolar yok sayılır
+TABLES_FORMAT = 3
+TABLES_ARTIFACT = "recommendations"
+# Tablo başına saklanan öneri sayısı; motorun varsayılan top_k'sından büyük olmamalı
+TABLE_K = 10
+
+
+def read_profiles(engine):
+    """Motorun okuduğu config dosyasındaki tüm profiller ({isim: ağırlıklar}). Yoksa yalnızca aktif profil."""
+    path = engine.config_path
+    if not os.path.exists(path):
+        path = path.replace("config.json", "ai_config.json")
+    try:
+        with open(path, "r") as f:
+            return json.load(f)["profiles"]
+    except Exception:
+        return {engine.active_profile: dict(engine.weights)}
+
+
+def build_tables(engine, k=TABLE_K):
+    """
+    "Rolüm + koridor rakibi, başka seçim yok" sorgusu için tüm profil × rol × rakip
+    kombinasyonlarının ilk k önerisi. Rakip boyutunda son sütun "rakip yok" durumudur.
+
+    Her (profil, rol) için koridor terimleri fill_lane_terms ile tek (aday × rakip)
+    ızgarasında hesaplanır; sütun başına seçim select_top_k ile canlı yolla aynıdır.
+    Döner: {"profiles": {isim: ağırlıklar}, "idx": (P, 5, N+1, k) int16, "score": (P, 5, N+1, k)}
+    """
+    profiles = read_profiles(engine)
+    n = engine.index.size
+    idx = np.full((len(profiles), len(ROLE_ORDER), n + 1, k), -1, dtype=np.int16)
+    score = np.zeros(idx.shape)
+
+    saved = engine.active_profile, engine.weights
+    try:
+        with engine.pinned_snapshot():
+            laners = np.arange(n)
+            for p, (name, weights) in enumerate(profiles.items()):
+                engine.active_profile, engine.weights = name, weights
+                w = engine.weight_vector()
+                for r, role in enumerate(ROLE_ORDER):
+                    c = engine.role_candidates[role]
+                    if not c.size: continue
+                    # Müttefik/diğer rakip yok: takım terimleri sıfır, yalnızca WR ve koridor satırları dolu
+                    T = np.zeros((len(WEIGHT_KEYS), c.size, n + 1))
+                    engine.fill_lane_terms(T[:, :, :n], c[:, None], laners[None, :])
+                    wr = engine.index.win_rate[c]
+                    T[T_WR] = np.where(wr > 0, wr - 50.0, 0.0)[:, None]
+                    scores = round_scores(np.einsum("k,kcl->lc", w, T))
+                    for l in range(n + 1):
+                        top = select_top_k(scores[l], k)
+                        idx[p, r, l, :top.size] = c[top]
+                        score[p, r, l, :top.size] = scores[l, top]
+    finally:
+        engine.active_profile, engine.weights = saved
+
+    return {"profiles": profiles, "idx": idx, "score": score}
+
+
+def write_tables(tables, data_file, hashes):
+    """Tabloları derlenmiş veri klasörüne yazar (bkz. write_artifact)."""
+    extra = {"roles": list(ROLE_ORDER), "profiles": tables["profiles"], "k": int(tables["idx"].shape[-1])}
+    try:
+        write_artifact(data_file, TABLES_ARTIFACT, TABLES_FORMAT, hashes,
+                       {"idx": tables["idx"], "score": tables["score"]}, extra)
+    except OSError as e:
+        print(f"⚠️ Öneri tabloları yazılamadı ({compiled_dir(data_file)}): {e}")
+
+
+def load_tables(data_file, hashes):
+    """
+    Geçerli tabloları açar (mmap). Yoksa, biçim eskiyse veya kaynak/config özetleri
+    tutmuyorsa None döner; motor bu durumda canlı puanlamaya düşer.
+    """
+    try:
+        artifact = read_artifact(data_file, TABLES_ARTIFACT, TABLES_FORMAT, hashes)
+        if artifact is None: return None
+        header, tables = artifact
+        if header.get("roles") != list(ROLE_ORDER): return None
+        tables["profiles"] = header["profiles"]
+        tables["k"] = header["k"]
+        return tables
+    except Exception as e:
+        print(f"⚠️ Öneri tabloları okunamadı, canlı puanlama kullanılacak: {e}")
+        return None
+
+
+def ensure_tables(engine):
+    """
+    Motorun snapshot'ı için tablolar yoksa/bayatsa yeniden kurar. Kurulduysa True döner.
+    Tablolar snapshot'ın kaynak özetleriyle anahtarlanır; diskteki veri snapshot'tan sonra
+    değiştiyse (başka veriye ait başlık yazılmasın diye) hiçbir şey yapılmaz.
+    """
+    data_file = engine.snapshot.path
+    hashes = engine.snapshot.current_sources()
+    if hashes is None: return False
+    if load_tables(data_file, hashes) is not None: return False
+    start = time.perf_counter()
+    tables = build_tables(engine)
+    write_tables(tables, data_file, hashes)
+    print(f"📋 Öneri tabloları kuruldu: {len(tables['profiles'])} profil × {len(ROLE_ORDER)} rol × "
+          f"{engine.index.size + 1} rakip ({(time.perf_counter() - start) * 1000:.0f} ms).")
+    return True
+
+
+if __name__ == "__main__":
+    # Kullanım: python -m core.recommendation_tables [veri_dosyası]
+    from core.ai_recommendation_final import LoLDecisionEngine
+    from core.dataset import DatasetSnapshot
+
+    data_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join("data", "tum_sampiyonlar_verisi_full.json")
+    engine = LoLDecisionEngine(data_file, DatasetSnapshot.load(data_file))
+    if not ensure_tables(engine):
+        print("ℹ️ Öneri tabloları güncel.")
@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+from core.ai_recommendation_final import ROLE_BITS, ROLE_ORDER
+from core.champion_index import RELATIONS
+from core.compiled_dataset import compiled_dir, read_artifact, write_artifact
+
+# İndeks biçimi veya özellik vektörü değişirse artırılır; eski indeksler yok sayılır
+SIMILARITY_FORMAT = 2
+SIMILARITY_ARTIFACT = "similarity"
+# Şampiyon başına saklanan komşu sayısı; yasaklı/alınmış olanlar atlandığında yedek kalsın diye geniş tutulur
+SIMILARITY_K = 24
+# Özellik bloklarının ağırlıkları. Her blok şampiyon başına birim uzunluğa ölçeklenir;
+# ilişki satırları (RELATIONS) toplamda "relations" ağırlığını paylaşır.
+SIMILARITY_WEIGHTS = {"relations": 1.0, "damage": 0.8, "class": 0.8, "archetype": 0.5, "role": 1.2}
+
+
+def unit_rows(block):
+    """Satırları birim uzunluğa ölçekler; boş satırlar sıfır kalır."""
+    norm = np.linalg.norm(block, axis=1, keepdims=True)
+    return np.divide(block, norm, out=np.zeros_like(block), where=norm > 0)
+
+
+def feature_vectors(engine):
+    """
+    Şampiyon başına özellik vektörü (N × D): ilişki matrisi satırları, damage_profile
+    (AP/AD oranı), sınıf, archetype üyeliği ve oynanabilir roller. Satırlar birim uzunluktadır.
+    """
+    idx = engine.index
+    W = SIMILARITY_WEIGHTS
+    blocks = [unit_rows(np.asarray(idx.relations[rel], dtype=np.float64)) * (W["relations"] / np.sqrt(len(RELATIONS)))
+              for rel in RELATIONS]
+    blocks.append(unit_rows(np.stack([idx.ap, idx.ad], axis=1).astype(np.float64)) * W["damage"])
+    class_names = sorted(set(idx.classes))
+    blocks.append((np.array(idx.classes)[:, None] == np.array(class_names)[None, :]) * W["class"])
+    blocks.append(unit_rows(engine.arch_matrix.T.astype(np.float64)) * W["archetype"])
+    roles = np.array([[bool(m & ROLE_BITS[r]) for r in ROLE_ORDER] for m in engine.role_masks], dtype=np.float64)
+    blocks.append(unit_rows(roles) * W["role"])
+    return unit_rows(np.hstack(blocks))
+
+
+def build_index(engine, k=SIMILARITY_K):
+    """
+    Kosinüs benzerliğine göre her şampiyonun en yakın k komşusu (kendisi hariç), azalan sırada.
+    Döner: {"idx": (N, k) int16, "sim": (N, k) float32}
+    """
+    F = feature_vectors(engine)
+    S = F @ F.T
+    np.fill_diagonal(S, -np.inf)
+    k = min(k, max(engine.index.size - 1, 0))
+    order = np.argsort(-S, axis=1, kind="stable")[:, :k]
+    return {"idx": order.astype(np.int16), "sim": np.take_along_axis(S, order, axis=1).astype(np.float32)}
+
+
+def write_index(index, data_file, hashes):
+    """İndeksi derlenmiş veri klasörüne yazar (bkz. write_artifact)."""
+    try:
+        write_artifact(data_file, SIMILARITY_ARTIFACT, SIMILARITY_FORMAT, hashes, index, {"k": int(index["idx"].shape[1])})
+    except OSError as e:
+        print(f"⚠️ Benzerlik indeksi yazılamadı ({compiled_dir(data_file)}): {e}")
+
+
+def load_index(data_file, hashes):
+    """Geçerli indeksi açar (mmap). Yoksa, biçim eskiyse veya kaynak özetleri tutmuyorsa None."""
+    try:
+        artifact = read_artifact(data_file, SIMILARITY_ARTIFACT, SIMILARITY_FORMAT, hashes)
+        return None if artifact is None else artifact[1]
+    except Exception as e:
+        print(f"⚠️ Benzerlik indeksi okunamadı, bellekte kurulacak: {e}")
+        return None
+
+
+def ensure_index(engine):
+    """
+    Motorun snapshot'ı için indeks yoksa/bayatsa yeniden kurar. Kurulduysa True döner.
+    İndeks snapshot'ın kaynak özetleriyle anahtarlanır (bkz. DatasetSnapshot.current_sources).
+    """
+    data_file = engine.snapshot.path
+    hashes = engine.snapshot.current_sources()
+    if hashes is None: return False
+    if load_index(data_file, hashes) is not None: return False
+    start = time.perf_counter()
+    index = build_index(engine)
+    write_index(index, data_file, hashes)
+    print(f"🧬 Benzerlik indeksi kuruldu: {engine.index.size} şampiyon × {index['idx'].shape[1]} komşu "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms).")
+    return True
+
+
+if __name__ == "__main__":
+    # Kullanım: python -m core.similarity_index [veri_dosyası] [şampiyon]
+    from core.ai_recommendation_final import LoLDecisionEngine
+    from core.dataset import DatasetSnapshot
+
+    data_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join("data", "tum_sampiyonlar_verisi_full.json")
+    engine = LoLDecisionEngine(data_file, DatasetSnapshot.load(data_file))
+    if not ensure_index(engine):
+        print("ℹ️ Benzerlik indeksi güncel.")
+    if len(sys.argv) > 2:
+        for alt in engine.similar_champions(sys.argv[2]):
+            print(f"   {alt['name']:<16} {alt['similarity']:.3f}")
@@ -1,5 +1,5 @@
 from PyQt6.QtWidgets import (QWidget, QLabel, QFrame, QVBoxLayout, QPushButton, 
-                             QGraphicsDropShadowEffect, QHBoxLayout, QSizePolicy)
+                             QGraphicsDropShadowEffect, QHBoxLayout, QSizePolicy, QGridLayout)
 from PyQt6.QtCore import (Qt, QPointF, QSize, pyqtSignal, QPropertyAnimation, 
                           QEasingCurve, QRect, QTimer, pyqtProperty)
 from PyQt6.QtGui import (QPainter, QPolygonF, QColor, QPen, QBrush, 
@@ -161,9 +161,9 @@ class SuggestionCard(QFrame):
     """
     New animated card for AI suggestions.
     """
-    def __init__(self, rank, name, champ_class, score, narrative, parent=None):
+    def __init__(self, rank, name, champ_class, score, narrative, note=None, parent=None):
         super().__init__(parent)
-        self.setFixedHeight(110)
+        self.setFixedHeight(130 if note else 110)
         self.setStyleSheet("""
             QFrame {
                 background-color: #21262d; 
@@ -204,9 +204,77 @@ class SuggestionCard(QFrame):
         
         layout.addLayout(row1)
         layout.addWidget(desc_lbl)
+
+        # Optional footer line (e.g. substitutes when this pick is banned or taken)
+        if note:
+            note_lbl = QLabel(note)
+            note_lbl.setWordWrap(True)
+            note_lbl.setStyleSheet("color: #d29922; font-size: 11px; border: none; background: transparent;")
+            layout.addWidget(note_lbl)
         
         # Entrance Animation
         self.opacity_effect = QGraphicsDropShadowEffect(self) # Just a dummy to use graphics effect slot? No, use windowopacity or property
         # For widgets inside layout, PropertyAnimation on geometry or opacity effect is best.
         # But for simplicity in list, we usually just show. 
         # Let's add simple simple styling for now.
+
+class WhatIfPanel(QFrame):
+    """
+    Counter-response matrix: my top candidates (rows) x the enemy's strongest
+    responses for the open slots (columns). Cells show the score shift.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumWidth(320)
+        self.setStyleSheet("""
+            QFrame {
+                background-color: #161b22;
+                border-radius: 8px;
+                border: 1px solid #30363d;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 10, 12, 10)
+        layout.setSpacing(8)
+
+        title = QLabel("What If? (enemy responses)")
+        title.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        title.setStyleSheet("color: #e6edf3; border: none;")
+        layout.addWidget(title)
+
+        self.grid = QGridLayout()
+        self.grid.setSpacing(4)
+        layout.addLayout(self.grid)
+        layout.addStretch()
+        self.clear()
+
+    def clear(self):
+        while self.grid.count():
+            child = self.grid.takeAt(0)
+            if child.widget(): child.widget().deleteLater()
+
+    def _cell(self, text, color="#c9d1d9", bold=False):
+        lbl = QLabel(text)
+        lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        weight = "bold" if bold else "normal"
+        lbl.setStyleSheet(f"color: {color}; font-size: 11px; font-weight: {weight}; border: none; background: transparent;")
+        return lbl
+
+    def set_matrix(self, result):
+        """result: LoLDecisionEngine.what_if_matrix output."""
+        self.clear()
+        if not result.get("candidates"): return
+        if not result.get("responses"):
+            self.grid.addWidget(self._cell("Enemy team is complete.", "#8b949e"), 0, 0)
+            return
+
+        self.grid.addWidget(self._cell("Pick", "#8b949e", True), 0, 0)
+        for col, name in enumerate(result["responses"], 1):
+            self.grid.addWidget(self._cell(name, "#ef4444", True), 0, col)
+
+        for row, (name, base) in enumerate(zip(result["candidates"], result["base"]), 1):
+            self.grid.addWidget(self._cell(f"{name} ({base:.0f})", "#00e676", True), row, 0)
+            for col, shift in enumerate(result["delta"][row - 1], 1):
+                color = "#f85149" if shift < 0 else ("#3fb950" if shift > 0 else "#8b949e")
+                self.grid.addWidget(self._cell(f"{shift:+.0f}", color), row, col)
@@ -5,6 +5,7 @@ import random
 import re
 from bs4 import BeautifulSoup
 from curl_cffi import requests
+from core.http_cache import shared_cache
 
 # --- AYARLAR ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -42,13 +43,18 @@ class LoLScraper:
     def __init__(self):
         # Gerçekçi tarayıcı taklidi
         self.session = requests.Session(impersonate="chrome120")
+        self.fetched = 0 # Ağdan gelen yanıt sayısı (önbellek isabetlerinde bekleme yapılmaz)
         
     def get_soup(self, url):
         for attempt in range(3):
             try:
-                response = self.session.get(url, timeout=15)
+                response = shared_cache().get(self.session, url, timeout=15)
+                if not getattr(response, "from_cache", False):
+                    self.fetched += 1
                 if response.status_code == 200:
                     return BeautifulSoup(response.content, 'lxml')
+                elif response.status_code == 404:
+                    return None
                 elif response.status_code == 429:
                     print(f"   🛑 429 Hata (IP Ban Riski). 60sn soğuma...")
                     time.sleep(60)
@@ -141,54 +147,122 @@ def normalize_scores(matchup_list):
     
     return matchup_list
 
-def process_champion(hero, all_champions):
-    hero_name = hero['name']
-    hero_slug = sanitize_name(hero_name)
+def role_enemies(hero, all_champions):
+    """Rol kesişimi olan rakipler (liste sırasıyla). Kesişim simetrik: A, B'nin rakibiyse B de A'nın."""
     hero_roles = get_roles_set(hero.get('role', ''))
-    
-    raw_matchups = []
-    
-    print(f"\n🚀 {hero_name} ({hero['role']}) işleniyor...")
-    
-    # Rakipleri Filtrele (Rol Kesişimi)
     target_enemies = []
     for c in all_champions:
-        if c['name'] == hero_name: continue
+        if c['name'] == hero['name']: continue
         
         enemy_roles = get_roles_set(c.get('role', ''))
         
         # Kümelerin kesişimi var mı? (Ortak rol var mı?)
         if hero_roles.intersection(enemy_roles):
             target_enemies.append(c)
+    return target_enemies
+
+def plan_pairs(pending, all_champions):
+    """
+    Çift planı: işlenecek her şampiyon için gerçekten istenecek rakipler, işlem sırasıyla.
+    A vs B ve B vs A aynı bilgiyi taşır (tamamlayıcı kazanma oranları), bu yüzden her
+    sırasız çift yalnızca ilk işlenen şampiyonun sayfasından bir kez çekilir.
+    Döner: [(şampiyon, [istenecek rakipler])]
+    """
+    planned = set()
+    plan = []
+    for hero in pending:
+        fetch = []
+        for enemy in role_enemies(hero, all_champions):
+            pair = frozenset((hero['name'], enemy['name']))
+            if pair in planned: continue
+            planned.add(pair)
+            fetch.append(enemy)
+        plan.append((hero, fetch))
+    return plan
+
+class FetchProgress:
+    """Plan baştan bilindiği için toplam istek sayısı ve kalan süre (ETA) kesindir."""
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.start = time.perf_counter()
+
+    def tick(self):
+        self.done += 1
+
+    def eta(self):
+        if not self.done: return "--:--"
+        left = (time.perf_counter() - self.start) / self.done * (self.total - self.done)
+        return f"{int(left // 3600):d}:{int(left % 3600 // 60):02d}:{int(left % 60):02d}"
+
+def fetch_pair(hero, enemy, pair_wr):
+    """
+    Tek çift sayfası: hero'nun enemy'ye karşı kazanma oranı. Ters yön 100 - wr olarak türetilir.
+    Veri çekilemezse iki yön de None kaydedilir (çift tekrar istenmez).
+    """
+    hero_slug = sanitize_name(hero['name'])
+    enemy_slug = sanitize_name(enemy['name'])
+    # Kullanıcının verdiği örnek link yapısı:
+    # https://www.leagueofgraphs.com/champions/tier-list/kaisa/vs-aurelionsol/iron
+    url = f"https://www.leagueofgraphs.com/champions/tier-list/{hero_slug}/vs-{enemy_slug}/{REGION}"
+    raw_wr = extract_win_rate_from_script(bot.get_soup(url))
+    pair_wr[(hero['name'], enemy['name'])] = raw_wr
+    pair_wr[(enemy['name'], hero['name'])] = round(100.0 - raw_wr, 2) if raw_wr is not None else None
+
+def process_champion(hero, all_champions, pair_wr=None, progress=None, to_fetch=None):
+    """
+    pair_wr: (şampiyon, rakip) -> ham kazanma oranı tablosu, şampiyonlar arasında paylaşılır.
+    to_fetch: plan_pairs'in bu şampiyon için planladığı rakipler. Planda olmayıp tabloda hâlâ
+    bulunmayan rakipler de istenir: çiftin planlandığı şampiyon yarıda hata verdiyse kalan
+    çiftleri buradan çekilir (ilerleme toplamı buna göre büyür).
+    """
+    hero_name = hero['name']
+    pair_wr = {} if pair_wr is None else pair_wr
+    
+    raw_matchups = []
+    
+    print(f"\n🚀 {hero_name} ({hero['role']}) işleniyor...")
+    
+    # Rakipleri Filtrele (Rol Kesişimi)
+    target_enemies = role_enemies(hero, all_champions)
+    planned = list(to_fetch or [])
+    planned_names = {e['name'] for e in planned}
+    missing = [e for e in target_enemies if (hero_name, e['name']) not in pair_wr and e['name'] not in planned_names]
+    to_fetch = planned + missing
+    if progress and missing: progress.total += len(missing)
 
     total_targets = len(target_enemies)
-    print(f"   🎯 Hedef: {total_targets} rakip ile kıyaslanacak (Rol filtreli).")
+    print(f"   🎯 Hedef: {total_targets} rakip ile kıyaslanacak (Rol filtreli), {len(to_fetch)} yeni istek.")
 
-    for i, enemy in enumerate(target_enemies):
-        enemy_name = enemy['name']
-        enemy_slug = sanitize_name(enemy_name)
-        
-        # Kullanıcının verdiği örnek link yapısı:
-        # https://www.leagueofgraphs.com/champions/tier-list/kaisa/vs-aurelionsol/iron
-        url = f"https://www.leagueofgraphs.com/champions/tier-list/{hero_slug}/vs-{enemy_slug}/{REGION}"
-        
-        print(f"\r   [{i+1}/{total_targets}] vs {enemy_name:<15}", end="")
+    for i, enemy in enumerate(to_fetch):
+        line = f"\r   [{i+1}/{len(to_fetch)}] vs {enemy['name']:<15}"
+        if progress: line += f" | Toplam {progress.done + 1}/{progress.total} | ETA {progress.eta()}"
+        print(line, end="")
         
-        soup = bot.get_soup(url)
-        raw_wr = extract_win_rate_from_script(soup)
+        fetched = bot.fetched
+        try:
+            fetch_pair(hero, enemy, pair_wr)
+        except Exception:
+            # Kalan çiftler ortak şampiyonlara "eksik" olarak geçer ve orada sayılır
+            if progress: progress.total -= len(to_fetch) - i
+            raise
+        if progress: progress.tick()
         
+        # Her istek arası bekleme (yanıt önbellekten geldiyse gerek yok)
+        if bot.fetched != fetched:
+            time.sleep(random.uniform(0.8, 1.5))
+
+    for enemy in target_enemies:
+        raw_wr = pair_wr.get((hero_name, enemy['name']))
         if raw_wr is not None:
             raw_matchups.append({
-                "enemy": enemy_name,
+                "enemy": enemy['name'],
                 "raw_wr": raw_wr
             })
         else:
             # Veri çekilemezse (Site yapısı değişmiş veya veri yoksa)
             # Pas geçiyoruz, listeye eklemiyoruz.
             pass
-        
-        # Her istek arası bekleme
-        time.sleep(random.uniform(0.8, 1.5))
     
     print(f"\n   ✅ {hero_name}: {len(raw_matchups)} veri toplandı. Normalizasyon yapılıyor...")
     
@@ -211,24 +285,38 @@ def main():
     # İsteğe bağlı: Listeyi isme göre sırala
     champion_list.sort(key=lambda x: x['name'])
     
+    pending = []
     for champ in champion_list:
+        # Resume (Kaldığı yerden devam etme) Özelliği
+        if os.path.exists(os.path.join(OUTPUT_DIR, f"{champ['name']}.json")):
+            print(f"⏩ {champ['name']} zaten tamamlanmış, geçiliyor.")
+        else:
+            pending.append(champ)
+
+    # Çift planı baştan: her sırasız çift bir kez istenir, ters yön türetilir
+    plan = plan_pairs(pending, champion_list)
+    progress = FetchProgress(sum(len(fetch) for _, fetch in plan))
+    both_ways = sum(len(role_enemies(champ, champion_list)) for champ in pending)
+    print(f"🧮 Plan: {len(pending)} şampiyon, {progress.total} çift isteği (çift yönlü olsaydı {both_ways}).")
+    pair_wr = {}
+
+    for champ, fetch in plan:
         champ_name = champ['name']
         output_path = os.path.join(OUTPUT_DIR, f"{champ_name}.json")
-        
-        # Resume (Kaldığı yerden devam etme) Özelliği
-        if os.path.exists(output_path):
-            print(f"⏩ {champ_name} zaten tamamlanmış, geçiliyor.")
-            continue
             
         try:
-            data = process_champion(champ, champion_list)
+            fetched = bot.fetched
+            data = process_champion(champ, champion_list, pair_wr, progress, fetch)
             
             # Kaydet
             with open(output_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=4, ensure_ascii=False)
                 
-            print("💾 Kaydedildi. Soğuma bekleniyor (3sn)...")
-            time.sleep(3)
+            if bot.fetched != fetched:
+                print("💾 Kaydedildi. Soğuma bekleniyor (3sn)...")
+                time.sleep(3)
+            else:
+                print("💾 Kaydedildi (önbellekten).")
             
         except Exception as e:
             print(f"\n❌ Kritik Hata ({champ_name}): {e}")
@@ -2,6 +2,7 @@ import cloudscraper
 from bs4 import BeautifulSoup
 import json
 import time
+from core.http_cache import shared_cache
 
 # --- AYARLAR ---
 OUTPUT_FILE = "data/sampiyon_listesi.json"
@@ -55,7 +56,7 @@ def main():
     scraper = cloudscraper.create_scraper()
     
     try:
-        response = scraper.get(URL)
+        response = shared_cache().get(scraper, URL)
         if response.status_code != 200:
             print(f"❌ Hata: Siteye ulaşılamadı. Kod: {response.status_code}")
             return
@@ -11,13 +11,13 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 import qdarktheme
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QFrame, QMessageBox, QPlainTextEdit,
-                             QComboBox, QSizePolicy, QScrollArea, QGridLayout)
+                             QComboBox, QSizePolicy, QScrollArea, QGridLayout, QCheckBox)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QObject
 from PyQt6.QtGui import QFont, QIcon, QTextCursor, QColor
 
 # --- MODULES ---
 from core.modern_window import ModernWindow
-from core.ui_components import HexagonWidget, ModernButton, RoleIndicator, SuggestionCard
+from core.ui_components import HexagonWidget, ModernButton, RoleIndicator, SuggestionCard, WhatIfPanel
 from core.data_manager import ensure_data_directory, get_resource_path
 import pyqtgraph as pg
 
@@ -46,11 +46,14 @@ try:
     import list_update
     import veri_cekici_main
     import expert_parser
-    import merge_expert_data
-    import merge_damage_stats
+    import merge_pipeline
     from core.lcu_connector import LCUWorker
     from core.ai_recommendation_final import LoLDecisionEngine
     from core.match_predictor import LoLMatchPredictor
+    from core.draft_session import DraftSession
+    from core.draft_forecast import DraftForecaster
+    from core.draft_planner import DraftPlanner
+    from core.dataset import DatasetSnapshot
 except ImportError as e:
     print(f"⚠️ Module Missing: {e}")
 
@@ -64,20 +67,40 @@ class EmittingStream(QObject):
 # --- 6. BACKGROUND WORKER ---
 class ScriptRunner(QThread):
     finished_task = pyqtSignal()
-    def __init__(self, task_type):
+    def __init__(self, task_type, data_path=None):
         super().__init__()
         self.task_type = task_type
+        self.data_path = data_path
+        self.snapshot = None  # merge result, handed to the engines without re-reading the file
 
     def run(self):
         try:
             if self.task_type == "scrape_data":
                 print("⏳ Fetching stats..."); veri_cekici_main.main()
             elif self.task_type == "merge_all":
-                print("ℹ️ Merging data..."); expert_parser.main(); merge_expert_data.main(); merge_damage_stats.main()
+                print("ℹ️ Merging data..."); expert_parser.main()
+                # One read, all stages in memory, one atomic write
+                self.snapshot = merge_pipeline.run(self.data_path or merge_pipeline.MAIN_DATA_FILE)
                 print("🎉 Database Ready.")
         except Exception as e: print(f"❌ ERROR: {str(e)}")
         self.finished_task.emit()
 
+class PlannerRunner(QThread):
+    """Runs DraftPlanner.plan off the UI thread; the result is read from .plan once finished fires."""
+    def __init__(self, planner):
+        super().__init__()
+        self.planner = planner
+        self.request = None  # (args, kwargs) of the search being run
+        self.plan = None
+
+    def run(self):
+        args, kwargs = self.request
+        try:
+            self.plan = self.planner.plan(*args, **kwargs)
+        except Exception as e:
+            print(f"⚠️ Planner Error: {e}")
+            self.plan = None
+
 # --- 8. MAIN WINDOW ---
 class MainWindow(ModernWindow):
     def __init__(self):
@@ -91,9 +114,19 @@ class MainWindow(ModernWindow):
         
         self.ai_engine = None
         self.match_predictor = None
+        self.forecaster = None
+        self.draft_planner = None
+        self.planner_runner = None
+        self.planner_request = None  # latest planner input; searched again only when it changes
+        self.draft_session = None  # incremental scoring state for the current champ select
+        self.laner_auto = True  # opponent combo follows lane inference until the user picks one
         self.current_role = "Unknown" 
         self.current_my_team = []
         self.current_enemy_team = []
+        self.current_my_roles = None
+        self.current_enemy_roles = None
+        self.current_bans = []
+        self.current_my_pick = None
 
         self.setup_ui()
         self.apply_styles()
@@ -147,6 +180,12 @@ class MainWindow(ModernWindow):
         
         header_layout.addWidget(QLabel("Playstyle:", styleSheet="color:#8b949e"))
         header_layout.addWidget(self.combo_playstyle)
+
+        # Blind pick: rank by expected/worst lane outcome while the enemy laner is unknown
+        self.chk_blind = QCheckBox("Blind Pick")
+        self.chk_blind.setStyleSheet("color:#8b949e")
+        self.chk_blind.toggled.connect(self.toggle_blind_pick)
+        header_layout.addWidget(self.chk_blind)
         header_layout.addStretch()
         header_layout.addWidget(self.lbl_status)
         
@@ -182,6 +221,11 @@ class MainWindow(ModernWindow):
         self.bar_chart.setTitle("Power Analysis", color="w", size="10pt")
         self.bar_chart.setFixedHeight(200)
         center_col.addWidget(self.bar_chart)
+
+        # Win forecast (Monte Carlo over the open slots, updated from the first pick on)
+        self.lbl_forecast = QLabel("Win Forecast: -")
+        self.lbl_forecast.setStyleSheet("color: #8b949e; font-weight: bold;")
+        center_col.addWidget(self.lbl_forecast, alignment=Qt.AlignmentFlag.AlignCenter)
         
         main_area.addLayout(center_col, stretch=2)
         
@@ -205,7 +249,7 @@ class MainWindow(ModernWindow):
         self.combo_enemy_laner = QComboBox()
         self.combo_enemy_laner.addItem("Select Opponent")
         self.combo_enemy_laner.setFixedWidth(200)
-        self.combo_enemy_laner.currentIndexChanged.connect(self.re_run_analysis_from_ui)
+        self.combo_enemy_laner.currentIndexChanged.connect(self.on_enemy_laner_changed)
         suggestions_header.addStretch()
         suggestions_header.addWidget(QLabel("Lane Opponent:", styleSheet="color: #8b949e"))
         suggestions_header.addWidget(self.combo_enemy_laner)
@@ -224,7 +268,13 @@ class MainWindow(ModernWindow):
         self.cards_layout.addStretch() # Push items up
         
         scroll.setWidget(self.cards_container)
-        layout.addWidget(scroll, stretch=1)
+
+        # Cards on the left, counter-response matrix for the top picks on the right
+        suggestions_area = QHBoxLayout()
+        suggestions_area.addWidget(scroll, stretch=3)
+        self.what_if_panel = WhatIfPanel()
+        suggestions_area.addWidget(self.what_if_panel, stretch=2)
+        layout.addLayout(suggestions_area, stretch=1)
 
         # --- 4. CONTROLS & LOG ---
         footer_layout = QHBoxLayout()
@@ -238,11 +288,14 @@ class MainWindow(ModernWindow):
         b_merge.clicked.connect(lambda: self.run_script("merge_all"))
         b_force = ModernButton("Force Analyze", "#d29922")
         b_force.clicked.connect(self.force_recommendation)
+        b_team = ModernButton("Team Picks", "#3fb950")
+        b_team.clicked.connect(self.show_team_recommendations)
         
         footer_layout.addWidget(b_reset)
         footer_layout.addWidget(b_update)
         footer_layout.addWidget(b_merge)
         footer_layout.addWidget(b_force)
+        footer_layout.addWidget(b_team)
         
         layout.addLayout(footer_layout)
         
@@ -265,20 +318,39 @@ class MainWindow(ModernWindow):
             QScrollBar::handle:vertical { background: #30363d; min-height: 20px; border-radius: 5px; }
         """)
 
-    def load_ai_modules(self):
+    def load_ai_modules(self, snapshot=None):
         if os.path.exists(self.data_path):
             try:
-                self.ai_engine = LoLDecisionEngine(self.data_path)
-                self.match_predictor = LoLMatchPredictor(self.data_path)
+                # The dataset is parsed once and shared by reference between both engines
+                if snapshot is None: snapshot = DatasetSnapshot.load(self.data_path)
+                if self.ai_engine and self.match_predictor:
+                    # Keep the selected playstyle; swapping also invalidates the recommendation cache
+                    self.ai_engine.swap_snapshot(snapshot)
+                    self.match_predictor.swap_snapshot(snapshot)
+                else:
+                    self.ai_engine = LoLDecisionEngine(self.data_path, snapshot)
+                    self.match_predictor = LoLMatchPredictor(self.data_path, snapshot)
+                    self.forecaster = DraftForecaster(self.match_predictor)
+                    # Search runs on a worker thread; the budget keeps it well inside the pick timer
+                    self.draft_planner = DraftPlanner(self.ai_engine, self.match_predictor, budget_ms=400)
+                    self.planner_runner = PlannerRunner(self.draft_planner)
+                    self.planner_runner.finished.connect(self.on_plan_ready)
                 print(f"✅ AI Modules Loaded.")
             except: print("❌ Failed to load AI modules.")
         else: print("⚠️ Data not found! Please Merge.")
 
     def reset_ui_state(self):
         print("\n🗑️ Resetting UI State.")
+        self.draft_session = None
+        self.planner_request = None
         self.current_role = "Unknown"
         self.current_my_team = []
         self.current_enemy_team = []
+        self.current_my_roles = None
+        self.current_enemy_roles = None
+        self.current_bans = []
+        self.current_my_pick = None
+        self.laner_auto = True
         
         self.role_indicator.set_role("UNKNOWN")
         self.combo_enemy_laner.clear()
@@ -288,6 +360,7 @@ class MainWindow(ModernWindow):
         for slot in self.red_slots: slot.set_champ("...")
         
         self.bar_chart.clear()
+        self.lbl_forecast.setText("Win Forecast: -")
         
         # Clear Cards
         self.clear_suggestions()
@@ -307,6 +380,7 @@ class MainWindow(ModernWindow):
             if child.widget():
                 child.widget().deleteLater()
         self.cards_layout.addStretch()
+        self.what_if_panel.clear()
 
     def update_connection_status(self, msg):
         self.lbl_status.setText(msg)
@@ -323,10 +397,15 @@ class MainWindow(ModernWindow):
             self.log_output.moveCursor(QTextCursor.MoveOperation.End)
         except RuntimeError: pass
 
+    def on_enemy_laner_changed(self, index):
+        # Only a user pick pins the opponent; programmatic re-runs keep lane inference on
+        if index == -1: return
+        self.laner_auto = False
+        self.re_run_analysis_from_ui(index)
+
     def re_run_analysis_from_ui(self, index):
         if index == -1: return
-        target_enemy = self.combo_enemy_laner.currentText()
-        if "Select" in target_enemy: target_enemy = None
+        target_enemy = self.combo_enemy_laner.currentData()
         
         role = self.current_role
         if role.lower() in ["unknown", "belirsiz", "none", ""]: role = "mid"
@@ -343,24 +422,53 @@ class MainWindow(ModernWindow):
             if self.combo_enemy_laner.currentIndex() > 0:
                 self.re_run_analysis_from_ui(0)
 
+    def toggle_blind_pick(self, checked):
+        if not self.ai_engine: return
+        self.ai_engine.blind_pick = checked
+        self.append_terminal_text(f"🙈 Blind Pick: {'ON' if checked else 'OFF'}")
+        if self.combo_enemy_laner.currentIndex() <= 0 and self.current_role.lower() not in ["unknown", ""]:
+            self.re_run_analysis_from_ui(0)
+
     def force_recommendation(self):
         print("\n⚡ Manual Trigger.")
         role = self.current_role
         if role in ["Unknown", "Belirsiz", "None", ""]: role = "Mid"
         
-        target = self.combo_enemy_laner.currentText()
-        if "Select" in target: target = None
+        target = self.combo_enemy_laner.currentData()
         
         self.run_ai_analysis(role, target, self.current_my_team, self.current_enemy_team)
 
+    def show_team_recommendations(self):
+        # Top picks for every open ally slot (5-stack coaching), one batched engine call
+        if not self.ai_engine: return
+        try:
+            team = self.ai_engine.recommend_team(self.current_my_team, self.current_enemy_team,
+                                                 self.current_my_roles, self.current_enemy_roles, k=3)
+        except Exception as e:
+            print(f"⚠️ Team Analysis Error: {e}")
+            return
+        if not team:
+            print("👥 Team Picks: all slots are filled.")
+            return
+        print("\n👥 Team Picks:")
+        for role, picks in team.items():
+            print(f"   {role.upper():<9} " + ", ".join(f"{p['name']} ({p['score']:.0f})" for p in picks))
+
     def handle_champ_select(self, data):
+        # Names are for display only; the engine works on Riot champion IDs
         my_team = data.get('my_team', [])
         enemy_team = data.get('enemy_team', [])
+        my_team_ids = data.get('my_team_ids', my_team)
+        enemy_team_ids = data.get('enemy_team_ids', enemy_team)
         my_role = data.get('my_role', 'Unknown')
         
         self.current_role = str(my_role)
-        self.current_my_team = my_team
-        self.current_enemy_team = enemy_team
+        self.current_my_team = my_team_ids
+        self.current_enemy_team = enemy_team_ids
+        self.current_my_roles = data.get('my_team_roles')
+        self.current_enemy_roles = data.get('enemy_team_roles')
+        self.current_bans = data.get('bans', [])
+        self.current_my_pick = data.get('my_pick')
         
         self.role_indicator.set_role(self.current_role)
         
@@ -372,33 +480,103 @@ class MainWindow(ModernWindow):
             name = enemy_team[i] if i < len(enemy_team) else "..."
             self.red_slots[i].set_champ(name)
             
-        # Update Enemy List
-        current_selection = self.combo_enemy_laner.currentText()
-        self.combo_enemy_laner.currentIndexChanged.disconnect(self.re_run_analysis_from_ui)
+        # Update Enemy List (text = name, data = champion ID)
+        current_selection = self.combo_enemy_laner.currentData()
+        self.combo_enemy_laner.currentIndexChanged.disconnect(self.on_enemy_laner_changed)
         self.combo_enemy_laner.clear()
         self.combo_enemy_laner.addItem("Select Opponent")
-        real_enemies = [c for c in enemy_team if c not in ["Picking...", "Unknown", "...", "None"]]
-        for e in real_enemies: self.combo_enemy_laner.addItem(e)
-        
-        if current_selection in real_enemies:
-            self.combo_enemy_laner.setCurrentText(current_selection)
-        self.combo_enemy_laner.currentIndexChanged.connect(self.re_run_analysis_from_ui)
-        
-        # Trigger Analysis
-        target_enemy = self.combo_enemy_laner.currentText()
-        if "Select" in target_enemy: target_enemy = None
+        for name, champ_id in zip(enemy_team, enemy_team_ids):
+            if name in ["Picking...", "Unknown", "...", "None"]: continue
+            self.combo_enemy_laner.addItem(name, champ_id)
         
         role = self.current_role
         if role.lower() in ["unknown", ""]: role = "mid"
+
+        if self.laner_auto and self.ai_engine and self.current_role.lower() not in ["unknown", ""]:
+            inferred = self.infer_enemy_laner(role, enemy_team_ids, data.get('enemy_team_roles'))
+            if inferred is not None: current_selection = inferred
+        if current_selection is not None:
+            pos = self.combo_enemy_laner.findData(current_selection)
+            if pos > 0: self.combo_enemy_laner.setCurrentIndex(pos)
+        self.combo_enemy_laner.currentIndexChanged.connect(self.on_enemy_laner_changed)
+        
+        # Trigger Analysis
+        target_enemy = self.combo_enemy_laner.currentData()
         
         if self.ai_engine:
-            self.run_ai_analysis(role, target_enemy, my_team, enemy_team)
+            if data.get('ban_phase'):
+                self.run_ban_analysis(role, my_team_ids, enemy_team_ids, data.get('bans', []), data.get('my_pick'), data.get('my_ban_turn'))
+            else:
+                self.run_ai_analysis(role, target_enemy, my_team_ids, enemy_team_ids)
             
+        # Win forecast for the partial draft
+        if self.forecaster:
+            self.update_forecast(my_team_ids, enemy_team_ids, data.get('my_team_roles'), data.get('enemy_team_roles'),
+                                 self.current_bans)
+
+        # Look-ahead suggestion over the remaining snake picks
+        if self.draft_planner and self.current_role.lower() not in ["unknown", ""] and not self.is_team_complete(my_team):
+            self.run_draft_planner(role, my_team_ids, enemy_team_ids, data)
+
         # Match Prediction
         if self.match_predictor:
             if self.is_team_complete(my_team) and self.is_team_complete(enemy_team):
                 print("\n🏁 5v5 Locked! Predicting Match...")
-                self.match_predictor.predict_match(my_team, enemy_team)
+                self.match_predictor.predict_match(my_team_ids, enemy_team_ids,
+                                                   data.get('my_team_roles'), data.get('enemy_team_roles'))
+
+    def infer_enemy_laner(self, role, enemy_team, enemy_roles=None):
+        """Combo data of the enemy the engine places in my lane, or None if that lane is still empty."""
+        try:
+            layout, confidence = self.ai_engine.lane_layout(enemy_team, enemy_roles)
+        except Exception as e:
+            print(f"⚠️ Lane Inference Error: {e}")
+            return None
+        slot = self.ai_engine.known_slot(role)
+        if slot < 0 or layout[slot] < 0: return None
+        index = self.ai_engine.index
+        for champ in enemy_team:
+            if index.lookup(champ) == layout[slot]:
+                print(f"🔎 Inferred laner: {index.names[layout[slot]]} ({confidence[slot] * 100:.0f}%)")
+                return champ
+        return None
+
+    def update_forecast(self, ally_team, enemy_team, ally_roles=None, enemy_roles=None, banned=[]):
+        try:
+            f = self.forecaster.forecast(ally_team, enemy_team, ally_roles, enemy_roles, banned)
+        except Exception as e:
+            print(f"⚠️ Forecast Error: {e}")
+            return
+        if f["open_slots"]:
+            self.lbl_forecast.setText(f"Win Forecast: {f['mean']:.1f}%  (P10 {f['p10']:.1f} - P90 {f['p90']:.1f}, {f['open_slots']} open)")
+        else:
+            self.lbl_forecast.setText(f"Win Forecast: {f['mean']:.1f}%")
+        color = "#3fb950" if f["mean"] >= 50 else "#f85149"
+        self.lbl_forecast.setStyleSheet(f"color: {color}; font-weight: bold;")
+
+    def run_draft_planner(self, my_role, ally_team, enemy_team, data):
+        # LCU resends the session on every timer/hover tick; only a changed draft starts a new search
+        request = ((my_role, list(ally_team), list(enemy_team), data.get('my_team_roles'), data.get('enemy_team_roles'),
+                    list(self.current_bans)), {"first_pick": data.get('first_pick', True)})
+        if request == self.planner_request: return
+        self.planner_request = request
+        # One search at a time; on_plan_ready starts the latest request when the current one ends
+        if not self.planner_runner.isRunning():
+            self.start_planner()
+
+    def start_planner(self):
+        self.planner_runner.request = self.planner_request
+        self.planner_runner.start()
+
+    def on_plan_ready(self):
+        runner = self.planner_runner
+        if runner.request != self.planner_request:
+            # The draft moved on while searching: drop the stale result and search the new state
+            if self.planner_request is not None: self.start_planner()
+            return
+        plan = runner.plan
+        if not plan: return
+        print(f"🧭 Planner: {plan['pick']} -> {plan['win']:.1f}% vs best replies (depth {plan['depth']}, {plan['elapsed_ms']:.0f} ms)")
 
     def is_team_complete(self, team):
         if not team or len(team) < 5: return False
@@ -408,9 +586,12 @@ class MainWindow(ModernWindow):
         return True
 
     def run_ai_analysis(self, my_role, enemy_laner, ally_team, enemy_team):
-        print(f"💡 Analysis: Role={my_role}, VS={enemy_laner}")
+        vs_name = self.ai_engine.index.registry.display_name(enemy_laner) if enemy_laner is not None else None
+        print(f"💡 Analysis: Role={my_role}, VS={vs_name}")
         try:
-            picks = self.ai_engine.calculate_score(my_role, enemy_laner, ally_team, enemy_team)
+            # Only the slots that changed since the last LCU update are rescored
+            session = self.get_draft_session(my_role)
+            picks = session.update(ally_team, enemy_team, enemy_laner).rank()
             
             # Clear previous suggestions
             self.clear_suggestions()
@@ -425,13 +606,25 @@ class MainWindow(ModernWindow):
             top_scores = []
             top_names = []
             
+            # Banned or already locked suggestions get their closest available substitutes
+            # (my own hover/lock is not "taken" for me)
+            index = self.ai_engine.index
+            mine = index.lookup(self.current_my_pick)
+            unavailable = [c for c in list(ally_team) + list(enemy_team) + list(self.current_bans)
+                           if mine is None or index.lookup(c) != mine]
+            taken = set(self.ai_engine.resolve_team(unavailable))
+            
             # Show top 10? User said "more appealing". 5-10 is good.
             # Let's show top 10 but visually distinct
             for i, p in enumerate(picks[:10], 1):
                 narrative = p['reasons']
                 score = p.get('score', 0)
+                note = None
+                if index.lookup(p['name']) in taken:
+                    subs = self.ai_engine.similar_champions(p['name'], 3, unavailable, my_role)
+                    if subs: note = "🔁 Taken/banned - try: " + ", ".join(s['name'] for s in subs)
                 
-                card = SuggestionCard(i, p['name'], p['class'], score, narrative)
+                card = SuggestionCard(i, p['name'], p['class'], score, narrative, note)
                 self.cards_layout.insertWidget(self.cards_layout.count()-1, card) # Insert before stretch
                 
                 if i <= 5: # Graph only top 5
@@ -439,11 +632,43 @@ class MainWindow(ModernWindow):
                     top_scores.append(score)
 
             self.update_chart(top_names, top_scores)
+
+            # How the top picks shift if the enemy answers in the open slots (one batched pass)
+            self.what_if_panel.set_matrix(self.ai_engine.what_if_matrix(my_role, enemy_laner, ally_team, enemy_team,
+                                                                        self.current_bans, self.current_enemy_roles))
             
         except Exception as e:
             print(f"AI Analysis Error: {e}")
             traceback.print_exc()
 
+    def run_ban_analysis(self, my_role, ally_team, enemy_team, bans, my_pick=None, my_turn=False):
+        print(f"🚫 Ban Analysis: Role={my_role}, Bans={len(bans)}" + (" (your turn)" if my_turn else ""))
+        try:
+            threats = self.ai_engine.rank_bans(my_role, ally_team, enemy_team, bans, my_pick or None)
+            self.clear_suggestions()
+            if not threats:
+                lbl = QLabel("No ban suggestions found.")
+                lbl.setStyleSheet("color: #8b949e;")
+                self.cards_layout.insertWidget(0, lbl)
+                return
+
+            for i, b in enumerate(threats[:10], 1):
+                card = SuggestionCard(i, b['name'], b['class'], b['score'], b['reasons'])
+                self.cards_layout.insertWidget(self.cards_layout.count()-1, card) # Insert before stretch
+            self.update_chart([b['name'] for b in threats[:5]], [b['score'] for b in threats[:5]])
+
+        except Exception as e:
+            print(f"Ban Analysis Error: {e}")
+            traceback.print_exc()
+
+    def get_draft_session(self, my_role):
+        # A new session is needed when the role or the engine changes; data reloads are handled by the session
+        session = self.draft_session
+        if session is None or session.engine is not self.ai_engine or session.role != self.ai_engine.resolve_role(my_role):
+            session = DraftSession(self.ai_engine, my_role)
+            self.draft_session = session
+        return session
+
     def update_chart(self, names, scores):
         self.bar_chart.clear()
         bg = pg.BarGraphItem(x=range(len(scores)), height=scores, width=0.6, brush='#00bcd4')
@@ -454,8 +679,8 @@ class MainWindow(ModernWindow):
 
     def run_script(self, task_type):
         print(f"🚀 Task: {task_type}")
-        self.runner = ScriptRunner(task_type)
-        self.runner.finished_task.connect(lambda: self.load_ai_modules())
+        self.runner = ScriptRunner(task_type, self.data_path)
+        self.runner.finished_task.connect(lambda: self.load_ai_modules(self.runner.snapshot))
         self.runner.start()
 
 if __name__ == "__main__":
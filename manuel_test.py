@@ -19,6 +19,7 @@ sys.path.append(os.getcwd())
 try:
     from core.ai_recommendation_final import LoLDecisionEngine
     from core.match_predictor import LoLMatchPredictor
+    from core.dataset import DatasetSnapshot
 except ImportError as e:
     print(f"{Colors.FAIL}Hata: 'core' modülü bulunamadı. Bu scripti main.py ile aynı dizinde çalıştırdığından emin ol.{Colors.ENDC}")
     print(e)
@@ -47,8 +48,10 @@ def main():
 
     print(f"{Colors.BLUE}AI Motorları Yükleniyor...{Colors.ENDC}")
     try:
-        ai_engine = LoLDecisionEngine(data_path)
-        predictor = LoLMatchPredictor(data_path)
+        # Veri seti bir kez okunur, iki motor aynı snapshot'ı paylaşır
+        snapshot = DatasetSnapshot.load(data_path)
+        ai_engine = LoLDecisionEngine(data_path, snapshot)
+        predictor = LoLMatchPredictor(data_path, snapshot)
         print(f"{Colors.GREEN}Modüller Hazır!{Colors.ENDC}")
     except Exception as e:
         print(f"{Colors.FAIL}Yükleme Hatası: {e}{Colors.ENDC}")
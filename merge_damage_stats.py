@@ -12,25 +12,19 @@ def normalize_name(name):
     """
     return name.lower().replace(" ", "").replace("'", "").replace(".", "").strip()
 
-def main():
-    # 1. Dosya Kontrolü
-    if not os.path.exists(MAIN_DATA_FILE):
-        print(f"❌ '{MAIN_DATA_FILE}' bulunamadı!")
-        return
-    if not os.path.exists(DAMAGE_SCORES_FILE):
-        print(f"❌ '{DAMAGE_SCORES_FILE}' bulunamadı! Lütfen önce bu dosyayı oluşturduğundan emin ol.")
-        return
-
-    print("📂 Dosyalar yükleniyor...")
-    
-    # 2. Dosyaları Oku
-    with open(MAIN_DATA_FILE, "r", encoding="utf-8") as f:
-        main_data = json.load(f)
+def apply(main_data, damage_scores_file=DAMAGE_SCORES_FILE):
+    """
+    Merge aşaması: hasar profillerini bellekteki ana veriye işler (damage_profile).
+    Dosyaya yazmaz; (güncellenen, varsayılan atanan) sayılarını döndürür.
+    """
+    if not os.path.exists(damage_scores_file):
+        print(f"❌ '{damage_scores_file}' bulunamadı! Lütfen önce bu dosyayı oluşturduğundan emin ol.")
+        return 0, 0
 
-    with open(DAMAGE_SCORES_FILE, "r", encoding="utf-8") as f:
+    with open(damage_scores_file, "r", encoding="utf-8") as f:
         damage_scores = json.load(f)
 
-    # 3. Hızlı Erişim Haritası Oluştur (Lookup Table)
+    # Hızlı Erişim Haritası Oluştur (Lookup Table)
     # damage_scores dosyasındaki anahtarları (isimleri) normalize ederek saklıyoruz.
     normalized_damage_map = {}
     for name, scores in damage_scores.items():
@@ -39,7 +33,6 @@ def main():
 
     print(f"📊 {len(normalized_damage_map)} adet hasar profili yüklendi.")
 
-    # 4. Ana Veriyi Güncelle
     updated_count = 0
     missing_count = 0
 
@@ -57,7 +50,27 @@ def main():
             print(f"⚠️ Hasar profili bulunamadı: {champ['name']} (Varsayılan 5/5 atandı)")
             missing_count += 1
 
-    # 5. Kaydet
+    return updated_count, missing_count
+
+def main():
+    # 1. Dosya Kontrolü
+    if not os.path.exists(MAIN_DATA_FILE):
+        print(f"❌ '{MAIN_DATA_FILE}' bulunamadı!")
+        return
+    if not os.path.exists(DAMAGE_SCORES_FILE):
+        print(f"❌ '{DAMAGE_SCORES_FILE}' bulunamadı! Lütfen önce bu dosyayı oluşturduğundan emin ol.")
+        return
+
+    print("📂 Dosyalar yükleniyor...")
+    
+    # 2. Dosyayı Oku
+    with open(MAIN_DATA_FILE, "r", encoding="utf-8") as f:
+        main_data = json.load(f)
+
+    # 3. Ana Veriyi Güncelle
+    updated_count, missing_count = apply(main_data)
+
+    # 4. Kaydet
     print("-" * 40)
     print(f"💾 Veriler '{MAIN_DATA_FILE}' üzerine yazılıyor...")
     
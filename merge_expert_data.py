@@ -1,8 +1,10 @@
 import json
 import os
 import glob
+import hashlib
 import re
 import sys  # sys modülü eklendi
+from concurrent.futures import ThreadPoolExecutor
 
 # --- DOSYA YOLLARI (KRİTİK DÜZELTME) ---
 # Eğer .exe içindeysek sys.executable (exe'nin yeri) kullanılır.
@@ -19,12 +21,164 @@ DATA_DIR = os.path.join(BASE_DIR, "data")
 OUTPUT_DIR = os.path.join(DATA_DIR, "output")
 MAIN_DATA_FILE = os.path.join(DATA_DIR, "tum_sampiyonlar_verisi_full.json")
 BACKUP_FILE = os.path.join(DATA_DIR, "tum_sampiyonlar_verisi_full_BACKUP.json")
+# Her output dosyasının boyut/mtime/sha1 bilgisi ve türetilmiş expert_insight kaydı
+MANIFEST_FILE = os.path.join(DATA_DIR, "merge_manifest.json")
+# build_expert_insight çıktısı değişince artırılır; eski manifest kayıtları yeniden üretilir
+INSIGHT_VERSION = 2
+READ_WORKERS = 8
 
 def clean_champion_name(name):
     """ 'Renekton (Mid)' -> 'Renekton' """
     clean = re.sub(r'\s*\(.*?\)', '', name)
     return clean.strip()
 
+def build_expert_insight(analysis):
+    """
+    Tek bir output analizinden expert_insight kaydı üretir.
+    Score < 5.0 -> Hard Counter (Enemy beats Champion)
+    Score > 5.0 -> Easy Matchup (Champion beats Enemy)
+    """
+    hard_counters = []
+    easy_matchups = []
+    matchup_scores = {} # Ham normalize puanlar (0.1-10.0); motor kademeli uzman matrisi kurar
+    
+    for m in analysis.get("matchups", []):
+        enemy = m.get("enemy", "")
+        score = m.get("score", 5.0)
+        
+        # Skip invalid
+        if not enemy: continue
+        matchup_scores.setdefault(enemy, score)
+        
+        # Thresholds
+        if score < 5.0:
+            # Enemy is strong against me
+            hard_counters.append(enemy)
+        elif score > 5.0: 
+             # I beat Enemy
+             easy_matchups.append(enemy)
+    
+    return {
+        "role_description": analysis.get('role_desc', ''),
+        "hard_counters": hard_counters,
+        "easy_matchups": easy_matchups,
+        "matchup_scores": matchup_scores
+    }
+
+def load_manifest(path=MANIFEST_FILE):
+    """Merge manifest'ini okur. Yoksa/bozuksa boş manifest döner (her şey yeniden okunur)."""
+    if not os.path.exists(path): return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Manifest okunamadı, tam merge yapılacak: {e}")
+        return {}
+    if manifest.get("insight_version") != INSIGHT_VERSION:
+        return {}
+    return manifest
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def diff_outputs(output_dir, manifest):
+    """
+    Yalnızca os.stat ile karşılaştırır (dosya okumaz).
+    Döner: (glob sırasıyla dosya adları, boyutu/mtime'ı manifest'ten farklı olanlar [(ad, yol, stat)])
+    """
+    known = manifest.get("outputs", {})
+    names, stale = [], []
+    for file_path in glob.glob(os.path.join(output_dir, "*.json")):
+        file_name = os.path.basename(file_path)
+        st = os.stat(file_path)
+        names.append(file_name)
+        entry = known.get(file_name)
+        if not entry or entry["size"] != st.st_size or entry["mtime"] != st.st_mtime_ns:
+            stale.append((file_name, file_path, st))
+    return names, stale
+
+def _read_output(item):
+    file_name, file_path, st = item
+    try:
+        with open(file_path, "rb") as f:
+            return file_name, file_path, st, f.read()
+    except Exception as e:
+        print(f"⚠️ Error reading {file_path}: {e}")
+        return file_name, file_path, st, None
+
+def refresh_outputs(output_dir, manifest):
+    """
+    Değişen output dosyalarını thread pool ile okur, manifest["outputs"] girdilerini günceller.
+    İçeriği (sha1) aynı kalan dosyalar yeniden parse edilmez. Okunan dosya sayısını döndürür.
+    """
+    known = manifest.get("outputs", {})
+    names, stale = diff_outputs(output_dir, manifest)
+    entries = {name: known.get(name) for name in names}
+
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+        for file_name, file_path, st, raw in pool.map(_read_output, stale):
+            if raw is None:
+                entries[file_name] = None
+                continue
+
+            sha1 = hashlib.sha1(raw).hexdigest()
+            entry = known.get(file_name)
+            if not entry or entry["sha1"] != sha1:
+                try:
+                    analysis = json.loads(raw.decode("utf-8"))
+                except Exception as e:
+                    print(f"⚠️ Error reading {file_path}: {e}")
+                    entries[file_name] = None
+                    continue
+                entry = {"name": analysis.get("name", "Unknown"), "insight": build_expert_insight(analysis)}
+            entries[file_name] = dict(entry, size=st.st_size, mtime=st.st_mtime_ns, sha1=sha1)
+
+    manifest["outputs"] = {name: entry for name, entry in entries.items() if entry}
+    manifest["insight_version"] = INSIGHT_VERSION
+    return len(stale)
+
+def apply(main_data, output_dir=OUTPUT_DIR, manifest=None):
+    """
+    Merge aşaması: output/*.json analizlerini bellekteki ana veriye işler (expert_insight).
+    Dosyaya yazmaz; güncellenen şampiyon sayısını döndürür.
+    manifest verilirse yalnızca değişen dosyalar okunur, diğerlerinin kaydı manifest'ten gelir.
+    """
+    if not os.path.exists(output_dir):
+        print(f"⚠️ Output directory not found: {output_dir}")
+        print("ℹ️ Henüz 'Veritabanı Güncelle' yapılmamış olabilir.")
+        return 0
+
+    main_lookup = {d['name'].lower(): d for d in main_data}
+
+    if manifest is None: manifest = {}
+    read_count = refresh_outputs(output_dir, manifest)
+    outputs = manifest["outputs"]
+    print(f"📂 Found {len(outputs)} champion analysis files in {output_dir} ({read_count} read)")
+
+    merged_count = 0
+    
+    for entry in outputs.values():
+        raw_name = entry["name"]
+        
+        target_champ = main_lookup.get(raw_name.lower())
+        
+        if not target_champ:
+            # Try cleaning name/title case
+            target_champ = main_lookup.get(raw_name.lower().strip())
+        
+        if not target_champ:
+            # print(f"⚠️ Champion not found in main DB: {raw_name}")
+            continue
+
+        # Update Main Record
+        target_champ['expert_insight'] = entry["insight"]
+        merged_count += 1
+
+    return merged_count
+
 def main():
     print("🚀 Merging Process Started (Output JSONs -> Main Database)...")
     print(f"📂 Çalışma Dizini: {BASE_DIR}") # Kontrol için yolu yazdırıyoruz
@@ -49,66 +203,11 @@ def main():
         print(f"❌ Ana veri dosyası bozuk: {e}")
         return
         
-    main_lookup = {d['name'].lower(): d for d in main_data}
     print(f"📊 Loaded {len(main_data)} champions from main database.")
 
-    # 2. Iterate Output Files
-    files = glob.glob(os.path.join(OUTPUT_DIR, "*.json"))
-    print(f"📂 Found {len(files)} champion analysis files in {OUTPUT_DIR}")
-
-    merged_count = 0
-    
-    for file_path in files:
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                analysis = json.load(f)
-        except Exception as e:
-            print(f"⚠️ Error reading {file_path}: {e}")
-            continue
-
-        raw_name = analysis.get("name", "Unknown")
-        matchups = analysis.get("matchups", [])
-        
-        target_champ = main_lookup.get(raw_name.lower())
-        
-        if not target_champ:
-            # Try cleaning name/title case
-            target_champ = main_lookup.get(raw_name.lower().strip())
-        
-        if not target_champ:
-            # print(f"⚠️ Champion not found in main DB: {raw_name}")
-            continue
-
-        # LOGIC:
-        # Score < 5.0 -> Hard Counter (Enemy beats Champion)
-        # Score > 5.0 -> Easy Matchup (Champion beats Enemy)
-        
-        hard_counters = []
-        easy_matchups = []
-        
-        for m in matchups:
-            enemy = m.get("enemy", "")
-            score = m.get("score", 5.0)
-            
-            # Skip invalid
-            if not enemy: continue
-            
-            # Thresholds
-            if score < 5.0:
-                # Enemy is strong against me
-                hard_counters.append(enemy)
-            elif score > 5.0: 
-                 # I beat Enemy
-                 easy_matchups.append(enemy)
-        
-        # Update Main Record
-        target_champ['expert_insight'] = {
-            "role_description": analysis.get('role_desc', ''),
-            "hard_counters": hard_counters,
-            "easy_matchups": easy_matchups
-        }
-        
-        merged_count += 1
+    # 2. Apply Output Files (only changed files are read)
+    manifest = load_manifest()
+    merged_count = apply(main_data, manifest=manifest)
 
     # 3. Save
     print("-" * 30)
@@ -124,6 +223,7 @@ def main():
     try:
         with open(MAIN_DATA_FILE, "w", encoding="utf-8") as f:
             json.dump(main_data, f, indent=4, ensure_ascii=False)
+        save_manifest(manifest)
         print(f"🎉 SUCCESS! {merged_count} champions updated locally.")
     except Exception as e:
         print(f"❌ Kaydetme hatası: {e}")
@@ -0,0 +1,127 @@
+import json
+import os
+import shutil
+import time
+
+import add_champion_classes
+import merge_damage_stats
+import merge_expert_data
+from core.ai_recommendation_final import LoLDecisionEngine
+from core.champion_registry import load_id_map
+from core.compiled_dataset import file_sha1, source_hashes, write_compiled
+from core.dataset import DatasetSnapshot
+from core.recommendation_tables import ensure_tables
+from core.similarity_index import ensure_index
+
+# --- DOSYA AYARLARI ---
+MAIN_DATA_FILE = merge_expert_data.MAIN_DATA_FILE
+
+MANIFEST_NAME = "merge_manifest.json"
+
+# Aşamalar sırayla aynı bellek içi listeyi dönüştürür: (isim, fonksiyon(main_data, data_dir, manifest))
+STAGES = (
+    ("expert_insight", lambda data, d, m: merge_expert_data.apply(data, os.path.join(d, "output"), m)),
+    ("damage_profile", lambda data, d, m: merge_damage_stats.apply(data, os.path.join(d, "champion_damage_scores.json"))),
+    ("class", lambda data, d, m: add_champion_classes.apply(data, os.path.join(d, "champion_classes.json"))),
+)
+
+# Output klasörü dışındaki girdiler; içerikleri değişmediyse aşamaları tekrar çalıştırmaya gerek yok
+INPUT_FILES = ("champion_damage_scores.json", "champion_classes.json")
+
+def backup_path(data_file):
+    root, ext = os.path.splitext(data_file)
+    return f"{root}_BACKUP{ext}"
+
+def write_atomic(path, text, backup=None):
+    """
+    Önce aynı klasörde geçici dosyaya yazar, sonra os.replace ile yerine koyar.
+    Yarıda kesilen bir yazım ana veriyi asla bozmaz; backup verilirse eski dosya oraya kopyalanır.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    if backup and os.path.exists(path):
+        shutil.copy(path, backup)
+    os.replace(tmp_path, path)
+
+def input_hashes(data_file):
+    """Ana veri + sınıf/hasar dosyalarının içerik özetleri (manifest'te saklanır)."""
+    data_dir = os.path.dirname(data_file)
+    hashes = {name: file_sha1(os.path.join(data_dir, name)) for name in INPUT_FILES}
+    hashes["data"] = file_sha1(data_file)
+    return hashes
+
+def is_up_to_date(data_file, manifest):
+    """
+    Son merge'den beri hiçbir girdi değişmediyse True: output dosyaları os.stat ile,
+    diğer girdiler ve ana veri sha1 ile karşılaştırılır. Hiçbir output dosyası okunmaz.
+    """
+    if not manifest.get("inputs") or manifest["inputs"] != input_hashes(data_file):
+        return False
+    names, stale = merge_expert_data.diff_outputs(os.path.join(os.path.dirname(data_file), "output"), manifest)
+    return not stale and set(names) == set(manifest.get("outputs", {}))
+
+def run(data_file=MAIN_DATA_FILE, stages=STAGES):
+    """
+    Ana veriyi bir kez okur, tüm aşamaları bellekte uygular, sonucu tek seferde
+    (atomik) yazar ve motorların doğrudan kullanabileceği DatasetSnapshot döndürür.
+    Sonuç diskteki dosyayla aynıysa yazma atlanır. Ana veri yoksa None döner.
+
+    Merge manifest'i (data/merge_manifest.json) sayesinde yalnızca değişen output
+    dosyaları okunur; hiçbir girdi değişmediyse ana veri de okunmaz.
+    """
+    if not os.path.exists(data_file):
+        print(f"❌ Main data file not found: {data_file}")
+        return None
+
+    start = time.perf_counter()
+    data_dir = os.path.dirname(data_file)
+    manifest_path = os.path.join(data_dir, MANIFEST_NAME)
+    manifest = merge_expert_data.load_manifest(manifest_path)
+    if is_up_to_date(data_file, manifest):
+        print(f"ℹ️ Girdiler değişmedi, merge atlandı ({(time.perf_counter() - start) * 1000:.0f} ms).")
+        return build_tables_stage(DatasetSnapshot.load(data_file))
+
+    with open(data_file, "r", encoding="utf-8") as f:
+        original_text = f.read()
+    main_data = json.loads(original_text)
+    print(f"📊 Loaded {len(main_data)} champions from main database.")
+
+    for name, stage in stages:
+        print(f"🔧 Aşama: {name}")
+        stage(main_data, data_dir, manifest)
+
+    merged_text = json.dumps(main_data, indent=4, ensure_ascii=False)
+    print("-" * 30)
+    if merged_text == original_text:
+        print("ℹ️ Veride değişiklik yok, dosya yazılmadı.")
+    else:
+        print(f"💾 Saving merged data to {data_file}...")
+        write_atomic(data_file, merged_text, backup=backup_path(data_file))
+    manifest["inputs"] = input_hashes(data_file)
+    merge_expert_data.save_manifest(manifest, manifest_path)
+
+    # Bellekteki sonuçtan snapshot kur; motorlar dosyayı tekrar okumaz
+    hashes = source_hashes(data_file)
+    snapshot = DatasetSnapshot(main_data, load_id_map(data_dir), path=data_file, sources=hashes)
+    write_compiled(snapshot.index, data_file, hashes)
+    build_tables_stage(snapshot)
+    print(f"🎉 Merge tamamlandı ({(time.perf_counter() - start) * 1000:.0f} ms).")
+    return snapshot
+
+def build_tables_stage(snapshot):
+    """
+    Çevrimdışı aşama: her profil × rol × koridor rakibi için ilk k öneri tablosunu ve
+    şampiyon benzerlik indeksini (data/compiled altında) yoksa/bayatsa kurar. Motorun derlediği
+    tablolar snapshot'a bağlandığı için arayüz motorları aynı snapshot'ı aldığında tekrar derlenmez.
+    """
+    engine = LoLDecisionEngine(snapshot.path, snapshot)
+    ensure_tables(engine)
+    ensure_index(engine)
+    return snapshot
+
+def main():
+    run()
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ import re
 import time
 import random
 import os
+import sys
+import asyncio
 
 # ... (Imports remain same)
 
@@ -24,6 +26,7 @@ CHAMPION_URL_MAP = {}
 
 # ... Imports
 from curl_cffi import requests # cloudscraper yerine
+from core.http_cache import shared_cache
 
 # --- AYARLAR ---
 REGION = "iron"  
@@ -39,6 +42,12 @@ OUTPUT_FILE = get_resource_path("data/tum_sampiyonlar_verisi_full.json")
 # Global Mapping
 CHAMPION_URL_MAP = {}
 
+# --- EŞZAMANLI TARAMA AYARLARI ---
+# Sabit sleep'ler yerine tüm istekler tek bir jeton kovasını paylaşır (sitenin tolere ettiği hız)
+REQUESTS_PER_SECOND = 1.0
+BURST = 3              # Boşta biriken en fazla jeton
+MAX_IN_FLIGHT = 4      # Aynı anda açık en fazla istek
+
 # --- SCRAPER YAPILANDIRMASI ---
 class LoLScraper:
     def __init__(self):
@@ -48,6 +57,9 @@ class LoLScraper:
 
     def warm_up(self):
         """Ana sayfaya giderek çerezleri al ve session'ı ısıt."""
+        if shared_cache().offline:
+            self.session_ready = True # Çevrimdışı tekrar: ağa hiç çıkılmaz
+            return
         print("🔥 Session ısıtılıyor (Ana sayfa ziyareti)...")
         try:
             self.session.get("https://www.leagueofgraphs.com/")
@@ -64,7 +76,7 @@ class LoLScraper:
 
         for attempt in range(3):
             try:
-                response = self.session.get(url, timeout=15)
+                response = shared_cache().get(self.session, url, timeout=15)
                 
                 if response.status_code == 429:
                     wait = 60
@@ -97,6 +109,123 @@ class LoLScraper:
 # Tekil instance
 bot = LoLScraper()
 
+class TokenBucket:
+    """
+    Paylaşılan hız sınırlayıcı: saniyede `rate` jeton dolar, en fazla `capacity` birikir.
+    Her istek bir jeton harcar; 429 gelirse pause() ile tüm istekler birlikte bekletilir.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Kilit sırayla verildiği için bekleyenler geliş sırasıyla jeton alır
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+class AsyncLoLScraper:
+    """
+    LoLScraper'ın asyncio karşılığı (curl_cffi AsyncSession, aynı Chrome 120 parmak izi).
+    Açık istek sayısı semafor ile, hız ortak TokenBucket ile sınırlanır; hata/yeniden deneme
+    kuralları get_soup ile aynıdır.
+    """
+    def __init__(self, rate=REQUESTS_PER_SECOND, burst=BURST, max_in_flight=MAX_IN_FLIGHT):
+        self.session = requests.AsyncSession(impersonate="chrome120")
+        self.session_ready = False
+        self.bucket = TokenBucket(rate, burst)
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.session_lock = asyncio.Lock()
+
+    async def warm_up(self):
+        """Ana sayfaya giderek çerezleri al ve session'ı ısıt (aynı anda tek kez)."""
+        async with self.session_lock:
+            if self.session_ready: return
+            if shared_cache().offline:
+                self.session_ready = True # Çevrimdışı tekrar: ağa hiç çıkılmaz
+                return
+            print("🔥 Session ısıtılıyor (Ana sayfa ziyareti)...")
+            try:
+                await self.bucket.acquire()
+                await self.session.get("https://www.leagueofgraphs.com/")
+                await asyncio.sleep(3) # Çerezler otursun
+                self.session_ready = True
+                print("✅ Session hazır (TLS Fingerprint: Chrome 120).")
+            except Exception as e:
+                print(f"⚠️ Warm-up hatası: {e}")
+
+    async def renew_session(self, failed):
+        """403 sonrası session'ı yeniler; aynı anda 403 alan diğer istekler ikinci kez yenilemez."""
+        async with self.session_lock:
+            if self.session is not failed: return
+            await failed.close()
+            self.session = requests.AsyncSession(impersonate="chrome120")
+            self.session_ready = False
+        await self.warm_up()
+
+    async def get_soup(self, url):
+        # Önbellekten cevaplanan sayfalar jeton/istek hakkı harcamaz
+        hit = shared_cache().fresh_response(url)
+        if hit is not None:
+            return BeautifulSoup(hit.content, 'lxml') if hit.status_code == 200 else None
+
+        if not self.session_ready:
+            await self.warm_up()
+
+        for attempt in range(3):
+            session = self.session
+            try:
+                # Jeton yalnızca istek gerçekten gönderilecekken harcanır
+                async with self.in_flight:
+                    await self.bucket.acquire()
+                    response = await shared_cache().get_async(session, url, timeout=15)
+
+                if response.status_code == 429:
+                    wait = 60
+                    print(f"   🛑 429 (Too Many Requests). {wait}sn bekleniyor...")
+                    self.bucket.pause(wait)
+                    continue
+
+                if response.status_code == 403:
+                    print(f"   🚫 403 (Erişim Red). Bekleme artırılıyor...")
+                    self.bucket.pause(15)
+                    await self.renew_session(session)
+                    continue
+
+                if response.status_code == 200:
+                    return BeautifulSoup(response.content, 'lxml')
+                elif response.status_code == 404:
+                    return None
+                else:
+                    print(f"   ⚠️ Kod: {response.status_code} (Deneme {attempt+1})")
+                    await asyncio.sleep(3)
+
+            except Exception as e:
+                print(f"   ⚠️ Ağ Hatası: {e}")
+                await asyncio.sleep(3)
+
+        return None
+
+    async def close(self):
+        await self.session.close()
+
 def load_mappings():
     global CHAMPION_URL_MAP
     if os.path.exists(MAPPING_FILE):
@@ -144,10 +273,15 @@ def sanitize_name_for_url(name):
         return CHAMPION_URL_MAP[name]
     return name.lower().replace(".", "").replace("'", "").replace(" ", "").replace("&", "")
 
-def get_champion_full_data(champ_info, region):
+def tier_url(slug, region):
+    return f"https://www.leagueofgraphs.com/champions/tier-list/{slug}/{region}"
+
+def counter_url(slug, region):
+    return f"https://www.leagueofgraphs.com/champions/counters/{slug}/{region}"
+
+def new_champion_record(champ_info, region):
     slug = sanitize_name_for_url(champ_info['name'])
-    
-    data = {
+    return {
         "name": champ_info['name'],
         "role": champ_info['role'],
         "slug": slug,
@@ -162,10 +296,8 @@ def get_champion_full_data(champ_info, region):
         "general_bad_against": []   
     }
 
-    # 1. Win Rate
-    tier_url = f"https://www.leagueofgraphs.com/champions/tier-list/{slug}/{region}"
-    soup_tier = get_soup_via_cloudscraper(tier_url)
-    
+def parse_win_rate(soup_tier, data):
+    """Tier-list sayfasından genel kazanma oranı."""
     if soup_tier:
         wr_div = soup_tier.find("div", id="graphDD2")
         if wr_div:
@@ -173,14 +305,9 @@ def get_champion_full_data(champ_info, region):
                 raw_text = wr_div.get_text().strip().replace('%', '')
                 data["general_win_rate"] = float(raw_text)
             except: pass
-    
-    # Kısa bir bekleme (Sayfalar arası)
-    time.sleep(random.uniform(0.5, 1.0))
-
-    # 2. Counter Tabloları
-    counter_url = f"https://www.leagueofgraphs.com/champions/counters/{slug}/{region}"
-    soup_counter = get_soup_via_cloudscraper(counter_url)
 
+def parse_counter_tables(soup_counter, data):
+    """Counter sayfasındaki tabloları (sinerji, koridor, genel) ilgili listelere ekler."""
     if soup_counter:
         boxes = soup_counter.find_all("div", class_="box")
         for box in boxes:
@@ -206,9 +333,63 @@ def get_champion_full_data(champ_info, region):
                     champ_name = name_span.text.strip()
                     score = extract_value_final(row)
                     target_list.append({"champion": champ_name, "score": score})
+
+def get_champion_full_data(champ_info, region):
+    data = new_champion_record(champ_info, region)
+
+    # 1. Win Rate
+    parse_win_rate(get_soup_via_cloudscraper(tier_url(data["slug"], region)), data)
     
+    # Kısa bir bekleme (Sayfalar arası)
+    time.sleep(random.uniform(0.5, 1.0))
+
+    # 2. Counter Tabloları
+    parse_counter_tables(get_soup_via_cloudscraper(counter_url(data["slug"], region)), data)
+    
+    return data
+
+async def fetch_champion_full_data(scraper, champ_info, region):
+    """get_champion_full_data'nın async karşılığı: iki sayfa birlikte istenir, ayrıştırma aynıdır."""
+    data = new_champion_record(champ_info, region)
+    soup_tier, soup_counter = await asyncio.gather(
+        scraper.get_soup(tier_url(data["slug"], region)),
+        scraper.get_soup(counter_url(data["slug"], region)))
+    parse_win_rate(soup_tier, data)
+    parse_counter_tables(soup_counter, data)
     return data
 
+async def crawl(champions, region, scraper=None):
+    """
+    Tüm şampiyonları eşzamanlı tarar (bkz. AsyncLoLScraper). Sonuç listesi giriş sırasındadır,
+    hata veren şampiyonlar sıralı taramadaki gibi atlanır; çıktı dosyası birebir aynı kalır.
+    """
+    scraper = scraper or AsyncLoLScraper()
+    total = len(champions)
+    done = 0
+
+    async def one(champ):
+        nonlocal done
+        try:
+            champ_data = await fetch_champion_full_data(scraper, champ, region)
+        except Exception as e:
+            done += 1
+            print(f"[{done}/{total}] {champ['name']}... ❌ HATA: {e}")
+            return None
+        done += 1
+        wr = champ_data.get("general_win_rate", 0)
+        if wr == 0.0:
+            print(f"[{done}/{total}] {champ['name']}... ⚠️ (WR Alınamadı)")
+        else:
+            print(f"[{done}/{total}] {champ['name']}... ✅ (WR: %{wr})")
+        return champ_data
+
+    try:
+        await scraper.warm_up()
+        results = await asyncio.gather(*(one(champ) for champ in champions))
+    finally:
+        await scraper.close()
+    return [r for r in results if r is not None]
+
 def main():
     load_mappings()
 
@@ -219,37 +400,18 @@ def main():
     with open(INPUT_FILE, "r", encoding="utf-8") as f:
         champions_to_scrape = json.load(f)
     
-    full_database = []
     total = len(champions_to_scrape)
     
-    print(f"🚀 {total} karakter taranacak. (Koruma Modu Aktif v2)")
+    print(f"🚀 {total} karakter taranacak. (Eşzamanlı: {MAX_IN_FLIGHT} istek, {REQUESTS_PER_SECOND} istek/sn)")
     print("-" * 50)
 
-    # Global warm up
-    bot.warm_up()
-
-    for i, champ in enumerate(champions_to_scrape, 1):
-        print(f"[{i}/{total}] {champ['name']}...", end=" ", flush=True)
-        
-        try:
-            champ_data = get_champion_full_data(champ, REGION)
-            full_database.append(champ_data)
-            
-            wr = champ_data.get("general_win_rate", 0)
-            
-            if wr == 0.0:
-                print("⚠️ (WR Alınamadı)")
-            else:
-                print(f"✅ (WR: %{wr})")
-            
-        except Exception as e:
-            print(f"❌ HATA: {e}")
-
-        # Her karakterden sonra random bekleme
-        sleep_time = random.uniform(3.0, 6.0) 
-        time.sleep(sleep_time)
+    start = time.perf_counter()
+    full_database = asyncio.run(crawl(champions_to_scrape, REGION))
 
     print("-" * 50)
+    cache = shared_cache().stats()
+    print(f"⏱️ Tarama süresi: {time.perf_counter() - start:.0f} sn "
+          f"(önbellek: {cache['hits']} isabet, {cache['revalidated']} 304, {cache['misses']} indirme)")
     print(f"💾 Tüm veriler '{OUTPUT_FILE}' dosyasına kaydediliyor...")
     with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
         json.dump(full_database, f, indent=4, ensure_ascii=False)
@@ -265,4 +427,7 @@ def main():
         print(f"❌ Export Script Hatası: {e}")
 
 if __name__ == "__main__":
+    if sys.platform == 'win32':
+        # curl_cffi AsyncSession Proactor döngüsünde çalışmaz (main.py de aynı politikayı kullanır)
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
     main()